@@ -9,13 +9,18 @@ import random
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.model import AKOMClassifier, OLAY_TURLERI, ONCELIKLER, BIRIMLER
-from src.utils import get_ilce_koordinat, load_dataset, get_priority_color, get_event_icon, save_analysis
+from src.batch_scheduler import BatchScheduler
+from src.utils import get_ilce_koordinat, get_cached_dataset, get_priority_color, get_event_icon, save_analysis
+from src.utils import get_incident_store, get_dataset_stats, STORAGE_BACKEND
+from src.dataset_schema import memory_report
+from src.feedback_store import FeedbackStore
 import requests
 import time
 
 try:
     from audio_recorder_streamlit import audio_recorder
-    from src.speech import transcribe_audio, is_whisper_available
+    from src.speech import transcribe_audio, is_whisper_available, preload_whisper_model
+    from src.transcription_jobs import TranscriptionJobQueue
     VOICE_INPUT_AVAILABLE = True
 except ImportError:
     VOICE_INPUT_AVAILABLE = False
@@ -373,12 +378,62 @@ st.markdown("""
 
 @st.cache_resource
 def load_classifier():
-    return AKOMClassifier(use_bert=False)  # Hızlı başlangıç için kural tabanlı
+    # GPU olmayan sunucular için int8 quantize BERT; arka planda yüklenir, hazır olana kadar kural tabanlı
+    return AKOMClassifier(use_bert=True, backend="int8", async_load=True)
 
 
-@st.cache_data
-def load_data():
-    return load_dataset()
+@st.cache_resource
+def load_scheduler():
+    # Eşzamanlı operatörlerin istekleri tek bir model çağrısında birleştirilir
+    return BatchScheduler(load_classifier(), max_batch=16, max_wait_ms=10)
+
+
+@st.cache_resource
+def load_whisper():
+    # Whisper açılışta arka planda yüklenip ısıtılır; tüm oturumlar aynı modeli paylaşır
+    return preload_whisper_model(warmup=True, background=True)
+
+
+@st.cache_resource
+def load_transcription_jobs():
+    # Çeviriler arka planda en fazla 2 eşzamanlı işle çalışır; arayüz bloklanmaz
+    return TranscriptionJobQueue(transcribe_audio, max_workers=2)
+
+
+@st.fragment(run_every=1)
+def show_transcription_status():
+    """Bekleyen çeviri işini yokla; bitince metni ihbar alanına aktar"""
+    job_id = st.session_state.get('transcription_job')
+    if not job_id:
+        return
+    
+    transcription_jobs = load_transcription_jobs()
+    job = transcription_jobs.get(job_id)
+    if job is not None and job["status"] in ("queued", "running"):
+        metrics = transcription_jobs.get_metrics()
+        durum = "kuyrukta" if job["status"] == "queued" else "çevriliyor"
+        st.info(f"Ses metne {durum}... (bekleyen iş: {metrics['queue_depth']}, "
+                f"çalışan: {metrics['running']}/{metrics['max_workers']})")
+        return
+    
+    st.session_state['transcription_job'] = None
+    audio_hash = st.session_state.pop('transcription_audio_hash', None)
+    if job is not None and job["result"]:
+        st.session_state['selected_ihbar'] = job["result"]
+        st.session_state['transcription_message'] = "success"
+        # Kayıt yalnızca başarıyla çevrildiyse işlenmiş sayılır
+        st.session_state['last_audio_hash'] = audio_hash
+    else:
+        st.session_state['transcription_message'] = "error"
+        st.session_state['failed_audio_hash'] = audio_hash
+    st.rerun()
+
+
+@st.cache_resource
+def load_feedback_store():
+    store = FeedbackStore()
+    store.start_compactor(interval=60.0)
+    return store
 
 
 def create_map(lat, lon, popup_text, priority="Orta", nearest_center=None):
@@ -482,8 +537,20 @@ def main():
     st.markdown("<p style='text-align: center; color: #666;'>AI Destekli İhbar Analiz Platformu</p>", unsafe_allow_html=True)
     
     classifier = load_classifier()
+    scheduler = load_scheduler()
+    
+    whisper_handle = None
+    if VOICE_INPUT_AVAILABLE:
+        whisper_handle = load_whisper()
+        whisper_handle.attach()
     
-    df = load_data()
+    if STORAGE_BACKEND == "sqlite":
+        # Sayfalar filtrelerini indeksli SQLite sorgularına iter; veri seti belleğe yüklenmez
+        store = get_incident_store()
+    else:
+        # Veri seti süreç başına bir kez yüklenir; yeni kayıtlar artımlı eklenir
+        df = get_cached_dataset()
+        store = get_incident_store(df) if df is not None else None
     
     if 'analysis_history' not in st.session_state:
         st.session_state['analysis_history'] = []
@@ -496,6 +563,47 @@ def main():
             ["İhbar Analizi", "Geçmiş", "İstatistikler", "Olay Haritası", "Veri Seti"],
             label_visibility="collapsed"
         )
+        
+        model_durumu = classifier.get_model_status()
+        if model_durumu["status"] == "loading":
+            st.caption("BERT modeli yükleniyor... (kural tabanlı analiz aktif)")
+        elif model_durumu["status"] == "ready":
+            st.caption(f"BERT modeli hazır ({model_durumu['backend']}, {model_durumu['load_seconds']:.1f} sn)")
+        
+        if whisper_handle is not None:
+            ses_durumu = whisper_handle.get_status()
+            if ses_durumu["status"] == "loading":
+                st.caption("Whisper modeli yükleniyor...")
+            elif ses_durumu["status"] == "ready":
+                bellek = ses_durumu.get("memory_mb")
+                bellek_metni = f", {bellek:,.0f} MB" if bellek is not None else ""
+                st.caption(f"Whisper hazır ({ses_durumu['model_size']}, {ses_durumu['compute_type']}, "
+                           f"{ses_durumu['load_seconds']:.1f} sn{bellek_metni})")
+            else:
+                st.caption(f"Whisper yüklenemedi: {ses_durumu['error']}")
+        
+        with st.expander("Hata Ayıklama - Aşama Süreleri", expanded=False):
+            # Ölçüm süreç geneli bir ayardır: tüm oturumların analizleri ölçülür
+            profil_acik = classifier.stage_timer.enabled
+            st.caption(f"Ölçüm (tüm oturumlar): {'açık' if profil_acik else 'kapalı'}")
+            if st.button("Ölçümü Kapat (tüm oturumlar)" if profil_acik else "Ölçümü Aç (tüm oturumlar)",
+                         key="profil_toggle"):
+                classifier.set_profiling(not profil_acik)
+                st.rerun()
+            
+            sureler = classifier.get_stage_timings()
+            if sureler:
+                st.dataframe(pd.DataFrame([
+                    {"Aşama": asama, "Adet": ozet["count"], "Ort. ms": round(ozet["mean_ms"], 3),
+                     "p95 ms": ozet["p95_ms"], "p99 ms": ozet["p99_ms"]}
+                    for asama, ozet in sureler.items()
+                ]), hide_index=True, use_container_width=True)
+                st.caption("'toplam' embedding dışındaki kural aşamalarını kapsar.")
+                if st.button("Sayaçları Sıfırla"):
+                    classifier.reset_stage_timings()
+                    st.rerun()
+            elif profil_acik:
+                st.caption("Henüz ölçüm yok - bir ihbar analiz edin.")
     
     if menu == "İhbar Analizi":
         st.header("Yeni İhbar Analizi")
@@ -527,18 +635,26 @@ def main():
                     import hashlib
                     audio_hash = hashlib.md5(audio_bytes).hexdigest()
                     
-                    if audio_hash != st.session_state.get('last_audio_hash'):
-                        with st.spinner("Ses metne çevriliyor..."):
-                            transcribed_text = transcribe_audio(audio_bytes)
-                            if transcribed_text:
-                                st.session_state['selected_ihbar'] = transcribed_text
-                                st.session_state['last_audio_hash'] = audio_hash
-                                st.success("Ses başarıyla metne çevrildi!")
-                            else:
-                                st.error("Ses metne çevrilemedi. Lütfen tekrar deneyin.")
-                    else:
-                        if st.session_state.get('selected_ihbar'):
-                            st.success("Ses zaten metne çevrildi, aşağıda görebilirsiniz.")
+                    # Başarısız kayıt kendiliğinden yeniden gönderilmez; kullanıcı tekrar dener
+                    if audio_hash not in (st.session_state.get('last_audio_hash'),
+                                          st.session_state.get('transcription_audio_hash'),
+                                          st.session_state.get('failed_audio_hash')):
+                        # Çeviri arka plandaki iş kuyruğunda çalışır, sonuç aşağıda yoklanır
+                        st.session_state['transcription_job'] = load_transcription_jobs().submit(audio_bytes)
+                        st.session_state['transcription_audio_hash'] = audio_hash
+                    
+                    mesaj = st.session_state.pop('transcription_message', None)
+                    if mesaj == "success":
+                        st.success("Ses başarıyla metne çevrildi!")
+                    elif audio_hash == st.session_state.get('failed_audio_hash'):
+                        st.error("Ses metne çevrilemedi. Lütfen tekrar deneyin.")
+                        if st.button("Tekrar Dene", key="transcription_retry"):
+                            st.session_state['failed_audio_hash'] = None
+                            st.rerun()
+                    elif not st.session_state.get('transcription_job') and st.session_state.get('selected_ihbar'):
+                        st.success("Ses zaten metne çevrildi, aşağıda görebilirsiniz.")
+                    
+                    show_transcription_status()
                 
                 st.markdown("---")
             
@@ -581,7 +697,7 @@ def main():
         
         if analyze_btn and ihbar_text:
             with st.spinner("İhbar analiz ediliyor..."):
-                result = classifier.analyze(ihbar_text)
+                result = scheduler.analyze(ihbar_text)
             
             # Yinelenen ihbar kontrolü
             is_duplicate = False
@@ -620,12 +736,14 @@ def main():
             st.session_state['analysis_history'].insert(0, history_entry)  # En yenisi başa
             
             save_analysis(result, ihbar_text)
-            load_data.clear()
         
         if 'analysis_result' in st.session_state:
             result = st.session_state['analysis_result']
             ihbar_text = st.session_state['analyzed_text']
             
+            if result.get('degraded'):
+                st.info("Model henüz yükleniyor; bu sonuç kural tabanlı sınıflandırma ile üretildi.")
+            
             adres_parts = []
             if result.get('bolge'):
                 adres_parts.append(result['bolge'])
@@ -762,10 +880,8 @@ def main():
                     )
                 
                 if st.button("Geri Bildirimi Kaydet", key="feedback_btn"):
-                    import os
                     from datetime import datetime
                     
-                    feedback_path = os.path.join(os.path.dirname(__file__), "data", "feedback.csv")
                     feedback_data = {
                         'tarih': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                         'ihbar': ihbar_text,
@@ -775,14 +891,8 @@ def main():
                         'dogru_oncelik': correct_oncelik
                     }
                     
-                    import pandas as pd
-                    if os.path.exists(feedback_path):
-                        fb_df = pd.read_csv(feedback_path)
-                        fb_df = pd.concat([fb_df, pd.DataFrame([feedback_data])], ignore_index=True)
-                    else:
-                        fb_df = pd.DataFrame([feedback_data])
-                    
-                    fb_df.to_csv(feedback_path, index=False)
+                    # Günlüğe tek satır eklenir; özet arka planda güncellenir
+                    load_feedback_store().append(feedback_data)
                     st.success("Geri bildirim kaydedildi! Teşekkürler, bu veriler modelin geliştirilmesinde kullanılacak.")
     
     elif menu == "Geçmiş":
@@ -816,7 +926,6 @@ def main():
                     st.rerun()
             
             with col_btn2:
-                import pandas as pd
                 export_data = []
                 for entry in history:
                     export_data.append({
@@ -839,22 +948,25 @@ def main():
     elif menu == "İstatistikler":
         st.header("Veri Seti İstatistikleri")
         
-        if df is not None:
+        if store is not None:
+            # Kalıcı sayaçlar: veri seti taranmaz, yalnızca yeni kayıtlar sayılır
+            stats = get_dataset_stats()
+            
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
-                st.metric("Toplam İhbar", f"{len(df):,}")
+                st.metric("Toplam İhbar", f"{stats['toplam']:,}")
             
             with col2:
-                kritik = len(df[df['oncelik'] == 'Kritik'])
+                kritik = stats['oncelik'].get('Kritik', 0)
                 st.metric("Kritik", f"{kritik:,}")
             
             with col3:
-                yuksek = len(df[df['oncelik'] == 'Yüksek'])
+                yuksek = stats['oncelik'].get('Yüksek', 0)
                 st.metric("Yüksek", f"{yuksek:,}")
             
             with col4:
-                orta = len(df[df['oncelik'] == 'Orta'])
+                orta = stats['oncelik'].get('Orta', 0)
                 st.metric("Orta", f"{orta:,}")
             
             st.markdown("---")
@@ -863,24 +975,28 @@ def main():
             
             with col1:
                 st.subheader("Olay Türü Dağılımı")
-                olay_counts = df['olay_turu'].value_counts()
+                olay_counts = pd.Series(stats['olay_turu']).sort_values(ascending=False)
                 st.bar_chart(olay_counts)
             
             with col2:
                 st.subheader("Birim Dağılımı")
-                birim_counts = df['birim'].value_counts()
+                birim_counts = pd.Series(stats['birim']).sort_values(ascending=False)
                 st.bar_chart(birim_counts)
             
             st.subheader("İlçe Bazlı Dağılım")
-            ilce_counts = df['ilce'].value_counts().head(15)
+            ilce_counts = pd.Series(stats['ilce']).sort_values(ascending=False).head(15)
             st.bar_chart(ilce_counts)
+            
+            if stats['saat']:
+                st.subheader("Saatlik Yeni Kayıtlar")
+                st.bar_chart(pd.Series(stats['saat']).sort_index().tail(48))
         else:
             st.warning("Veri seti bulunamadı. Lütfen önce veri setini oluşturun.")
     
     elif menu == "Olay Haritası":
         st.header("İstanbul Olay Haritası")
         
-        if df is not None:
+        if store is not None:
             col1, col2 = st.columns([3, 1])
             
             with col2:
@@ -892,10 +1008,11 @@ def main():
                     default=["Kritik", "Yüksek"]
                 )
                 
+                olay_turleri = store.distinct('olay_turu')
                 selected_types = st.multiselect(
                     "Olay Türü",
-                    df['olay_turu'].unique().tolist(),
-                    default=df['olay_turu'].unique().tolist()[:3]
+                    olay_turleri,
+                    default=olay_turleri[:3]
                 )
                 
                 sample_size = st.slider("Gösterilecek Kayıt", 10, 200, 50)
@@ -903,10 +1020,10 @@ def main():
                 show_heatmap = st.checkbox("Isı Haritası Göster", value=False)
             
             with col1:
-                filtered_df = df[
-                    (df['oncelik'].isin(selected_priority)) &
-                    (df['olay_turu'].isin(selected_types))
-                ].head(sample_size)
+                filtered_df = store.query(
+                    filters={'oncelik': selected_priority, 'olay_turu': selected_types},
+                    limit=sample_size
+                )
                 
                 if show_heatmap:
                     from folium.plugins import HeatMap
@@ -929,26 +1046,27 @@ def main():
     elif menu == "Veri Seti":
         st.header("Veri Seti Görüntüleyici")
         
-        if df is not None:
+        if store is not None:
             col1, col2, col3 = st.columns(3)
             
             with col1:
-                filter_olay = st.selectbox("Olay Türü", ["Tümü"] + df['olay_turu'].unique().tolist())
+                filter_olay = st.selectbox("Olay Türü", ["Tümü"] + store.distinct('olay_turu'))
             
             with col2:
-                filter_oncelik = st.selectbox("Öncelik", ["Tümü"] + df['oncelik'].unique().tolist())
+                filter_oncelik = st.selectbox("Öncelik", ["Tümü"] + store.distinct('oncelik'))
             
             with col3:
-                filter_ilce = st.selectbox("İlçe", ["Tümü"] + sorted(df['ilce'].unique().tolist()))
+                filter_ilce = st.selectbox("İlçe", ["Tümü"] + sorted(store.distinct('ilce')))
             
-            # Filtreleme
-            filtered_df = df.copy()
+            # Filtreleme (depoya itilir)
+            filters = {}
             if filter_olay != "Tümü":
-                filtered_df = filtered_df[filtered_df['olay_turu'] == filter_olay]
+                filters['olay_turu'] = filter_olay
             if filter_oncelik != "Tümü":
-                filtered_df = filtered_df[filtered_df['oncelik'] == filter_oncelik]
+                filters['oncelik'] = filter_oncelik
             if filter_ilce != "Tümü":
-                filtered_df = filtered_df[filtered_df['ilce'] == filter_ilce]
+                filters['ilce'] = filter_ilce
+            filtered_df = store.query(filters=filters)
             
             st.write(f"**Toplam: {len(filtered_df)} kayıt**")
             st.dataframe(filtered_df, use_container_width=True, height=500)
@@ -962,6 +1080,10 @@ def main():
                 "text/csv",
                 key='download-csv'
             )
+            
+            if STORAGE_BACKEND == "csv":
+                with st.expander("Bellek Kullanımı"):
+                    st.dataframe(memory_report(df), use_container_width=True, hide_index=True)
         else:
             st.warning("Veri seti bulunamadı.")
     
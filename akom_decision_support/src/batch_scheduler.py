@@ -0,0 +1,141 @@
+"""
+AKOM Mikro-Batch Zamanlayıcı
+Eşzamanlı oturumlardan gelen analiz isteklerini tek bir model çağrısında birleştirir
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+# Kuyruk birikmişken bile yeni isteklerin katılabilmesi için en az bekleme süresi
+MIN_TOPLAMA_MS = 1.0
+
+
+class _Istek:
+    """Kuyruktaki tek bir analiz isteği"""
+    
+    __slots__ = ("text", "future", "enqueued_at")
+    
+    def __init__(self, text):
+        self.text = text
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class BatchScheduler:
+    """
+    İstekleri kuyrukta toplayıp classifier.analyze_many() ile toplu çalıştırır
+    
+    Batch, max_batch istek birikince ya da ilk istek max_wait_ms beklediğinde
+    kapatılır; böylece her isteğin ek gecikmesi max_wait_ms ile sınırlıdır.
+    Kuyrukta zaten bekleyen istekler süreye bakılmadan hemen batch'e alınır.
+    """
+    
+    def __init__(self, classifier, max_batch=16, max_wait_ms=10):
+        self.classifier = classifier
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        
+        self._queue = queue.Queue()
+        self._stopped = threading.Event()
+        self._metrics_lock = threading.Lock()
+        
+        self.requests = 0
+        self.batches = 0
+        self.batch_sizes = {}  # batch boyutu -> adet
+        self._waits_ms = deque(maxlen=1000)  # son isteklerin kuyruk bekleme süreleri
+        
+        self._worker = threading.Thread(target=self._run, name="akom-batch-zamanlayici", daemon=True)
+        self._worker.start()
+    
+    def submit(self, ihbar_text):
+        """İsteği kuyruğa ekle; sonuç için Future döndürür"""
+        if self._stopped.is_set():
+            raise RuntimeError("Zamanlayıcı durduruldu")
+        istek = _Istek(ihbar_text)
+        self._queue.put(istek)
+        return istek.future
+    
+    def analyze(self, ihbar_text, timeout=None):
+        """classifier.analyze() ile aynı sonucu batch üzerinden döndür"""
+        return self.submit(ihbar_text).result(timeout)
+    
+    def _collect(self):
+        """İlk isteği bekle, ardından süre dolana ya da batch dolana kadar topla"""
+        try:
+            first = self._queue.get(timeout=0.5)
+        except queue.Empty:
+            return []
+        
+        batch = [first]
+        # Birikmiş istekler beklemeden alınır; yük altında ilk istek zaten
+        # max_wait_ms'den eski olduğu için aksi halde her batch tek istek olurdu
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        
+        deadline = max(first.enqueued_at + self.max_wait_ms / 1000.0,
+                       time.perf_counter() + MIN_TOPLAMA_MS / 1000.0)
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+    
+    def _run(self):
+        while not self._stopped.is_set():
+            batch = self._collect()
+            if not batch:
+                continue
+            
+            started = time.perf_counter()
+            with self._metrics_lock:
+                self.requests += len(batch)
+                self.batches += 1
+                self.batch_sizes[len(batch)] = self.batch_sizes.get(len(batch), 0) + 1
+                self._waits_ms.extend((started - istek.enqueued_at) * 1000.0 for istek in batch)
+            
+            try:
+                results = self.classifier.analyze_many([istek.text for istek in batch],
+                                                       batch_size=self.max_batch)
+            except Exception as e:
+                for istek in batch:
+                    istek.future.set_exception(e)
+                continue
+            
+            for istek, result in zip(batch, results):
+                istek.future.set_result(result)
+    
+    def get_metrics(self):
+        """Batch boyutu dağılımı ve kuyruk bekleme süreleri"""
+        with self._metrics_lock:
+            waits = sorted(self._waits_ms)
+            return {
+                "requests": self.requests,
+                "batches": self.batches,
+                "avg_batch_size": self.requests / self.batches if self.batches else 0.0,
+                "batch_sizes": dict(sorted(self.batch_sizes.items())),
+                "queue_depth": self._queue.qsize(),
+                "wait_ms_avg": sum(waits) / len(waits) if waits else 0.0,
+                "wait_ms_p95": waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+                "wait_ms_max": waits[-1] if waits else 0.0,
+            }
+    
+    def shutdown(self, wait=True):
+        """Çalışan iş parçacığını durdur; kuyrukta kalan istekler iptal edilir"""
+        self._stopped.set()
+        if wait:
+            self._worker.join()
+        while True:
+            try:
+                self._queue.get_nowait().future.cancel()
+            except queue.Empty:
+                break
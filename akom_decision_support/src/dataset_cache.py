@@ -0,0 +1,204 @@
+"""
+AKOM Veri Seti Önbelleği
+CSV veri setini süreç başına bir kez yükleyip yeni eklenen satırları artımlı olarak uygular
+"""
+
+import io
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+try:
+    from src.file_lock import FileLock
+    from src.dataset_schema import read_dataset_csv
+except ImportError:
+    from file_lock import FileLock
+    from dataset_schema import read_dataset_csv
+
+
+def _codes_dtype(n_categories):
+    """pandas'ın bu kadar kategori için kullandığı en küçük kod tipi"""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+class DatasetCache:
+    """
+    Bellekteki veri seti kopyası
+    
+    Dosyanın en son okunan bayt konumu tutulur; get() çağrısında dosya
+    büyümüşse yalnızca yeni eklenen satırlar okunup sütun dizilerine eklenir
+    (tüm CSV yeniden ayrıştırılmaz). Diziler payla büyütülür, böylece satır
+    başına ekleme maliyeti sabit kalır. Dosya yeniden yazılmışsa (ör. başlığa
+    yeni sütun eklendiyse) bir kez baştan yüklenir.
+    
+    Kategorik sütunlar tamsayı kodları olarak tutulur; yeni değerler
+    kategori listesinin sonuna eklenir, eski kodlar değişmez.
+    
+    get() kopya değil salt okunur görünüm döndürür; sayfalar veriyi
+    değiştirmek isterse önce kendi kopyasını almalıdır.
+    """
+    
+    def __init__(self, path, growth=1.5, intern_text=False):
+        self.path = path
+        self.growth = growth
+        self.intern_text = intern_text
+        
+        self._lock = threading.Lock()
+        self._columns = None
+        self._arrays = {}
+        self._categories = {}  # kategorik sütun -> değer listesi
+        self._category_codes = {}  # kategorik sütun -> {değer: kod}
+        self._rows = 0
+        self._offset = 0  # Ayrıştırılan son baytın konumu
+        self._inode = None
+        self._header = None  # Başlık satırının baytları
+        self._view = None
+        
+        self.version = 0  # Veri her değiştiğinde artar
+        self.full_loads = 0
+        self.delta_loads = 0
+    
+    def get(self):
+        """
+        Güncel veri setini döndür
+        
+        Returns:
+            pd.DataFrame | None: Salt okunur görünüm; dosya yoksa None
+        """
+        with self._lock:
+            if not os.path.exists(self.path):
+                self._columns = None
+                self._view = None
+                return None
+            
+            stat = os.stat(self.path)
+            if self._columns is None or stat.st_ino != self._inode or stat.st_size < self._offset:
+                self._full_load()
+            elif stat.st_size > self._offset:
+                self._load_delta()
+            
+            if self._view is None:
+                self._view = self._make_view()
+            return self._view
+    
+    def _read(self, offset):
+        """Dosya kilidi altında başlığı ve offset'ten sonraki tam satırları oku"""
+        with FileLock(self.path):
+            with open(self.path, "rb") as f:
+                inode = os.fstat(f.fileno()).st_ino
+                header = f.readline()
+                f.seek(max(offset, len(header)))
+                data = f.read()
+        return inode, header, data
+    
+    def _full_load(self):
+        inode, header, data = self._read(0)
+        df = read_dataset_csv(io.BytesIO(header + data), intern_text=self.intern_text)
+        
+        self._columns = list(df.columns)
+        self._arrays = {}
+        self._categories = {}
+        self._category_codes = {}
+        self._rows = 0
+        for column in self._columns:
+            if isinstance(df[column].dtype, pd.CategoricalDtype):
+                self._categories[column] = []
+                self._category_codes[column] = {}
+                dtype = _codes_dtype(0)
+            else:
+                values = df[column].to_numpy()
+                dtype = values.dtype if values.dtype.kind in "fiub" else object
+            self._arrays[column] = np.empty(0, dtype=dtype)
+        self._append(df)
+        
+        self._inode = inode
+        self._header = header
+        self._offset = len(header) + len(data)
+        self.full_loads += 1
+    
+    def _load_delta(self):
+        inode, header, data = self._read(self._offset)
+        if inode != self._inode or header != self._header:
+            # Dosya bu arada yeniden yazılmış
+            self._full_load()
+            return
+        if data:
+            df = read_dataset_csv(io.BytesIO(header + data), intern_text=self.intern_text)
+            self._append(df)
+        self._offset += len(data)
+        self.delta_loads += 1
+    
+    def _append(self, df):
+        """Yeni satırları sütun dizilerinin sonuna yaz (gerekirse kapasiteyi büyüt)"""
+        count = len(df)
+        if not count:
+            return
+        needed = self._rows + count
+        for column in self._columns:
+            array = self._arrays[column]
+            if column in self._categories:
+                values = self._encode(column, df[column])
+                dtype = _codes_dtype(len(self._categories[column]))
+                if dtype != array.dtype:
+                    # Kategori sayısı kod tipini aştı: kodlar bir kez genişletilir
+                    array = array.astype(dtype)
+            else:
+                values = df[column].to_numpy() if column in df.columns else np.full(count, np.nan)
+            
+            if array.dtype != object and column not in self._categories:
+                # Sayısal sütuna metin (ya da tamsayı sütununa NaN) gelirse sütun bir kez genişletilir
+                dtype = np.result_type(array.dtype, values.dtype) if values.dtype.kind in "fiub" else object
+                if dtype != array.dtype:
+                    array = array.astype(dtype)
+            if needed > len(array):
+                capacity = max(needed, int(len(array) * self.growth) + 1)
+                grown = np.empty(capacity, dtype=array.dtype)
+                grown[:self._rows] = array[:self._rows]
+                array = grown
+            array[self._rows:needed] = values
+            self._arrays[column] = array
+        
+        self._rows = needed
+        self._view = None
+        self.version += 1
+    
+    def _encode(self, column, series):
+        """Yeni parçadaki kategorik değerleri önbelleğin kodlarına çevir"""
+        categories = self._categories[column]
+        codes = self._category_codes[column]
+        if not isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.astype("category")
+        for value in series.cat.categories:
+            if value not in codes:
+                codes[value] = len(categories)
+                categories.append(value)
+        lookup = np.array([codes[value] for value in series.cat.categories] + [-1], dtype=np.int64)
+        # Eksik değerin kodu -1: lookup'ın son elemanı
+        return lookup[series.cat.codes.to_numpy()]
+    
+    def _make_view(self):
+        data = {}
+        for column in self._columns:
+            values = self._arrays[column][:self._rows]
+            values.flags.writeable = False
+            if column in self._categories:
+                values = pd.Categorical.from_codes(values, categories=self._categories[column], validate=False)
+            # copy=False ve açık dtype: pandas diziyi kopyalamadan sarar
+            data[column] = pd.Series(values, dtype=values.dtype, copy=False)
+        return pd.DataFrame(data, copy=False)
+    
+    def get_stats(self):
+        with self._lock:
+            return {
+                "rows": self._rows,
+                "capacity": len(next(iter(self._arrays.values()))) if self._arrays else 0,
+                "offset": self._offset,
+                "version": self.version,
+                "full_loads": self.full_loads,
+                "delta_loads": self.delta_loads,
+            }
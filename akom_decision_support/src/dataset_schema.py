@@ -0,0 +1,71 @@
+"""
+AKOM Veri Seti Şeması
+Veri setini bellekte sıkı tiplerle tutmak için sütun tipleri ve bellek raporu
+"""
+
+import sys
+
+import pandas as pd
+
+# Az sayıda farklı değeri olan sütunlar: category (tamsayı kodları + değer listesi)
+KATEGORIK_SUTUNLAR = ["olay_turu", "oncelik", "birim", "ilce", "mahalle"]
+
+# Koordinatlar için float32 (~1 m hassasiyet) yeterli
+KOORDINAT_SUTUNLARI = ["lat", "lon"]
+
+# İhbar metinleri: isteğe bağlı olarak sys.intern ile aynı metinler tek nesnede tutulur
+METIN_SUTUNLARI = ["ihbar", "ihbar_metni"]
+
+
+def csv_dtypes():
+    """pd.read_csv için dtype sözlüğü"""
+    dtypes = {column: "category" for column in KATEGORIK_SUTUNLAR}
+    dtypes.update({column: "float32" for column in KOORDINAT_SUTUNLARI})
+    return dtypes
+
+
+def intern_text_columns(df):
+    """Metin sütunlarındaki tekrarlanan metinleri tek nesnede topla (object dtype)"""
+    for column in METIN_SUTUNLARI:
+        if column in df.columns:
+            values = [sys.intern(v) if isinstance(v, str) else v for v in df[column]]
+            df[column] = pd.Series(values, index=df.index, dtype=object)
+    return df
+
+
+def read_dataset_csv(source, intern_text=False, **kwargs):
+    """
+    Veri setini sıkı tiplerle oku
+    
+    Args:
+        source: Dosya yolu ya da dosya benzeri nesne
+        intern_text: İhbar metinlerini intern et
+        **kwargs: pd.read_csv'ye aktarılır
+    """
+    df = pd.read_csv(source, dtype=csv_dtypes(), **kwargs)
+    if intern_text:
+        intern_text_columns(df)
+    return df
+
+
+def compact_dataset(df, intern_text=False):
+    """Başka kaynaktan (ör. SQLite) gelen DataFrame'i aynı sıkı tiplere çevir"""
+    dtypes = {column: dtype for column, dtype in csv_dtypes().items() if column in df.columns}
+    df = df.astype(dtypes)
+    if intern_text:
+        intern_text_columns(df)
+    return df
+
+
+def memory_report(df):
+    """
+    Sütun bazında bellek kullanımı
+    
+    Returns:
+        pd.DataFrame: sutun, tip, mb (son satır toplam)
+    """
+    usage = df.memory_usage(deep=True, index=False)
+    rows = [{"sutun": column, "tip": str(df[column].dtype), "mb": usage[column] / 1e6}
+            for column in df.columns]
+    rows.append({"sutun": "Toplam", "tip": "", "mb": usage.sum() / 1e6})
+    return pd.DataFrame(rows)
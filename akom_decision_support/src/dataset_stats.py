@@ -0,0 +1,184 @@
+"""
+AKOM Veri Seti İstatistikleri
+İstatistikler sayfası için öncelik, olay türü, birim, ilçe ve saat bazında
+kalıcı sayaçlar; her yeni kayıtta yalnızca eklenen satırlar sayılır
+"""
+
+import io
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+try:
+    from src.file_lock import FileLock
+    from src.dataset_schema import read_dataset_csv
+except ImportError:
+    from file_lock import FileLock
+    from dataset_schema import read_dataset_csv
+
+# Sayaç tutulan sütunlar
+SAYAC_SUTUNLARI = ["oncelik", "olay_turu", "birim", "ilce"]
+
+# Saat kovası biçimi (kayıt zamanı bilinen satırlar için)
+SAAT_BICIMI = "%Y-%m-%d %H:00"
+
+SAYAC_OKUMA_PARCASI = 100000
+
+
+class CsvStatsSource:
+    """CSV veri setinde yeni satırlar: son sayılan bayt konumundan sonrası"""
+    
+    def __init__(self, path):
+        self.path = path
+    
+    def identity(self):
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, "rb") as f:
+            return {"inode": os.fstat(f.fileno()).st_ino, "header": f.readline().decode("utf-8", "replace")}
+    
+    def watermark(self):
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+    
+    def read_since(self, watermark):
+        """
+        Returns:
+            (DataFrame parçaları üreteci, yeni watermark)
+        """
+        with FileLock(self.path):
+            with open(self.path, "rb") as f:
+                header = f.readline()
+                f.seek(max(watermark, len(header)))
+                data = f.read()
+        new_watermark = max(watermark, len(header)) + len(data)
+        if not data:
+            return iter(()), new_watermark
+        chunks = read_dataset_csv(io.BytesIO(header + data),
+                                  usecols=lambda c: c in SAYAC_SUTUNLARI or c == "kayit_zamani",
+                                  chunksize=SAYAC_OKUMA_PARCASI)
+        return chunks, new_watermark
+
+
+class SQLiteStatsSource:
+    """SQLite deposunda yeni satırlar: son sayılan id'den sonrası"""
+    
+    def __init__(self, store):
+        self.store = store
+    
+    def identity(self):
+        return {"db": os.path.abspath(self.store.db_path)}
+    
+    def watermark(self):
+        return self.store.max_id()
+    
+    def read_since(self, watermark):
+        df = self.store.query(columns=SAYAC_SUTUNLARI + ["kayit_zamani"], after_id=watermark)
+        return iter([df]), self.store.max_id()
+
+
+class DatasetStats:
+    """
+    Veri setinin kalıcı sayaçları
+    
+    Sayaçlar veri dosyasının yanında JSON olarak tutulur; dosyada hangi
+    konuma (CSV bayt konumu ya da SQLite id'si) kadar sayıldığı da saklanır.
+    get() veri kaynağı değişmemişse bellekteki sayaçları döndürür; değişmişse
+    yalnızca yeni satırlar sayılır. Başka süreçlerin eklediği satırlar da bu
+    yolla yakalanır. Kaynak yeniden yazılmışsa sayaçlar bir kez baştan kurulur.
+    
+    Saat kovaları satırın kayit_zamani değerine göre tutulur (SQLite deposu
+    her satıra yazar; CSV yazıcısı, veri seti src/migrate_dataset.py ile bu
+    sütunu kazandıktan sonra yazar). Zamanı olmayan eski satırların saat
+    kovası yoktur: ilk kurulumda sayılırlarsa hiçbir kovaya girmezler, sonradan
+    eklenmişlerse (göç yapılmamış CSV) sayıldıkları saatin kovasına girerler.
+    """
+    
+    def __init__(self, stats_path, source):
+        self.stats_path = stats_path
+        self.source = source
+        
+        self._lock = threading.Lock()
+        self._state = None
+        self._mtime = None
+    
+    @staticmethod
+    def _empty_state(identity):
+        return {"identity": identity, "watermark": 0, "toplam": 0, "saat": {},
+                **{column: {} for column in SAYAC_SUTUNLARI}}
+    
+    def _load(self):
+        """Sayaç dosyası başka süreçte değiştiyse yeniden oku"""
+        mtime = os.path.getmtime(self.stats_path) if os.path.exists(self.stats_path) else None
+        if self._state is not None and mtime == self._mtime:
+            return
+        if mtime is None:
+            self._state = None
+        else:
+            with open(self.stats_path, "r", encoding="utf-8") as f:
+                self._state = json.load(f)
+        self._mtime = mtime
+    
+    def _save(self):
+        tmp_path = self.stats_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.stats_path)
+        self._mtime = os.path.getmtime(self.stats_path)
+    
+    def refresh(self):
+        """Son sayımdan sonra eklenen satırları sayaçlara ekle"""
+        with self._lock, FileLock(self.stats_path):
+            self._load()
+            identity = self.source.identity()
+            if self._state is None or self._state["identity"] != identity \
+                    or self.source.watermark() < self._state["watermark"]:
+                print("Veri seti istatistikleri baştan hesaplanıyor...")
+                self._state = self._empty_state(identity)
+            
+            if self.source.watermark() == self._state["watermark"]:
+                return
+            
+            chunks, watermark = self.source.read_since(self._state["watermark"])
+            counted_at = time.strftime(SAAT_BICIMI)
+            initial = self._state["watermark"] == 0
+            # Sayfalara verilmiş sözlükler değiştirilmez; alt sözlükler yenileriyle değiştirilir
+            self._state = dict(self._state)
+            for chunk in chunks:
+                self._add(chunk, counted_at if not initial else None)
+            self._state["watermark"] = watermark
+            self._save()
+    
+    def _add(self, df, counted_at):
+        self._state["toplam"] += len(df)
+        for column in SAYAC_SUTUNLARI:
+            if column in df.columns:
+                counts = Counter(self._state[column])
+                counts.update(df[column].value_counts().to_dict())
+                self._state[column] = {key: int(n) for key, n in counts.items() if n}
+        
+        saat = Counter(self._state["saat"])
+        unknown = len(df)
+        if "kayit_zamani" in df.columns:
+            times = df["kayit_zamani"].dropna()
+            saat.update(time.strftime(SAAT_BICIMI, time.localtime(t)) for t in times)
+            unknown -= len(times)
+        if counted_at is not None and unknown:
+            saat[counted_at] += unknown
+        self._state["saat"] = dict(saat)
+    
+    def get(self):
+        """
+        Güncel sayaçlar
+        
+        Returns:
+            dict: toplam, oncelik, olay_turu, birim, ilce ve saat sayaçları
+        """
+        with self._lock:
+            self._load()
+            current = self._state is not None and self._state["watermark"] == self.source.watermark()
+        if not current:
+            self.refresh()
+        with self._lock:
+            return self._state
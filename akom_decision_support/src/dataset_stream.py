@@ -0,0 +1,157 @@
+"""
+AKOM Veri Seti Akış Okuyucu
+Veri setini parça parça okuyup sabit bellekle sayım, ısı haritası ve ilçe
+özetleri çıkaran yardımcılar
+
+Kullanım:
+    from src.utils import stream_dataset
+    
+    chunks = stream_dataset(columns=["ilce", "oncelik"], filters={"olay_turu": "Sel Baskını"})
+    count_by(chunks, ["ilce", "oncelik"])
+"""
+
+import numpy as np
+import pandas as pd
+
+try:
+    from src.dataset_schema import read_dataset_csv, intern_text_columns
+    from src.incident_store import INDEKSLI_SUTUNLAR, _as_list, _check_columns
+except ImportError:
+    from dataset_schema import read_dataset_csv, intern_text_columns
+    from incident_store import INDEKSLI_SUTUNLAR, _as_list, _check_columns
+
+# Varsayılan parça boyutu (satır)
+PARCA_BOYUTU = 100000
+
+# Isı haritası hücre boyutu (derece, ~1 km)
+ISI_HUCRE_BOYUTU = 0.01
+
+
+def _filter_chunk(chunk, filters, columns):
+    if filters:
+        mask = np.ones(len(chunk), dtype=bool)
+        for column, value in filters.items():
+            mask &= chunk[column].isin(_as_list(value)).to_numpy()
+        chunk = chunk[mask]
+    if columns is not None:
+        chunk = chunk[list(columns)]
+    return chunk
+
+
+def iter_csv_chunks(path, columns=None, filters=None, chunksize=PARCA_BOYUTU, intern_text=False):
+    """
+    CSV veri setini tipli parçalar halinde oku
+    
+    Args:
+        path: CSV dosyası
+        columns: Yalnızca bu sütunlar okunur (None: hepsi)
+        filters: {"ilce" | "olay_turu" | "oncelik" | "birim": değer ya da değer listesi}
+        chunksize: Parça başına okunan satır sayısı
+        intern_text: İhbar metinlerini intern et
+    
+    Yields:
+        pd.DataFrame: Filtreye uyan satırlar (boş parçalar atlanır)
+    """
+    filters = filters or {}
+    _check_columns(filters, INDEKSLI_SUTUNLAR)
+    
+    usecols = None
+    if columns is not None:
+        # Filtre sütunları okunur ama yalnızca istenmişse döndürülür
+        needed = set(columns) | set(filters)
+        usecols = lambda column: column in needed
+    
+    for chunk in read_dataset_csv(path, usecols=usecols, chunksize=chunksize):
+        chunk = _filter_chunk(chunk, filters, columns)
+        if len(chunk):
+            if intern_text:
+                intern_text_columns(chunk)
+            yield chunk
+
+
+def count_by(chunks, columns):
+    """
+    Parçalar üzerinde gruplu sayım
+    
+    Args:
+        columns: Sütun adı ya da listesi (ör. ["ilce", "oncelik"])
+    
+    Returns:
+        pd.Series: Çoktan aza sıralı sayılar
+    """
+    columns = _as_list(columns)
+    total = None
+    for chunk in chunks:
+        counts = chunk.groupby(columns, observed=True).size()
+        total = counts if total is None else total.add(counts, fill_value=0)
+    if total is None:
+        return pd.Series(dtype="int64", name="sayi")
+    return total.astype("int64").sort_values(ascending=False).rename("sayi")
+
+
+def heatmap_bins(chunks, cell_size=ISI_HUCRE_BOYUTU):
+    """
+    Koordinatları cell_size derecelik hücrelerde say
+    
+    Returns:
+        pd.DataFrame: lat, lon (hücre merkezi), sayi - HeatMap'e doğrudan verilebilir
+    """
+    total = None
+    for chunk in chunks:
+        coords = chunk[["lat", "lon"]].dropna()
+        cells = pd.DataFrame({
+            "lat_hucre": np.floor(coords["lat"].to_numpy(dtype=np.float64) / cell_size).astype(np.int64),
+            "lon_hucre": np.floor(coords["lon"].to_numpy(dtype=np.float64) / cell_size).astype(np.int64),
+        })
+        counts = cells.groupby(["lat_hucre", "lon_hucre"]).size()
+        total = counts if total is None else total.add(counts, fill_value=0)
+    if total is None:
+        return pd.DataFrame(columns=["lat", "lon", "sayi"])
+    
+    total = total.astype("int64").reset_index(name="sayi")
+    return pd.DataFrame({
+        "lat": (total["lat_hucre"] + 0.5) * cell_size,
+        "lon": (total["lon_hucre"] + 0.5) * cell_size,
+        "sayi": total["sayi"],
+    })
+
+
+def district_aggregates(chunks):
+    """
+    İlçe bazında özet: ihbar sayısı, öncelik dağılımı ve ortalama koordinat
+    
+    Parçalarda ilce, oncelik, lat ve lon sütunları bulunmalıdır.
+    
+    Returns:
+        pd.DataFrame: ilce indeksli; sayi, her öncelik için bir sütun, lat, lon
+    """
+    sums = None
+    priorities = None
+    for chunk in chunks:
+        ilce = chunk["ilce"].astype(object).to_numpy()
+        lat = chunk["lat"].to_numpy(dtype=np.float64)
+        lon = chunk["lon"].to_numpy(dtype=np.float64)
+        has_coords = ~(np.isnan(lat) | np.isnan(lon))
+        part = pd.DataFrame({
+            "sayi": 1,
+            "koordinatli": has_coords.astype(np.int64),
+            "lat_toplam": np.where(has_coords, lat, 0.0),
+            "lon_toplam": np.where(has_coords, lon, 0.0),
+        }).groupby(ilce).sum()
+        sums = part if sums is None else sums.add(part, fill_value=0)
+        
+        counts = pd.crosstab(ilce, chunk["oncelik"].astype(object).to_numpy())
+        priorities = counts if priorities is None else priorities.add(counts, fill_value=0)
+    
+    if sums is None:
+        return pd.DataFrame(columns=["sayi", "lat", "lon"])
+    
+    result = pd.DataFrame({"sayi": sums["sayi"]}, index=sums.index)
+    result = result.join(priorities).fillna(0).astype("int64")
+    # Koordinat toplamlarından ortalamaya
+    koordinatli = sums["koordinatli"].replace(0, np.nan)
+    result["lat"] = sums["lat_toplam"] / koordinatli
+    result["lon"] = sums["lon_toplam"] / koordinatli
+    result.index.name = "ilce"
+    result.columns.name = None
+    return result.sort_values("sayi", ascending=False)
@@ -0,0 +1,205 @@
+"""
+AKOM Veri Seti Yazıcısı
+akom_dataset.csv'ye yalnızca yeni satırı ekleyen, kilitli ve sadece-ekleme yazıcı
+"""
+
+import csv
+import io
+import os
+import threading
+import time
+
+import pandas as pd
+
+try:
+    from src.file_lock import FileLock
+except ImportError:
+    from file_lock import FileLock
+
+
+def _count_records(f, offset):
+    """offset'ten dosya sonuna kadarki CSV kayıtlarını say (tırnak içindeki satır sonları dahil)"""
+    f.seek(offset)
+    text = io.TextIOWrapper(f, encoding="utf-8", newline="")
+    try:
+        return sum(1 for _ in csv.reader(text))
+    finally:
+        text.detach()
+
+
+class DatasetAppender:
+    """
+    CSV veri setine satır ekleyen yazıcı
+    
+    - Her ekleme süreçler arası dosya kilidi altında yapılır; eşzamanlı
+      oturumlar birbirinin satırını ezmez.
+    - Yalnızca yeni satır yazılır; başlık sadece dosya yeni oluşturulurken yazılır.
+    - sync_every > 1 ise fsync her satırda değil N satırda bir yapılır (grup
+      commit); satırlar yine hemen okunabilir, yalnızca diske kalıcılık gecikir.
+      0 verilirse fsync işletim sistemine bırakılır.
+    - timestamp_column verilirse her satıra o sütunda ekleme zamanı (Unix
+      saniyesi) yazılır. Sütun yalnızca başlıkta zaten varsa yazılır; mevcut
+      veri setine add_column() (python src/migrate_dataset.py) ile bir kez
+      eklenir. Böylece ekleme hiçbir zaman tüm dosyayı yeniden yazmaz.
+    """
+    
+    def __init__(self, path, sync_every=1, sync_interval=None, timestamp_column=None):
+        """
+        Args:
+            path: CSV dosyası
+            sync_every: Kaç satırda bir fsync yapılacağı
+            sync_interval: Bu kadar saniye geçtiyse sync_every beklenmeden fsync yap
+            timestamp_column: Ekleme zamanının yazılacağı sütun (None: yazılmaz)
+        """
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.timestamp_column = timestamp_column
+        self._timestamp_warned = False
+        
+        self._lock = threading.Lock()
+        self._known_size = 0  # En son sayılan dosya boyutu
+        self._known_rows = 0  # Bu boyuttaki veri satırı sayısı
+        self._unsynced = 0
+        self._last_sync = time.time()
+    
+    def _read_header(self, f):
+        f.seek(0)
+        first_line = f.readline()
+        terminator = "\r\n" if first_line.endswith(b"\r\n") else "\n"
+        header = next(csv.reader([first_line.decode("utf-8-sig").rstrip("\r\n")]))
+        return header, terminator
+    
+    def _row_count(self, f, size):
+        """Veri satırı sayısı - yalnızca son sayımdan sonra eklenen kısım okunur"""
+        if self._known_size and size >= self._known_size:
+            added = _count_records(f, self._known_size) if size > self._known_size else 0
+            return self._known_rows + added
+        # İlk sayım ya da dosya küçülmüş (yeniden oluşturulmuş): baştan say
+        return _count_records(f, 0) - 1
+    
+    def _extend_header(self, columns):
+        """Yeni sütun gelirse dosya bir kez genişletilmiş başlıkla yeniden yazılır"""
+        df = pd.read_csv(self.path)
+        for column in columns:
+            if column not in df.columns:
+                df[column] = None
+        tmp_path = self.path + ".tmp"
+        df.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, self.path)
+        self._known_size = 0
+    
+    def append(self, row):
+        """
+        Satırı dosyanın sonuna ekle
+        
+        Returns:
+            int: Eklenen satırın 0 tabanlı veri satırı numarası
+        """
+        if self.timestamp_column:
+            row = {**row, self.timestamp_column: time.time()}
+        with self._lock, FileLock(self.path):
+            if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+                header, terminator = list(row), os.linesep
+                with open(self.path, "wb") as f:
+                    f.write(self._format(header, terminator))
+                self._known_size = 0
+            else:
+                with open(self.path, "rb") as f:
+                    header, terminator = self._read_header(f)
+                if self.timestamp_column and self.timestamp_column not in header:
+                    # Zaman sütunu için dosya yeniden yazılmaz; göç adımı beklenir
+                    if not self._timestamp_warned:
+                        print(f"{self.path} dosyasında '{self.timestamp_column}' sütunu yok, kayıt zamanı "
+                              f"yazılmayacak. Eklemek için: python src/migrate_dataset.py")
+                        self._timestamp_warned = True
+                    row = {column: value for column, value in row.items() if column != self.timestamp_column}
+                missing = [column for column in row if column not in header]
+                if missing:
+                    self._extend_header(missing)
+                    header = header + missing
+            
+            with open(self.path, "r+b") as f:
+                size = f.seek(0, os.SEEK_END)
+                row_number = self._row_count(f, size)
+                
+                f.seek(size)
+                data = b""
+                if size:
+                    f.seek(size - 1)
+                    if f.read(1) != b"\n":
+                        # Son satır satır sonu olmadan bitmişse önce satır sonu eklenir
+                        data = terminator.encode("utf-8")
+                data += self._format([row.get(column) for column in header], terminator)
+                f.seek(size)
+                f.write(data)
+                f.flush()
+                self._unsynced += 1
+                if self._should_sync():
+                    os.fsync(f.fileno())
+                    self._unsynced = 0
+                    self._last_sync = time.time()
+                
+                self._known_size = size + len(data)
+                self._known_rows = row_number + 1
+            return row_number
+    
+    def _should_sync(self):
+        if self.sync_every and self._unsynced >= self.sync_every:
+            return True
+        return self.sync_interval is not None and time.time() - self._last_sync >= self.sync_interval
+    
+    @staticmethod
+    def _format(values, terminator):
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator=terminator).writerow(["" if v is None else v for v in values])
+        return buffer.getvalue().encode("utf-8")
+    
+    def flush(self):
+        """Bekleyen (fsync edilmemiş) satırları diske zorla"""
+        with self._lock:
+            if self._unsynced and os.path.exists(self.path):
+                with open(self.path, "r+b") as f:
+                    os.fsync(f.fileno())
+                self._unsynced = 0
+                self._last_sync = time.time()
+
+
+def add_column(path, column):
+    """
+    CSV veri setine boş bir sütun ekle (tek seferlik şema göçü)
+    
+    Dosya satır satır kopyalanır; mevcut baytlara yalnızca her kaydın sonuna
+    bir ayraç eklenir (sayı biçimi ve tırnaklar korunur). Dosya kilidi göç
+    boyunca tutulur.
+    
+    Returns:
+        bool: Sütun eklendiyse True, zaten varsa False
+    """
+    with FileLock(path):
+        with open(path, "rb") as src:
+            first_line = src.readline()
+            header = next(csv.reader([first_line.decode("utf-8-sig").rstrip("\r\n")]))
+            if column in header:
+                return False
+            
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as dst:
+                dst.write(_with_field(first_line, column.encode("utf-8")))
+                in_quotes = False
+                for line in src:
+                    # Tırnak içindeki satır sonları kaydı bitirmez ("" kaçışı paritesi bozmaz)
+                    in_quotes ^= line.count(b'"') % 2 == 1
+                    dst.write(line if in_quotes else _with_field(line, b""))
+                dst.flush()
+                os.fsync(dst.fileno())
+        os.replace(tmp_path, path)
+    return True
+
+
+def _with_field(line, value):
+    """Kayıt satırının sonuna (satır sonundan önce) bir alan ekle"""
+    body = line.rstrip(b"\r\n")
+    if not body:
+        return line
+    return body + b"," + value + line[len(body):]
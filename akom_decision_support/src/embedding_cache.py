@@ -0,0 +1,266 @@
+"""
+AKOM Embedding Önbelleği
+Bellek içi LRU + disk üzerinde float32 kayıtlı iki katmanlı önbellek
+"""
+
+import hashlib
+import json
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+
+try:
+    from src.file_lock import FileLock
+except ImportError:
+    from file_lock import FileLock
+
+
+def normalize_text(text):
+    """Önbellek anahtarı için metni normalize et (Unicode NFC + boşluk sadeleştirme)"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def embedding_key(text, revision):
+    """Normalize metin ve model sürümünden önbellek anahtarı üret"""
+    payload = f"{revision}\x00{normalize_text(text)}".encode("utf-8")
+    return hashlib.sha1(payload).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    İki katmanlı embedding önbelleği
+    
+    1. katman: boyutu sınırlı bellek içi LRU
+    2. katman: disk üzerinde sıkı float32 dosyası
+       - vectors.f32: art arda yazılmış float32 vektörler
+       - keys.txt: her satırda "<satır> <anahtar>" (eski biçimde yalnızca anahtar,
+         satır numarası dosyadaki sırası)
+       - meta.json: vektör boyutu
+    
+    Disk yazmaları süreçler arası dosya kilidi altında yapılır; satır numarası
+    vektör dosyasının o anki boyutundan alınır. Başka bir süreç dosyaları
+    sıkıştırırsa (dosya kimliği değişir) indeks yeniden okunur.
+    """
+    
+    def __init__(self, cache_dir=None, revision="main",
+                 max_memory_items=1024, max_disk_items=100000):
+        self.cache_dir = cache_dir
+        self.revision = revision
+        self.max_memory_items = max_memory_items
+        self.max_disk_items = max_disk_items
+        
+        self._memory = OrderedDict()
+        self._disk_index = {}
+        self._disk_rows = 0
+        self._disk_vectors = None
+        self._disk_id = None
+        self._dim = None
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._load_disk()
+    
+    # ---- Disk katmanı ----
+    
+    def _path(self, name):
+        return os.path.join(self.cache_dir, name)
+    
+    def _file_id(self):
+        """vectors.f32 kimliği; sıkıştırma dosyayı değiştirdiğinde değişir"""
+        try:
+            return os.stat(self._path("vectors.f32")).st_ino
+        except OSError:
+            return None
+    
+    def _load_disk(self):
+        """Disk üzerindeki anahtarları indeksle (vektörler ihtiyaç oldukça okunur)"""
+        self._disk_index = {}
+        self._disk_rows = 0
+        self._disk_vectors = None
+        self._disk_id = self._file_id()
+        meta_path = self._path("meta.json")
+        if not os.path.exists(meta_path):
+            return
+        
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                self._dim = json.load(f)["dim"]
+            
+            with open(self._path("keys.txt"), "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+            
+            vector_rows = os.path.getsize(self._path("vectors.f32")) // (4 * self._dim)
+            for line_no, line in enumerate(lines):
+                parts = line.split()
+                if len(parts) == 2:
+                    row, key = int(parts[0]), parts[1]
+                elif len(parts) == 1:
+                    row, key = line_no, parts[0]
+                else:
+                    continue
+                # Vektörü tamamlanmamış kayıtlar yok sayılır
+                if row < vector_rows:
+                    self._disk_index[key] = row
+            self._disk_rows = vector_rows
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Embedding önbelleği okunamadı, sıfırdan başlanıyor: {e}")
+            self._reset_disk()
+    
+    def _sync_disk(self):
+        """Dosyalar başka bir süreçte yeniden yazıldıysa indeksi yeniden oku"""
+        if self._file_id() != self._disk_id:
+            self._load_disk()
+    
+    def _reset_disk(self):
+        self._disk_index = {}
+        self._disk_rows = 0
+        self._disk_vectors = None
+        self._dim = None
+        for name in ("meta.json", "keys.txt", "vectors.f32"):
+            if os.path.exists(self._path(name)):
+                os.remove(self._path(name))
+        self._disk_id = None
+    
+    def _read_disk(self, row):
+        """Diskteki bir vektörü memory-map üzerinden oku"""
+        if self._disk_vectors is None or row >= len(self._disk_vectors):
+            rows = os.path.getsize(self._path("vectors.f32")) // (4 * self._dim)
+            self._disk_vectors = np.memmap(self._path("vectors.f32"), dtype=np.float32,
+                                           mode="r", shape=(rows, self._dim))
+        return np.array(self._disk_vectors[row:row + 1])
+    
+    def _write_disk(self, key, vector):
+        """Vektörü disk dosyasının sonuna ekle (süreçler arası kilit altında)"""
+        with FileLock(self._path("vectors.f32")):
+            self._sync_disk()
+            if self._dim is not None and vector.shape[-1] != self._dim:
+                # Model boyutu değiştiyse eski disk kayıtları geçersizdir
+                self._reset_disk()
+            if self._dim is None:
+                self._dim = vector.shape[-1]
+                with open(self._path("meta.json"), "w", encoding="utf-8") as f:
+                    json.dump({"dim": self._dim}, f)
+            
+            row_bytes = 4 * self._dim
+            with open(self._path("vectors.f32"), "ab") as f:
+                size = f.seek(0, os.SEEK_END)
+                if size % row_bytes:
+                    # Yarım kalmış vektör yazması atılır
+                    size -= size % row_bytes
+                    f.truncate(size)
+                row = size // row_bytes
+                f.write(vector.tobytes())
+            # Anahtar satır numarasıyla yazılır; başka süreçlerin kayıtlarıyla karışmaz
+            with open(self._path("keys.txt"), "a", encoding="utf-8") as f:
+                f.write(f"{row} {key}\n")
+            self._disk_id = self._file_id()
+            
+            self._disk_index[key] = row
+            self._disk_rows = row + 1
+            
+            if len(self._disk_index) > self.max_disk_items:
+                # Sıkıştırma diskteki tüm kayıtlar üzerinden yapılır
+                self._load_disk()
+                if len(self._disk_index) > self.max_disk_items:
+                    self._compact_disk()
+    
+    def _compact_disk(self):
+        """Disk katmanını en yeni max_disk_items kayda indir"""
+        keep = sorted(self._disk_index.items(), key=lambda item: item[1])[-self.max_disk_items:]
+        self.evictions += len(self._disk_index) - len(keep)
+        
+        source = np.memmap(self._path("vectors.f32"), dtype=np.float32,
+                           mode="r", shape=(self._disk_rows, self._dim))
+        vectors = np.array(source[[row for _, row in keep]])
+        del source
+        # Windows'ta eşlenmiş dosya değiştirilemez, önce memory-map kapatılır
+        self._disk_vectors = None
+        
+        tmp_vectors = self._path("vectors.f32.tmp")
+        tmp_keys = self._path("keys.txt.tmp")
+        vectors.tofile(tmp_vectors)
+        with open(tmp_keys, "w", encoding="utf-8") as f:
+            f.write("".join(f"{row} {key}\n" for row, (key, _) in enumerate(keep)))
+        os.replace(tmp_vectors, self._path("vectors.f32"))
+        os.replace(tmp_keys, self._path("keys.txt"))
+        
+        self._disk_index = {key: row for row, (key, _) in enumerate(keep)}
+        self._disk_rows = len(keep)
+        self._disk_id = self._file_id()
+    
+    # ---- Bellek katmanı ----
+    
+    def _remember(self, key, vector):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+    
+    # ---- Genel API ----
+    
+    def get(self, text):
+        """Önbellekteki embedding'i döndür, yoksa None"""
+        key = embedding_key(text, self.revision)
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                self.memory_hits += 1
+                return vector.copy()
+            
+            if self.cache_dir:
+                self._sync_disk()
+            row = self._disk_index.get(key)
+            if row is not None:
+                vector = self._read_disk(row)
+                self._remember(key, vector)
+                self.hits += 1
+                self.disk_hits += 1
+                return vector.copy()
+            
+            self.misses += 1
+            return None
+    
+    def put(self, text, embedding):
+        """Embedding'i iki katmana da kaydet"""
+        key = embedding_key(text, self.revision)
+        vector = np.asarray(embedding, dtype=np.float32).reshape(1, -1)
+        with self._lock:
+            self._remember(key, vector.copy())
+            if self.cache_dir and key not in self._disk_index:
+                self._write_disk(key, vector)
+    
+    def clear(self, disk=False):
+        """Bellek katmanını (isteğe bağlı olarak diski de) temizle"""
+        with self._lock:
+            self._memory.clear()
+            if disk and self.cache_dir:
+                with FileLock(self._path("vectors.f32")):
+                    self._reset_disk()
+    
+    def stats(self):
+        """İsabet/ıska sayaçlarını döndür"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "memory_items": len(self._memory),
+                "disk_items": len(self._disk_index),
+            }
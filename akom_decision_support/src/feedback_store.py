@@ -0,0 +1,202 @@
+"""
+AKOM Geri Bildirim Deposu
+Aktif öğrenme düzeltmelerini sadece-ekleme JSON satırları olarak kaydeder ve
+arka planda (tahmin, doğru) çiftlerinin sayılarına katlar
+"""
+
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+try:
+    from src.file_lock import FileLock
+except ImportError:
+    from file_lock import FileLock
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+# Disk düzeni:
+#   feedback.jsonl          - her satırda bir düzeltme kaydı (sadece ekleme)
+#   feedback_summary.parquet - alan, tahmin, dogru, sayi; metadata'da işlenen bayt konumu
+#   feedback.csv            - eski biçim; ilk açılışta bir kez günlüğe aktarılır
+FEEDBACK_LOG_PATH = os.path.join(DATA_DIR, "feedback.jsonl")
+FEEDBACK_SUMMARY_PATH = os.path.join(DATA_DIR, "feedback_summary.parquet")
+LEGACY_FEEDBACK_PATH = os.path.join(DATA_DIR, "feedback.csv")
+
+# Sayılan alanlar: alan adı -> (tahmin sütunu, doğru sütunu)
+ALANLAR = {
+    "olay_turu": ("tahmin_olay", "dogru_olay"),
+    "oncelik": ("tahmin_oncelik", "dogru_oncelik"),
+}
+
+OZET_SUTUNLARI = ["alan", "tahmin", "dogru", "sayi"]
+
+
+class FeedbackStore:
+    """
+    Geri bildirim günlüğü ve sıkıştırılmış özeti
+    
+    append() tek bir JSON satırını dosya kilidi altında günlüğün sonuna yazar;
+    dosyanın geri kalanı okunmaz. compact() yalnızca son sıkıştırmadan sonra
+    eklenen satırları okuyup özet dosyasındaki sayılara ekler. start_compactor()
+    bunu arka planda belirli aralıklarla çalıştırır.
+    """
+    
+    def __init__(self, log_path=FEEDBACK_LOG_PATH, summary_path=FEEDBACK_SUMMARY_PATH,
+                 legacy_path=LEGACY_FEEDBACK_PATH):
+        self.log_path = log_path
+        self.summary_path = summary_path
+        
+        self._stop = threading.Event()
+        self._thread = None
+        
+        if legacy_path and os.path.exists(legacy_path):
+            self._import_legacy(legacy_path)
+    
+    def _import_legacy(self, legacy_path):
+        """Eski feedback.csv kayıtlarını (günlük henüz yoksa) bir kez günlüğe aktar"""
+        with FileLock(self.log_path):
+            if os.path.exists(self.log_path):
+                return
+            df = pd.read_csv(legacy_path, dtype=str)
+            records = df.astype(object).where(df.notna(), None).to_dict("records")
+            tmp_path = self.log_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                for record in records:
+                    f.write(self._format(record))
+            os.replace(tmp_path, self.log_path)
+        print(f"{len(records)} eski geri bildirim kaydı {self.log_path} dosyasına aktarıldı.")
+    
+    @staticmethod
+    def _format(record):
+        return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+    
+    def append(self, record):
+        """Düzeltme kaydını günlüğün sonuna ekle"""
+        data = self._format(record)
+        with FileLock(self.log_path):
+            with open(self.log_path, "ab") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+    
+    def _read_summary(self):
+        """Özet sayıları ve işlenmiş günlük konumu"""
+        if not os.path.exists(self.summary_path):
+            return Counter(), 0
+        table = pq.read_table(self.summary_path)
+        offset = int((table.schema.metadata or {}).get(b"offset", b"0"))
+        counts = Counter()
+        for row in table.to_pylist():
+            counts[(row["alan"], row["tahmin"], row["dogru"])] = row["sayi"]
+        return counts, offset
+    
+    def _read_log(self, offset):
+        """offset'ten sonraki tam satırları oku; (kayıtlar, yeni offset)"""
+        if not os.path.exists(self.log_path):
+            return [], offset
+        with FileLock(self.log_path):
+            with open(self.log_path, "rb") as f:
+                f.seek(offset)
+                data = f.read()
+        # Yarım kalmış son satır bir sonraki sıkıştırmaya bırakılır
+        data = data[:data.rfind(b"\n") + 1]
+        records = []
+        for line in data.splitlines():
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                print(f"Bozuk geri bildirim satırı atlandı: {line[:80]!r}")
+        return records, offset + len(data)
+    
+    @staticmethod
+    def _count(records, counts):
+        for record in records:
+            for alan, (tahmin_col, dogru_col) in ALANLAR.items():
+                tahmin, dogru = record.get(tahmin_col), record.get(dogru_col)
+                if tahmin is not None and dogru is not None:
+                    counts[(alan, tahmin, dogru)] += 1
+        return counts
+    
+    def compact(self):
+        """
+        Yeni günlük satırlarını özet dosyasına katla
+        
+        Returns:
+            int: Katlanan kayıt sayısı
+        """
+        # Özet kilidi: aynı anda yalnızca bir sıkıştırıcı çalışır
+        with FileLock(self.summary_path):
+            counts, offset = self._read_summary()
+            if os.path.exists(self.log_path) and os.path.getsize(self.log_path) < offset:
+                # Günlük yeniden oluşturulmuş: baştan say
+                counts, offset = Counter(), 0
+            records, new_offset = self._read_log(offset)
+            if new_offset == offset:
+                return 0
+            
+            self._count(records, counts)
+            rows = [{"alan": alan, "tahmin": tahmin, "dogru": dogru, "sayi": sayi}
+                    for (alan, tahmin, dogru), sayi in sorted(counts.items())]
+            schema = pa.schema([("alan", pa.string()), ("tahmin", pa.string()),
+                                ("dogru", pa.string()), ("sayi", pa.int64())],
+                               metadata={"offset": str(new_offset)})
+            table = pa.Table.from_pylist(rows, schema=schema)
+            tmp_path = self.summary_path + ".tmp"
+            pq.write_table(table, tmp_path)
+            os.replace(tmp_path, self.summary_path)
+            return len(records)
+    
+    def get_summary(self, include_pending=True):
+        """
+        (tahmin, doğru) çiftlerinin sayıları
+        
+        Args:
+            include_pending: Henüz sıkıştırılmamış günlük satırlarını da say
+        
+        Returns:
+            pd.DataFrame: alan, tahmin, dogru, sayi
+        """
+        counts, offset = self._read_summary()
+        if include_pending:
+            records, _ = self._read_log(offset)
+            self._count(records, counts)
+        rows = [(alan, tahmin, dogru, sayi) for (alan, tahmin, dogru), sayi in sorted(counts.items())]
+        return pd.DataFrame(rows, columns=OZET_SUTUNLARI)
+    
+    def load_records(self):
+        """Günlükteki tüm düzeltme kayıtları (eğitim için)"""
+        records, _ = self._read_log(0)
+        return pd.DataFrame(records)
+    
+    def start_compactor(self, interval=60.0):
+        """Arka planda her interval saniyede bir compact() çalıştır"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._compact_loop, args=(interval,),
+                                        name="akom-geri-bildirim", daemon=True)
+        self._thread.start()
+    
+    def _compact_loop(self, interval):
+        while not self._stop.wait(interval):
+            try:
+                started = time.perf_counter()
+                folded = self.compact()
+                if folded:
+                    print(f"Geri bildirim özeti güncellendi: {folded} kayıt "
+                          f"({(time.perf_counter() - started) * 1000:.0f} ms)")
+            except Exception as e:
+                print(f"Geri bildirim sıkıştırma hatası: {e}")
+    
+    def stop_compactor(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,83 @@
+"""
+AKOM Dosya Kilidi
+Aynı dosyaya yazan süreçler (Streamlit oturumları, CLI araçları) arasında özel kilit
+"""
+
+import os
+import threading
+import time
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+class FileLock:
+    """
+    Yan dosya (<yol>.lock) üzerinde süreçler arası özel kilit
+    
+    Unix'te fcntl.flock, Windows'ta msvcrt.locking kullanılır. Aynı süreçteki
+    iş parçacıkları ayrıca bir threading.Lock ile sıraya sokulur.
+    
+    Kullanım:
+        with FileLock(data_path):
+            ...
+    """
+    
+    _thread_locks = {}
+    _registry_lock = threading.Lock()
+    
+    def __init__(self, path, timeout=None, poll_interval=0.05):
+        self.lock_path = path + ".lock"
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._file = None
+        
+        with FileLock._registry_lock:
+            self._thread_lock = FileLock._thread_locks.setdefault(os.path.abspath(self.lock_path),
+                                                                  threading.Lock())
+    
+    def acquire(self):
+        deadline = None if self.timeout is None else time.time() + self.timeout
+        if not self._thread_lock.acquire(timeout=-1 if self.timeout is None else self.timeout):
+            raise TimeoutError(f"Kilit alınamadı: {self.lock_path}")
+        
+        try:
+            self._file = open(self.lock_path, "a+b")
+            while True:
+                try:
+                    if os.name == "nt":
+                        self._file.seek(0)
+                        msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+                    else:
+                        fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    return self
+                except OSError:
+                    if deadline is not None and time.time() >= deadline:
+                        raise TimeoutError(f"Kilit alınamadı: {self.lock_path}")
+                    time.sleep(self.poll_interval)
+        except BaseException:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._thread_lock.release()
+            raise
+    
+    def release(self):
+        try:
+            if os.name == "nt":
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._file.close()
+            self._file = None
+            self._thread_lock.release()
+    
+    def __enter__(self):
+        return self.acquire()
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
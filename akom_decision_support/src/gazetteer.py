@@ -0,0 +1,125 @@
+"""
+AKOM Adres Sözlüğü (Gazetteer)
+Mahalle, cadde ve sokak adlarını tek taramada bulan normalize n-gram indeksi
+"""
+
+import re
+
+# Ek varyasyonları tek bir kanonik belirtece indirgenir
+MAHALLE_EKLERI = {"mahallesi", "mahallesinde", "mahallesine", "mahallesinden", "mahalle", "mah"}
+CADDE_EKLERI = {"caddesi", "caddesinde", "caddesine", "caddesinden", "cadde", "caddede", "cad"}
+SOKAK_EKLERI = {"sokak", "sokağı", "sokağında", "sokağına", "sokakta", "sok"}
+
+KANONIK_EKLER = {}
+KANONIK_EKLER.update({ek: "mahallesi" for ek in MAHALLE_EKLERI})
+KANONIK_EKLER.update({ek: "caddesi" for ek in CADDE_EKLERI})
+KANONIK_EKLER.update({ek: "sokak" for ek in SOKAK_EKLERI})
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Türkçe'ye özgü büyük/küçük harf dönüşümü (I -> ı, İ -> i)
+_TR_LOWER = str.maketrans({"I": "ı", "İ": "i"})
+
+
+def normalize_token(token):
+    """Belirteci küçük harfe çevir ve adres eklerini kanonik hale getir"""
+    token = token.translate(_TR_LOWER).lower()
+    return KANONIK_EKLER.get(token, token)
+
+
+def tokenize(text):
+    """Metni normalize belirteçlere ayır"""
+    return [normalize_token(match.group(0)) for match in TOKEN_PATTERN.finditer(text)]
+
+
+class Gazetteer:
+    """
+    Bilinen mahalle/cadde/sokak adlarının n-gram hash indeksi
+    
+    Anahtarlar normalize belirteç demetleridir; tarama her konumda en uzun
+    eşleşmeyi seçerek metni bir kez dolaşır.
+    """
+    
+    def __init__(self, ilceler, caddeler, sokaklar):
+        """
+        Args:
+            ilceler: {ilçe: {"mahalleler": [...]}} (data_generator.ILCELER biçimi)
+            caddeler: Cadde adları (ör. "Cumhuriyet Caddesi")
+            sokaklar: Sokak adları (ör. "Yıldız Sokak")
+        """
+        self._entries = {}
+        self.max_len = 1
+        
+        for ilce, bilgi in ilceler.items():
+            self._add(ilce, ("ilce", ilce, None))
+            for mahalle in bilgi["mahalleler"]:
+                self._add(mahalle, ("mahalle", mahalle, ilce))
+        
+        for cadde in caddeler:
+            self._add(cadde, ("cadde", self._strip_suffix(cadde, "caddesi"), None))
+        
+        for sokak in sokaklar:
+            self._add(sokak, ("sokak", self._strip_suffix(sokak, "sokak"), None))
+    
+    @staticmethod
+    def _strip_suffix(name, ek):
+        """'Cumhuriyet Caddesi' -> 'Cumhuriyet' (ek yoksa ad aynen kalır)"""
+        words = name.split()
+        if len(words) > 1 and normalize_token(words[-1]) == ek:
+            return " ".join(words[:-1])
+        return name
+    
+    def _add(self, name, entry):
+        key = tuple(tokenize(name))
+        if not key:
+            return
+        entries = self._entries.setdefault(key, [])
+        if entry not in entries:
+            entries.append(entry)
+        self.max_len = max(self.max_len, len(key))
+    
+    def scan(self, text):
+        """
+        Metni tek geçişte tara
+        
+        Returns:
+            dict: mahalle (ad, [ilçeler]) - ardından "Mahallesi" gelen ilk eşleşme,
+                  mahalle_adaylari [(ad, [ilçeler])] - eksiz geçen mahalle adları,
+                  ilceler, cadde, sokak
+        """
+        tokens = tokenize(text)
+        sonuc = {"mahalle": None, "mahalle_adaylari": [], "ilceler": [], "cadde": None, "sokak": None}
+        
+        i = 0
+        n = len(tokens)
+        while i < n:
+            for length in range(min(self.max_len, n - i), 0, -1):
+                entries = self._entries.get(tuple(tokens[i:i + length]))
+                if entries:
+                    break
+            else:
+                i += 1
+                continue
+            
+            next_token = tokens[i + length] if i + length < n else None
+            mahalleler = {}
+            for tur, ad, ilce in entries:
+                if tur == "mahalle":
+                    mahalleler.setdefault(ad, []).append(ilce)
+                elif tur == "ilce" and next_token != "mahallesi" and ad not in sonuc["ilceler"]:
+                    sonuc["ilceler"].append(ad)
+                elif tur == "cadde" and sonuc["cadde"] is None:
+                    sonuc["cadde"] = ad
+                elif tur == "sokak" and sonuc["sokak"] is None:
+                    sonuc["sokak"] = ad
+            
+            for ad, ilceler in mahalleler.items():
+                if next_token == "mahallesi":
+                    if sonuc["mahalle"] is None:
+                        sonuc["mahalle"] = (ad, ilceler)
+                else:
+                    sonuc["mahalle_adaylari"].append((ad, ilceler))
+            
+            i += length
+        
+        return sonuc
@@ -0,0 +1,231 @@
+"""
+AKOM İhbar Deposu
+Filtreleri veri kaynağına iten sorgu katmanı: indeksli SQLite ya da bellekteki DataFrame
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+try:
+    from src.file_lock import FileLock
+except ImportError:
+    from file_lock import FileLock
+
+# Veri setindeki sütunlar (CSV başlığıyla aynı sırada)
+SUTUNLAR = ["ihbar", "olay_turu", "oncelik", "birim", "ilce", "mahalle", "lat", "lon", "ihbar_metni"]
+
+# Filtre ve gruplamada kullanılabilen sütunlar (hepsi indeksli)
+INDEKSLI_SUTUNLAR = ["ilce", "olay_turu", "oncelik", "birim", "kayit_zamani"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS incidents (
+    id INTEGER PRIMARY KEY,
+    ihbar TEXT,
+    olay_turu TEXT,
+    oncelik TEXT,
+    birim TEXT,
+    ilce TEXT,
+    mahalle TEXT,
+    lat REAL,
+    lon REAL,
+    ihbar_metni TEXT,
+    kayit_zamani REAL
+);
+CREATE INDEX IF NOT EXISTS idx_incidents_ilce ON incidents (ilce);
+CREATE INDEX IF NOT EXISTS idx_incidents_olay_turu ON incidents (olay_turu);
+CREATE INDEX IF NOT EXISTS idx_incidents_oncelik ON incidents (oncelik);
+CREATE INDEX IF NOT EXISTS idx_incidents_birim ON incidents (birim);
+CREATE INDEX IF NOT EXISTS idx_incidents_kayit_zamani ON incidents (kayit_zamani);
+"""
+
+
+def _as_list(value):
+    if isinstance(value, (list, tuple, set)):
+        return list(value)
+    return [value]
+
+
+def _check_columns(columns, allowed):
+    for column in columns:
+        if column not in allowed:
+            raise ValueError(f"Bilinmeyen sütun: {column}")
+
+
+class SQLiteIncidentStore:
+    """
+    İhbarları indeksli SQLite tablosunda tutan depo
+    
+    Sayfalar filtreleri (ör. {"oncelik": ["Kritik", "Yüksek"], "ilce": "Kadıköy"})
+    doğrudan SQL'e iter; tüm veri setini belleğe yüklemek gerekmez. Satır
+    kimlikleri ekleme sırasıyla 1'den başlar, böylece id - 1 CSV'deki satır
+    numarasına (ve kNN indeksine) karşılık gelir.
+    """
+    
+    def __init__(self, db_path, csv_path=None):
+        """
+        Args:
+            db_path: SQLite dosyası
+            csv_path: Veritabanı boşsa bir kez içe aktarılacak CSV veri seti
+        """
+        self.db_path = db_path
+        self._local = threading.local()
+        
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with FileLock(db_path):
+            conn = self._conn()
+            conn.executescript(SCHEMA)
+            if csv_path and os.path.exists(csv_path) and self.count() == 0:
+                self.import_csv(csv_path)
+    
+    def _conn(self):
+        """İş parçacığı başına bir bağlantı"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            # WAL: okuyucular yazarları beklemez
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def import_csv(self, csv_path, chunksize=50000):
+        """CSV veri setini satır sırasını koruyarak parça parça içe aktar"""
+        print(f"Veri seti SQLite'a aktarılıyor: {csv_path}")
+        conn = self._conn()
+        total = 0
+        for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+            for column in SUTUNLAR:
+                if column not in chunk.columns:
+                    chunk[column] = None
+            rows = chunk[SUTUNLAR].astype(object).where(chunk[SUTUNLAR].notna(), None).values.tolist()
+            with conn:
+                conn.executemany(
+                    f"INSERT INTO incidents ({', '.join(SUTUNLAR)}) VALUES ({', '.join('?' * len(SUTUNLAR))})",
+                    rows)
+            total += len(rows)
+        print(f"{total:,} satır aktarıldı.")
+        return total
+    
+    def append(self, row):
+        """
+        Yeni ihbarı ekle
+        
+        Returns:
+            int: 0 tabanlı satır numarası (id - 1)
+        """
+        values = [row.get(column) for column in SUTUNLAR] + [time.time()]
+        conn = self._conn()
+        with conn:
+            cursor = conn.execute(
+                f"INSERT INTO incidents ({', '.join(SUTUNLAR)}, kayit_zamani) "
+                f"VALUES ({', '.join('?' * (len(SUTUNLAR) + 1))})", values)
+        return cursor.lastrowid - 1
+    
+    def _where(self, filters, since=None, until=None):
+        clauses = []
+        params = []
+        for column, value in (filters or {}).items():
+            _check_columns([column], INDEKSLI_SUTUNLAR)
+            values = _as_list(value)
+            if not values:
+                # Boş seçim hiçbir satırla eşleşmez
+                clauses.append("0")
+                continue
+            clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+        if since is not None:
+            clauses.append("kayit_zamani >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("kayit_zamani < ?")
+            params.append(until)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+    
+    def count(self, filters=None, since=None, until=None):
+        """Filtreye uyan ihbar sayısı"""
+        where, params = self._where(filters, since, until)
+        return self._conn().execute(f"SELECT COUNT(*) FROM incidents{where}", params).fetchone()[0]
+    
+    def value_counts(self, column, filters=None, limit=None):
+        """Sütun değerlerinin sayıları (çoktan aza), pandas value_counts gibi"""
+        _check_columns([column], INDEKSLI_SUTUNLAR)
+        where, params = self._where(filters)
+        sql = (f"SELECT {column}, COUNT(*) AS n FROM incidents{where} "
+               f"GROUP BY {column} ORDER BY n DESC")
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        rows = [(value, n) for value, n in self._conn().execute(sql, params) if value is not None]
+        return pd.Series([n for _, n in rows], index=[value for value, _ in rows], name="count")
+    
+    def distinct(self, column):
+        """Sütunun farklı değerleri (ilk görülme sırasıyla)"""
+        _check_columns([column], INDEKSLI_SUTUNLAR)
+        sql = f"SELECT {column} FROM incidents WHERE {column} IS NOT NULL GROUP BY {column} ORDER BY MIN(id)"
+        return [value for (value,) in self._conn().execute(sql)]
+    
+    def max_id(self):
+        """Son eklenen satırın id'si (boş tabloda 0)"""
+        return self._conn().execute("SELECT COALESCE(MAX(id), 0) FROM incidents").fetchone()[0]
+    
+    def query(self, filters=None, columns=None, limit=None, since=None, until=None, after_id=None):
+        """Filtreye uyan satırları ekleme sırasıyla DataFrame olarak döndür"""
+        columns = list(columns or SUTUNLAR)
+        _check_columns(columns, SUTUNLAR + ["kayit_zamani"])
+        where, params = self._where(filters, since, until)
+        if after_id is not None:
+            where += " AND id > ?" if where else " WHERE id > ?"
+            params.append(after_id)
+        sql = f"SELECT {', '.join(columns)} FROM incidents{where} ORDER BY id"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return pd.read_sql_query(sql, self._conn(), params=params)
+    
+    def iter_query(self, filters=None, columns=None, chunksize=100000):
+        """query() ile aynı sonuç, chunksize satırlık DataFrame parçaları halinde"""
+        columns = list(columns or SUTUNLAR)
+        _check_columns(columns, SUTUNLAR + ["kayit_zamani"])
+        where, params = self._where(filters)
+        sql = f"SELECT {', '.join(columns)} FROM incidents{where} ORDER BY id"
+        yield from pd.read_sql_query(sql, self._conn(), params=params, chunksize=chunksize)
+
+
+class DataFrameIncidentStore:
+    """CSV'den yüklenmiş DataFrame üzerinde SQLiteIncidentStore ile aynı sorgu arayüzü"""
+    
+    def __init__(self, df):
+        self.df = df
+    
+    def _mask(self, filters):
+        mask = pd.Series(True, index=self.df.index)
+        for column, value in (filters or {}).items():
+            _check_columns([column], INDEKSLI_SUTUNLAR)
+            if column not in self.df.columns:
+                return pd.Series(False, index=self.df.index)
+            mask &= self.df[column].isin(_as_list(value))
+        return mask
+    
+    def count(self, filters=None, since=None, until=None):
+        if not filters:
+            return len(self.df)
+        return int(self._mask(filters).sum())
+    
+    def value_counts(self, column, filters=None, limit=None):
+        values = self.df[column] if not filters else self.df.loc[self._mask(filters), column]
+        counts = values.value_counts()
+        # Kategorik sütunlarda filtre dışında kalan değerler 0 sayıyla gelir
+        counts = counts[counts > 0]
+        return counts.head(limit) if limit else counts
+    
+    def distinct(self, column):
+        return self.df[column].dropna().unique().tolist()
+    
+    def query(self, filters=None, columns=None, limit=None, since=None, until=None):
+        df = self.df if not filters else self.df[self._mask(filters)]
+        if columns:
+            df = df[[column for column in columns if column in df.columns]]
+        return df.head(limit) if limit else df
@@ -0,0 +1,155 @@
+"""
+AKOM Çıkarım Arka Uçları
+GPU olmayan sunucular için int8 quantize PyTorch ve ONNX Runtime seçenekleri
+"""
+
+import inspect
+import os
+
+import numpy as np
+import torch
+
+# Desteklenen arka uçlar
+BACKENDS = ["pytorch", "int8", "onnx"]
+
+# Aday arka ucun fp32 modelle en düşük kabul edilen CLS kosinüs benzerliği
+PARITY_ESIGI = 0.99
+
+
+class _EncoderOutput:
+    """Hugging Face çıktısı gibi last_hidden_state alanı taşıyan basit sonuç"""
+    
+    def __init__(self, last_hidden_state):
+        self.last_hidden_state = last_hidden_state
+
+
+class _LastHiddenState(torch.nn.Module):
+    """ONNX dışa aktarımı için yalnızca last_hidden_state döndüren sarmalayıcı"""
+    
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+    
+    def forward(self, input_ids, attention_mask, token_type_ids):
+        return self.model(input_ids=input_ids, attention_mask=attention_mask,
+                          token_type_ids=token_type_ids).last_hidden_state
+
+
+class OnnxEncoder:
+    """ONNX Runtime oturumunu PyTorch modeli gibi çağrılabilir hale getirir"""
+    
+    def __init__(self, onnx_path, num_threads=None):
+        import onnxruntime as ort
+        
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(onnx_path, sess_options=options,
+                                            providers=["CPUExecutionProvider"])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+    
+    def eval(self):
+        return self
+    
+    def __call__(self, **inputs):
+        feed = {}
+        for name in self.input_names:
+            if name in inputs:
+                feed[name] = inputs[name].numpy().astype(np.int64)
+            else:
+                # token_type_ids verilmediyse tek cümle varsayılır
+                feed[name] = np.zeros_like(inputs["input_ids"].numpy(), dtype=np.int64)
+        last_hidden_state = self.session.run(["last_hidden_state"], feed)[0]
+        return _EncoderOutput(torch.from_numpy(last_hidden_state))
+
+
+def quantize_int8(model):
+    """Linear katmanlarını dinamik int8 quantization ile dönüştür"""
+    # torch.ao.quantization PyTorch'ta kullanımdan kaldırılıyor (yerini torchao alıyor);
+    # kaldırıldığı sürümlerde buradaki hata load_encoder çağıranında fp32'ye düşürülür
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def export_onnx(model, tokenizer, onnx_path):
+    """fp32 modeli dinamik batch/sekans eksenleriyle ONNX'e aktar"""
+    os.makedirs(os.path.dirname(onnx_path), exist_ok=True)
+    sample = tokenizer(["Kadıköy'de sel baskını var."], return_tensors="pt")
+    token_type_ids = sample.get("token_type_ids", torch.zeros_like(sample["input_ids"]))
+    dynamic_axes = {name: {0: "batch", 1: "sequence"}
+                    for name in ("input_ids", "attention_mask", "token_type_ids", "last_hidden_state")}
+    # Yeni sürümlerde varsayılan dynamo dışa aktarıcısıdır; TorchScript aktarıcısı
+    # dynamic_axes ile çalışır. Eski sürümlerde bu argüman yoktur.
+    options = {"dynamo": False} if "dynamo" in inspect.signature(torch.onnx.export).parameters else {}
+    
+    # Sarmalayıcı eval modunda olmalı: export modülün eğitim modunu dışa aktarımdan
+    # sonra geri yükler, train modunda kalan model dropout'la rastgele embedding üretir
+    torch.onnx.export(
+        _LastHiddenState(model).eval(),
+        (sample["input_ids"], sample["attention_mask"], token_type_ids),
+        onnx_path,
+        input_names=["input_ids", "attention_mask", "token_type_ids"],
+        output_names=["last_hidden_state"],
+        dynamic_axes=dynamic_axes,
+        opset_version=17,
+        **options,
+    )
+    model.eval()
+    return onnx_path
+
+
+def load_encoder(model, tokenizer, backend="pytorch", onnx_path=None, parity_texts=None,
+                 min_cosine=PARITY_ESIGI):
+    """
+    İstenen arka uca göre kodlayıcıyı hazırla
+    
+    parity_texts verilirse int8/ONNX kodlayıcının embedding'leri fp32 modelle
+    karşılaştırılır; en düşük kosinüs benzerliği min_cosine altındaysa
+    ValueError verilir (çağıran fp32 modele döner).
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Bilinmeyen arka uç: {backend} (seçenekler: {', '.join(BACKENDS)})")
+    
+    if backend == "pytorch":
+        return model
+    
+    if backend == "int8":
+        encoder = quantize_int8(model).eval()
+    else:
+        if not os.path.exists(onnx_path):
+            print(f"ONNX modeli dışa aktarılıyor: {onnx_path}")
+            export_onnx(model, tokenizer, onnx_path)
+        encoder = OnnxEncoder(onnx_path, num_threads=torch.get_num_threads())
+    
+    if parity_texts:
+        parity = embedding_parity(model, encoder, tokenizer, parity_texts)
+        print(f"'{backend}' embedding uyumu: en düşük kosinüs {parity['min_cosine']:.4f}, "
+              f"en büyük fark {parity['max_abs_diff']:.2e}")
+        if parity["min_cosine"] < min_cosine:
+            raise ValueError(f"embedding uyumu yetersiz (kosinüs {parity['min_cosine']:.4f} < {min_cosine})")
+    return encoder
+
+
+def cls_embeddings(encoder, tokenizer, texts):
+    """Kodlayıcı ile CLS embedding matrisini hesapla"""
+    inputs = tokenizer(list(texts), return_tensors="pt", max_length=512,
+                       truncation=True, padding=True)
+    with torch.no_grad():
+        return encoder(**inputs).last_hidden_state[:, 0, :].numpy()
+
+
+def embedding_parity(reference, candidate, tokenizer, texts):
+    """
+    Aday arka ucun embedding'lerini fp32 referans modelle karşılaştır
+    
+    Returns:
+        dict: minimum/ortalama kosinüs benzerliği ve maksimum mutlak fark
+    """
+    ref = cls_embeddings(reference, tokenizer, texts)
+    cand = cls_embeddings(candidate, tokenizer, texts)
+    
+    cos = np.sum(ref * cand, axis=1) / (np.linalg.norm(ref, axis=1) * np.linalg.norm(cand, axis=1))
+    return {
+        "min_cosine": float(cos.min()),
+        "mean_cosine": float(cos.mean()),
+        "max_abs_diff": float(np.abs(ref - cand).max()),
+    }
@@ -0,0 +1,99 @@
+"""
+AKOM Anahtar Kelime İndeksi
+Aho-Corasick otomatı ile tüm sözlüklerde tek geçişte arama
+"""
+
+from collections import deque
+
+
+class _Automaton:
+    """Tek bir desen kümesi için Aho-Corasick otomatı"""
+
+    def __init__(self, patterns):
+        # patterns: {desen: [etiketler]}
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [()]
+
+        for pattern, etiketler in patterns.items():
+            state = 0
+            for ch in pattern:
+                next_state = self.goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][ch] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(())
+                state = next_state
+            self.output[state] = self.output[state] + tuple(etiketler)
+
+        # Başarısızlık bağlantıları (BFS) - çıktılar sonek durumlarıyla birleştirilir
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(ch, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def search(self, text, found):
+        """Metni tek geçişte tara, eşleşen etiketleri found kümesine ekle"""
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+
+class KeywordIndex:
+    """
+    Birden çok sözlükteki anahtar kelimeleri tek seferde derleyen indeks
+
+    Her desen bir etiketle eklenir; search() metinde geçen tüm desenlerin
+    etiketlerini döndürür. Büyük/küçük harfe duyarsız desenler metnin
+    lower() haliyle, duyarlı desenler metnin kendisiyle eşleştirilir.
+    """
+
+    def __init__(self):
+        self._patterns = {False: {}, True: {}}
+        self._automata = None
+
+    def add(self, keyword, etiket, case_sensitive=False):
+        """Desen ekle (build() öncesinde çağrılmalı)"""
+        if not keyword:
+            return
+        if not case_sensitive:
+            keyword = keyword.lower()
+        self._patterns[case_sensitive].setdefault(keyword, []).append(etiket)
+        self._automata = None
+
+    def build(self):
+        """Otomatları derle"""
+        self._automata = {
+            case_sensitive: _Automaton(patterns)
+            for case_sensitive, patterns in self._patterns.items()
+            if patterns
+        }
+        return self
+
+    def search(self, text):
+        """Metinde geçen tüm desenlerin etiketlerini küme olarak döndür"""
+        if self._automata is None:
+            self.build()
+
+        found = set()
+        if False in self._automata:
+            self._automata[False].search(text.lower(), found)
+        if True in self._automata:
+            self._automata[True].search(text, found)
+        return found
@@ -0,0 +1,278 @@
+"""
+AKOM kNN İndeksi
+Geçmiş ihbarların embedding matrisi üzerinde kosinüs benzerliği ile sınıflandırma
+"""
+
+import json
+import os
+
+import numpy as np
+
+try:
+    from src.file_lock import FileLock
+except ImportError:
+    from file_lock import FileLock
+
+# Disk düzeni:
+#   meta.json    - {"dim": ..., "revision": ...}
+#   vectors.f32  - veri setindeki satır sırasıyla birim uzunluklu float32 vektörler
+#   labels.tsv   - her satırda "olay_turu<TAB>oncelik"
+KNN_INDEX_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             "data", "knn_index")
+META_DOSYASI = "meta.json"
+VEKTOR_DOSYASI = "vectors.f32"
+ETIKET_DOSYASI = "labels.tsv"
+
+
+def _index_lock(index_dir):
+    """İndeks dosyalarına yazan tüm süreç ve iş parçacıkları için ortak kilit"""
+    return FileLock(os.path.normpath(index_dir))
+
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    vectors = vectors.reshape(-1, vectors.shape[-1])
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _read_meta(index_dir):
+    meta_path = os.path.join(index_dir, META_DOSYASI)
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _vector_rows(index_dir, dim):
+    vector_path = os.path.join(index_dir, VEKTOR_DOSYASI)
+    if not os.path.exists(vector_path):
+        return 0
+    return os.path.getsize(vector_path) // (4 * dim)
+
+
+def _append_rows(index_dir, vectors, labels):
+    """Normalize vektörleri ve etiketleri dosyaların sonuna ekle"""
+    with open(os.path.join(index_dir, VEKTOR_DOSYASI), "ab") as f:
+        f.write(_normalize(vectors).tobytes())
+    with open(os.path.join(index_dir, ETIKET_DOSYASI), "a", encoding="utf-8") as f:
+        f.write("".join(f"{olay}\t{oncelik}\n" for olay, oncelik in labels))
+
+
+def append_embedding(index_dir, row_number, embedding, olay_turu, oncelik, revision):
+    """
+    save_analysis'in eklediği satırın embedding'ini indekse ekle
+    
+    İndeks veri setiyle satır satır hizalı tutulur; satır numarası indeksin
+    sonraki satırı değilse (ör. model hazır değilken kaydedilmiş satırlar
+    varsa) ekleme yapılmaz, eksikler bir sonraki sync() ile tamamlanır.
+    Embedding'i üreten model sürümü (revision) indeksinkinden farklıysa da
+    ekleme yapılmaz; farklı modellerin vektörleri karşılaştırılamaz.
+    """
+    if embedding is None:
+        return False
+    
+    with _index_lock(index_dir):
+        meta = _read_meta(index_dir)
+        if meta is None:
+            return False
+        if meta.get("revision") != revision:
+            print(f"kNN indeksi {meta.get('revision')} sürümüne ait, {revision} embedding'i eklenmedi.")
+            return False
+        
+        vector = np.asarray(embedding, dtype=np.float32).reshape(1, -1)
+        if vector.shape[-1] != meta["dim"] or _vector_rows(index_dir, meta["dim"]) != row_number:
+            return False
+        
+        _append_rows(index_dir, vector, [(olay_turu, oncelik)])
+        return True
+
+
+class KNNIndex:
+    """Memory-mapped embedding matrisi üzerinde top-k kosinüs araması"""
+    
+    def __init__(self, index_dir, revision, read_only=False):
+        """
+        Args:
+            index_dir: İndeks dizini
+            revision: Embedding'leri üreten model sürümü
+            read_only: İndeks yalnızca sorgulanır; sürüm uyuşmazsa silinmez, ValueError verilir
+        """
+        self.index_dir = index_dir
+        self.revision = revision
+        self.read_only = read_only
+        self.dim = None
+        
+        self._vectors = None
+        self._olaylar = []
+        self._oncelikler = []
+        self._label_offset = 0
+        
+        os.makedirs(index_dir, exist_ok=True)
+        with _index_lock(index_dir):
+            meta = _read_meta(index_dir)
+            if meta is not None and meta.get("revision") != revision:
+                # Farklı model/arka uçla üretilmiş vektörler karşılaştırılamaz
+                if read_only:
+                    raise ValueError(f"kNN indeksi {meta.get('revision')} sürümüne ait, {revision} ile sorgulanamaz.")
+                print("kNN indeksi farklı bir model sürümüne ait, yeniden oluşturulacak.")
+                self._reset()
+            elif meta is not None:
+                self.dim = meta["dim"]
+    
+    def _reset(self):
+        self._vectors = None
+        self._olaylar = []
+        self._oncelikler = []
+        self._label_offset = 0
+        self.dim = None
+        for name in (META_DOSYASI, VEKTOR_DOSYASI, ETIKET_DOSYASI):
+            path = os.path.join(self.index_dir, name)
+            if os.path.exists(path):
+                os.remove(path)
+    
+    def _refresh(self):
+        """Başka yerden (save_analysis) eklenen satırları yükle"""
+        if self.dim is None:
+            return
+        
+        label_path = os.path.join(self.index_dir, ETIKET_DOSYASI)
+        if os.path.exists(label_path) and os.path.getsize(label_path) > self._label_offset:
+            with open(label_path, "rb") as f:
+                f.seek(self._label_offset)
+                chunk = f.read()
+            # Yalnızca tamamlanmış satırlar okunur
+            complete = chunk[:chunk.rfind(b"\n") + 1]
+            for line in complete.decode("utf-8").splitlines():
+                olay, oncelik = line.split("\t")
+                self._olaylar.append(olay)
+                self._oncelikler.append(oncelik)
+            self._label_offset += len(complete)
+        
+        rows = min(_vector_rows(self.index_dir, self.dim), len(self._olaylar))
+        if rows and (self._vectors is None or len(self._vectors) != rows):
+            self._vectors = np.memmap(os.path.join(self.index_dir, VEKTOR_DOSYASI),
+                                      dtype=np.float32, mode="r", shape=(rows, self.dim))
+    
+    def __len__(self):
+        self._refresh()
+        return 0 if self._vectors is None else len(self._vectors)
+    
+    def _stored_rows(self):
+        """
+        Diskteki satır sayısı (kilit altında çağrılır)
+        
+        Returns:
+            int veya None: İndeks başka süreçte farklı model sürümüyle yeniden oluşturulmuşsa None
+        """
+        meta = _read_meta(self.index_dir)
+        if meta is None:
+            return 0
+        if meta.get("revision") != self.revision:
+            return None
+        self.dim = meta["dim"]
+        return _vector_rows(self.index_dir, self.dim)
+    
+    def sync(self, texts, labels, embed_fn, batch_size=64):
+        """
+        İndeksi veri setiyle eşitle - yalnızca indekste olmayan satırlar hesaplanır
+        
+        Her batch'ten önce indeksin o anki boyu kilit altında okunur; aynı anda
+        eşitleyen süreçler (arayüz ve CLI) birbirinin eklediği satırları yeniden
+        hesaplamaz. Yarışta en fazla bir batch boşa hesaplanır.
+        
+        Args:
+            texts: Veri setindeki tüm ihbar metinleri (satır sırasıyla)
+            labels: (olay_turu, oncelik) çiftleri
+            embed_fn: Metin listesi alıp embedding listesi döndüren fonksiyon
+        """
+        if self.read_only:
+            raise ValueError("Salt okunur kNN indeksi eşitlenemez.")
+        
+        with _index_lock(self.index_dir):
+            if (self._stored_rows() or 0) > len(texts):
+                # Veri seti küçülmüş; hizalama bozuldu
+                self._reset()
+        
+        position = 0
+        while position < len(texts):
+            with _index_lock(self.index_dir):
+                stored = self._stored_rows()
+            if stored is None:
+                print("kNN indeksi başka bir süreçte farklı model sürümüyle yeniden oluşturulmuş.")
+                break
+            position = max(position, stored)
+            if position >= len(texts):
+                break
+            
+            batch_texts = texts[position:position + batch_size]
+            embeddings = embed_fn(batch_texts)
+            if any(embedding is None for embedding in embeddings):
+                break
+            vectors = np.concatenate(embeddings)
+            batch_labels = labels[position:position + batch_size]
+            
+            with _index_lock(self.index_dir):
+                stored = self._stored_rows()
+                if stored is None:
+                    continue
+                if _read_meta(self.index_dir) is None:
+                    self.dim = vectors.shape[-1]
+                    with open(os.path.join(self.index_dir, META_DOSYASI), "w", encoding="utf-8") as f:
+                        json.dump({"dim": self.dim, "revision": self.revision}, f)
+                # Hesaplama sırasında başka bir süreç aynı satırları eklemiş olabilir; yalnızca eksikler yazılır
+                skip = stored - position
+                if skip < 0:
+                    break
+                if skip < len(vectors):
+                    _append_rows(self.index_dir, vectors[skip:], batch_labels[skip:])
+            position += len(batch_texts)
+        
+        self._refresh()
+        return len(self)
+    
+    def query(self, embedding, k=10, exclude=None):
+        """
+        En benzer k komşunun ağırlıklı oylamasıyla olay türü ve öncelik tahmin et
+        
+        Args:
+            exclude: Oylamaya katılmayacak indeks satırı (ör. indekste zaten
+                     bulunan bir satır yeniden sınıflandırılırken kendisi)
+        
+        Returns:
+            dict veya None (indeks boşsa)
+        """
+        self._refresh()
+        if self._vectors is None or embedding is None:
+            return None
+        
+        q = _normalize(np.asarray(embedding, dtype=np.float32).reshape(1, -1))[0]
+        sims = self._vectors @ q
+        
+        candidates = len(sims)
+        if exclude is not None and 0 <= exclude < len(sims):
+            sims[exclude] = -np.inf
+            candidates -= 1
+        k = min(k, candidates)
+        if k <= 0:
+            return None
+        top = np.argpartition(-sims, k - 1)[:k]
+        top = top[np.argsort(-sims[top])]
+        
+        olay_oylari = {}
+        oncelik_oylari = {}
+        for i in top:
+            weight = float(max(sims[i], 0.0))
+            olay_oylari[self._olaylar[i]] = olay_oylari.get(self._olaylar[i], 0.0) + weight
+            oncelik_oylari[self._oncelikler[i]] = oncelik_oylari.get(self._oncelikler[i], 0.0) + weight
+        
+        toplam = sum(olay_oylari.values()) or 1.0
+        olay_turu = max(olay_oylari, key=olay_oylari.get)
+        oncelik = max(oncelik_oylari, key=oncelik_oylari.get)
+        return {
+            "olay_turu": olay_turu,
+            "oncelik": oncelik,
+            "guven": olay_oylari[olay_turu] / toplam,
+            "komsular": [(int(i), float(sims[i])) for i in top],
+        }
@@ -0,0 +1,40 @@
+"""
+AKOM Veri Seti Şema Göçü
+Mevcut CSV veri setine kayit_zamani sütununu bir kez ekler
+
+Kullanım:
+    python src/migrate_dataset.py
+    python src/migrate_dataset.py --dataset data/akom_dataset.csv
+
+Göçten önce eklenmiş satırların kayıt zamanı bilinmez; bu satırlar
+İstatistikler sayfasındaki saatlik grafikte yer almaz. Göç uygulama
+kapalıyken çalıştırılmalıdır: dosya kilidi süresince ekleme yapılamaz ve
+göçten sonra önbellekler veri setini bir kez baştan okur.
+"""
+
+import argparse
+import os
+import time
+
+try:
+    from src.dataset_writer import add_column
+except ImportError:
+    from dataset_writer import add_column
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AKOM veri setine kayit_zamani sütununu ekle")
+    parser.add_argument("--dataset", default=os.path.join(DATA_DIR, "akom_dataset.csv"))
+    args = parser.parse_args(argv)
+    
+    start = time.perf_counter()
+    if add_column(args.dataset, "kayit_zamani"):
+        print(f"kayit_zamani sütunu eklendi: {args.dataset} ({time.perf_counter() - start:.1f} sn)")
+    else:
+        print(f"{args.dataset} zaten kayit_zamani sütununu içeriyor.")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,45 @@ import re
 from sklearn.preprocessing import LabelEncoder
 import pandas as pd
 import os
+import threading
+import time
+
+try:
+    from src.keyword_index import KeywordIndex
+    from src.embedding_cache import EmbeddingCache
+    from src.inference_backend import load_encoder, embedding_parity
+    from src.knn_index import KNNIndex, KNN_INDEX_DIR
+    from src.utils import load_dataset, get_report_texts
+    from src.gazetteer import Gazetteer
+    from src.stage_timer import StageTimer
+    from src.data_generator import ILCELER, CADDELER, SOKAKLAR
+except ImportError:
+    from keyword_index import KeywordIndex
+    from embedding_cache import EmbeddingCache
+    from inference_backend import load_encoder, embedding_parity
+    from knn_index import KNNIndex, KNN_INDEX_DIR
+    from utils import load_dataset, get_report_texts
+    from gazetteer import Gazetteer
+    from stage_timer import StageTimer
+    from data_generator import ILCELER, CADDELER, SOKAKLAR
+
+BERT_MODEL_ADI = "dbmdz/bert-base-turkish-cased"
+
+# Embedding önbelleğinin disk dizini
+EMBEDDING_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                   "data", "embedding_cache")
+
+# Dışa aktarılan ONNX grafiğinin yolu
+ONNX_MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               "data", "onnx", "bert-base-turkish-cased.onnx")
+
+# Arka uç doğrulaması için örnek ihbarlar
+PARITY_ORNEKLERI = [
+    "Avcılar Cihangir Mahallesi Cumhuriyet Caddesi yakınlarında şiddetli deprem hissedildi, binalarda hasar var.",
+    "Kadıköy Fenerbahçe Mahallesi'nde yoğun yağış nedeniyle sel baskını yaşanıyor.",
+    "Beşiktaş Levent'te gaz kaçağı var, koku çok yoğun. Patlama riski mevcut.",
+    "Esenyurt'ta zincirleme trafik kazası meydana geldi.",
+]
 
 # Olay türleri, öncelikler ve birimler
 OLAY_TURLERI = ["Deprem", "Sel Baskını", "Orman Yangını", "Kar Fırtınası", 
@@ -77,35 +116,212 @@ ONCELIK_ANAHTAR_KELIMELER = {
 }
 
 
+# OSB ve önemli bölge eşleştirmeleri (bölge adı -> ilçe)
+ONEMLI_BOLGELER = {
+    "Tuzla OSB": "Tuzla",
+    "Tuzla Organize Sanayi": "Tuzla",
+    "Dudullu OSB": "Ümraniye",
+    "Dudullu Organize Sanayi": "Ümraniye",
+    "İkitelli OSB": "Başakşehir",
+    "İkitelli Organize Sanayi": "Başakşehir",
+    "Beylikdüzü OSB": "Beylikdüzü",
+    "Beylikdüzü Organize Sanayi": "Beylikdüzü",
+    "Esenyurt OSB": "Esenyurt",
+    "Anadolu Yakası OSB": "Tuzla",
+    "Avrupa Yakası OSB": "Başakşehir",
+    "Organize Sanayi Bölgesi": None,  # Genel OSB (ilçe belirsiz)
+    "Sanayi Bölgesi": None,
+    "İstanbul Havalimanı": "Arnavutköy",
+    "Sabiha Gökçen": "Pendik",
+    "Atatürk Havalimanı": "Bakırköy",
+    "Kadıköy İskelesi": "Kadıköy",
+    "Eminönü İskelesi": "Fatih",
+    "Haydarpaşa Limanı": "Kadıköy",
+    "Ambarlı Limanı": "Avcılar",
+}
+ONEMLI_BOLGELER_LISTESI = list(ONEMLI_BOLGELER.items())
+
+# İstanbul ilçeleri (arama sırası önemlidir - ilk eşleşen seçilir)
+ILCE_LISTESI = [
+    "Avcılar", "Kadıköy", "Beşiktaş", "Beyoğlu", "Fatih", "Şişli",
+    "Üsküdar", "Bakırköy", "Sarıyer", "Maltepe", "Kartal", "Pendik",
+    "Bağcılar", "Bahçelievler", "Esenyurt", "Beylikdüzü", "Büyükçekmece",
+    "Silivri", "Çatalca", "Arnavutköy", "Başakşehir", "Esenler",
+    "Gaziosmanpaşa", "Eyüpsultan", "Kağıthane", "Sultangazi", "Ataşehir",
+    "Ümraniye", "Sancaktepe", "Sultanbeyli", "Çekmeköy", "Beykoz",
+    "Şile", "Adalar", "Tuzla"
+]
+
+
+def build_keyword_index():
+    """Olay, öncelik, bölge ve ilçe sözlüklerinden tek bir anahtar kelime indeksi derle"""
+    index = KeywordIndex()
+    for olay, keywords in OLAY_ANAHTAR_KELIMELER.items():
+        for i, kw in enumerate(keywords):
+            index.add(kw, ("olay", olay, i))
+    for oncelik, keywords in ONCELIK_ANAHTAR_KELIMELER.items():
+        for i, kw in enumerate(keywords):
+            index.add(kw, ("oncelik", oncelik, i))
+    for i, (bolge, _) in enumerate(ONEMLI_BOLGELER_LISTESI):
+        index.add(bolge, ("bolge", i))
+    # İlçe adları büyük/küçük harfe duyarlı aranır
+    for i, ilce in enumerate(ILCE_LISTESI):
+        index.add(ilce, ("ilce", i), case_sensitive=True)
+    return index.build()
+
+
 class AKOMClassifier:
     """AKOM İhbar Sınıflandırıcı"""
     
-    def __init__(self, use_bert=True):
+    def __init__(self, use_bert=True, use_embedding_cache=True, backend="pytorch", async_load=False,
+                 mode="rules", knn_k=10, profile=False, knn_index_dir=KNN_INDEX_DIR, knn_sync=True):
+        """
+        Args:
+            use_bert: BERT embedding'lerini hesapla
+            use_embedding_cache: Embedding'leri bellek/disk önbelleğinde tut
+            backend: "pytorch" (fp32), "int8" (dinamik quantization) veya "onnx" (ONNX Runtime)
+            async_load: Modeli arka planda yükle; hazır olana kadar kural tabanlı sonuç döner
+            mode: "rules" (anahtar kelime) veya "knn" (geçmiş ihbarlarda en yakın komşu)
+            knn_k: kNN modunda oylamaya katılan komşu sayısı
+            profile: analyze() aşama sürelerini histogramlarda topla
+            knn_index_dir: kNN indeks dizini
+            knn_sync: Model yüklenince indeksi veri setiyle eşitle; False ise mevcut
+                      indeks salt okunur açılır (ör. indeksi eşitlemiş bir süreç
+                      tarafından başlatılan işçiler)
+        """
         self.use_bert = use_bert
+        self.use_embedding_cache = use_embedding_cache
+        self.backend = backend
+        self.mode = mode
+        self.knn_k = knn_k
+        self.knn_index_dir = knn_index_dir
+        self.knn_sync = knn_sync
         self.tokenizer = None
         self.model = None
+        self.model_revision = None
+        self.embedding_cache = None
+        self.knn_index = None
+        self._keyword_index = build_keyword_index()
+        self._gazetteer = Gazetteer(ILCELER, CADDELER, SOKAKLAR)
+        self.stage_timer = StageTimer(enabled=profile)
+        
+        # Model durumu: disabled, loading, ready, failed
+        self.model_status = "disabled"
+        self.model_load_seconds = None
+        self.model_error = None
+        self._model_ready = threading.Event()
+        self._load_thread = None
         
         if use_bert:
-            self._load_bert_model()
+            self.model_status = "loading"
+            if async_load:
+                self._load_thread = threading.Thread(target=self._load_bert_model,
+                                                     name="akom-bert-yukleme", daemon=True)
+                self._load_thread.start()
+            else:
+                self._load_bert_model()
     
     def _load_bert_model(self):
-        """Turkish BERT modelini yükle"""
+        """Turkish BERT modelini yükle ve ısınma çalıştırması yap"""
+        start = time.perf_counter()
         try:
             print("Turkish BERT modeli yükleniyor...")
-            self.tokenizer = AutoTokenizer.from_pretrained("dbmdz/bert-base-turkish-cased")
-            self.model = AutoModel.from_pretrained("dbmdz/bert-base-turkish-cased")
-            self.model.eval()
-            print("Model başarıyla yüklendi!")
+            self.tokenizer = AutoTokenizer.from_pretrained(BERT_MODEL_ADI)
+            model = AutoModel.from_pretrained(BERT_MODEL_ADI)
+            model.eval()
+            commit = getattr(model.config, "_commit_hash", None) or "main"
+            
+            try:
+                self.model = load_encoder(model, self.tokenizer, self.backend, ONNX_MODEL_PATH,
+                                          parity_texts=PARITY_ORNEKLERI)
+            except Exception as e:
+                print(f"'{self.backend}' arka ucu hazırlanamadı: {e}")
+                print("fp32 PyTorch modeli kullanılacak.")
+                self.backend = "pytorch"
+                self.model = model
+            print(f"Model başarıyla yüklendi! (arka uç: {self.backend})")
+            
+            # Model sürümü ve arka uç; değişince önbellek ve kNN kayıtları kullanılmaz
+            self.model_revision = f"{BERT_MODEL_ADI}@{commit}/{self.backend}"
+            if self.use_embedding_cache:
+                self.embedding_cache = EmbeddingCache(EMBEDDING_CACHE_DIR, revision=self.model_revision)
+            
+            # Isınma: ilk gerçek isteğin tembel başlatma maliyetini ödememesi için
+            self._encode_batches([PARITY_ORNEKLERI[0]], batch_size=1)
+            
+            self.model_load_seconds = time.perf_counter() - start
+            self.model_status = "ready"
+            self._model_ready.set()
         except Exception as e:
             print(f"BERT modeli yüklenemedi: {e}")
             print("Kural tabanlı sınıflandırma kullanılacak.")
+            self.model_load_seconds = time.perf_counter() - start
+            self.model_error = str(e)
+            self.model_status = "failed"
             self.use_bert = False
+            return
+        
+        if self.mode == "knn":
+            try:
+                if self.knn_sync:
+                    self.sync_knn_index()
+                else:
+                    self.knn_index = KNNIndex(self.knn_index_dir, self.model_revision, read_only=True)
+            except Exception as e:
+                print(f"kNN indeksi hazırlanamadı: {e}")
+                print("Kural tabanlı sınıflandırma kullanılacak.")
+    
+    def sync_knn_index(self, df=None):
+        """
+        Veri setindeki satırlar için kNN embedding matrisini oluştur/güncelle
+        
+        Yalnızca indekste henüz olmayan satırların embedding'i hesaplanır.
+        """
+        if not self.is_model_ready():
+            return 0
+        
+        if df is None:
+            df = load_dataset()
+        
+        index = self.knn_index or KNNIndex(self.knn_index_dir, self.model_revision)
+        if df is not None and len(df):
+            texts = get_report_texts(df)
+            labels = list(zip(df["olay_turu"].astype(str), df["oncelik"].astype(str)))
+            print(f"kNN indeksi güncelleniyor ({len(index)}/{len(texts)} satır hazır)...")
+            index.sync(texts, labels, self.get_text_embeddings)
+        
+        self.knn_index = index
+        return len(index)
+    
+    def is_model_ready(self):
+        """BERT modeli yüklenip ısındı mı?"""
+        return self._model_ready.is_set()
+    
+    def wait_until_ready(self, timeout=None):
+        """Arka plan yüklemesinin bitmesini bekle; model hazırsa True döndürür"""
+        if self._load_thread is not None:
+            self._load_thread.join(timeout)
+        return self.is_model_ready()
+    
+    def get_model_status(self):
+        """Model yükleme durumunu ve süresini döndür"""
+        return {
+            "status": self.model_status,
+            "backend": self.backend,
+            "load_seconds": self.model_load_seconds,
+            "error": self.model_error,
+        }
     
     def get_text_embedding(self, text):
         """Metin için BERT embedding al"""
-        if not self.use_bert or self.model is None:
+        if not self.use_bert or not self.is_model_ready():
             return None
         
+        if self.embedding_cache is not None:
+            cached = self.embedding_cache.get(text)
+            if cached is not None:
+                return cached
+        
         inputs = self.tokenizer(text, return_tensors="pt", 
                                max_length=512, truncation=True, padding=True)
         
@@ -114,35 +330,120 @@ class AKOMClassifier:
             # CLS token embedding'i kullan
             embedding = outputs.last_hidden_state[:, 0, :].numpy()
         
+        if self.embedding_cache is not None:
+            self.embedding_cache.put(text, embedding)
+        
         return embedding
     
-    def classify_event_type(self, text):
+    def get_text_embeddings(self, texts, batch_size=32):
+        """Metin listesi için BERT embedding'lerini toplu (batch) hesapla"""
+        texts = list(texts)
+        if not self.use_bert or not self.is_model_ready():
+            return [None] * len(texts)
+        
+        embeddings = [None] * len(texts)
+        if self.embedding_cache is not None:
+            for i, text in enumerate(texts):
+                embeddings[i] = self.embedding_cache.get(text)
+        
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if not missing:
+            return embeddings
+        
+        computed = self._encode_batches([texts[i] for i in missing], batch_size)
+        for i, embedding in zip(missing, computed):
+            embeddings[i] = embedding
+            if self.embedding_cache is not None:
+                self.embedding_cache.put(texts[i], embedding)
+        
+        return embeddings
+    
+    def _encode_batches(self, texts, batch_size):
+        """Metinleri uzunluğa göre gruplayıp batch halinde modelden geçir"""
+        # Tüm metinler tek çağrıda tokenize edilir, padding batch içinde yapılır
+        encoded = self.tokenizer(texts, max_length=512, truncation=True)
+        
+        # Benzer uzunluktaki metinleri aynı batch'e koyarak padding'i azalt
+        order = sorted(range(len(texts)), key=lambda i: len(encoded["input_ids"][i]))
+        
+        embeddings = [None] * len(texts)
+        for start in range(0, len(order), batch_size):
+            batch_idx = order[start:start + batch_size]
+            features = [{key: encoded[key][i] for key in encoded.keys()} for i in batch_idx]
+            inputs = self.tokenizer.pad(features, padding=True, return_tensors="pt")
+            
+            with torch.no_grad():
+                outputs = self.model(**inputs)
+                # CLS token embedding'i kullan
+                batch_embeddings = outputs.last_hidden_state[:, 0, :].numpy()
+            
+            for row, i in enumerate(batch_idx):
+                embeddings[i] = batch_embeddings[row:row + 1]
+        
+        return embeddings
+    
+    def check_backend_parity(self, texts=None):
+        """Seçili arka ucun embedding'lerini fp32 PyTorch modeliyle karşılaştır"""
+        if not self.use_bert or not self.is_model_ready():
+            return None
+        
+        reference = AutoModel.from_pretrained(BERT_MODEL_ADI)
+        reference.eval()
+        parity = embedding_parity(reference, self.model, self.tokenizer, texts or PARITY_ORNEKLERI)
+        parity["backend"] = self.backend
+        return parity
+    
+    def embedding_cache_stats(self):
+        """Embedding önbelleği isabet/ıska istatistiklerini döndür"""
+        if self.embedding_cache is None:
+            return None
+        return self.embedding_cache.stats()
+    
+    def set_profiling(self, enabled):
+        """Aşama süresi ölçümünü aç/kapat"""
+        self.stage_timer.enabled = enabled
+    
+    def get_stage_timings(self):
+        """Aşama bazında süre histogramları (adet, ortalama, p50/p95/p99 ms)"""
+        return self.stage_timer.snapshot()
+    
+    def reset_stage_timings(self):
+        """Aşama süresi sayaçlarını sıfırla"""
+        self.stage_timer.reset()
+    
+    def scan_keywords(self, text):
+        """Metni tek geçişte tarayıp tüm olay/öncelik/bölge/ilçe eşleşmelerini döndür"""
+        return self._keyword_index.search(text)
+    
+    def classify_event_type(self, text, hits=None):
         """Olay türünü sınıflandır"""
-        text_lower = text.lower()
+        if hits is None:
+            hits = self.scan_keywords(text)
         
         scores = {}
-        for olay, keywords in OLAY_ANAHTAR_KELIMELER.items():
-            score = sum(1 for kw in keywords if kw in text_lower)
-            if score > 0:
-                scores[olay] = score
+        for etiket in hits:
+            if etiket[0] == "olay":
+                scores[etiket[1]] = scores.get(etiket[1], 0) + 1
         
         if scores:
-            return max(scores, key=scores.get)
+            # Eşitlikte sözlükteki ilk olay türü seçilir
+            return max((olay for olay in OLAY_ANAHTAR_KELIMELER if olay in scores), key=scores.get)
         return "Diğer"
     
-    def classify_priority(self, text):
+    def classify_priority(self, text, hits=None):
         """Öncelik seviyesini belirle"""
-        text_lower = text.lower()
+        if hits is None:
+            hits = self.scan_keywords(text)
+        
+        oncelikler = {etiket[1] for etiket in hits if etiket[0] == "oncelik"}
         
         # Kritik anahtar kelimeler
-        for kw in ONCELIK_ANAHTAR_KELIMELER["Kritik"]:
-            if kw in text_lower:
-                return "Kritik"
+        if "Kritik" in oncelikler:
+            return "Kritik"
         
         # Yüksek anahtar kelimeler
-        for kw in ONCELIK_ANAHTAR_KELIMELER["Yüksek"]:
-            if kw in text_lower:
-                return "Yüksek"
+        if "Yüksek" in oncelikler:
+            return "Yüksek"
         
         # Orta anahtar kelimeler veya varsayılan
         return "Orta"
@@ -153,74 +454,70 @@ class AKOMClassifier:
             return OLAY_BIRIM_ESLESME[olay_turu]  # Tüm birimleri döndür
         return ["AFAD"]
     
-    def extract_location(self, text):
+    def extract_location(self, text, hits=None):
         """Metinden konum bilgisi çıkar"""
-        # OSB ve önemli bölge eşleştirmeleri (bölge adı -> ilçe)
-        onemli_bolgeler = {
-            "Tuzla OSB": "Tuzla",
-            "Tuzla Organize Sanayi": "Tuzla",
-            "Dudullu OSB": "Ümraniye",
-            "Dudullu Organize Sanayi": "Ümraniye",
-            "İkitelli OSB": "Başakşehir",
-            "İkitelli Organize Sanayi": "Başakşehir",
-            "Beylikdüzü OSB": "Beylikdüzü",
-            "Beylikdüzü Organize Sanayi": "Beylikdüzü",
-            "Esenyurt OSB": "Esenyurt",
-            "Anadolu Yakası OSB": "Tuzla",
-            "Avrupa Yakası OSB": "Başakşehir",
-            "Organize Sanayi Bölgesi": None,  # Genel OSB (ilçe belirsiz)
-            "Sanayi Bölgesi": None,
-            "İstanbul Havalimanı": "Arnavutköy",
-            "Sabiha Gökçen": "Pendik",
-            "Atatürk Havalimanı": "Bakırköy",
-            "Kadıköy İskelesi": "Kadıköy",
-            "Eminönü İskelesi": "Fatih",
-            "Haydarpaşa Limanı": "Kadıköy",
-            "Ambarlı Limanı": "Avcılar",
-        }
+        if hits is None:
+            hits = self.scan_keywords(text)
         
-        # Önce OSB/bölge ara
+        # Önce OSB/bölge ara (sözlükteki ilk eşleşen bölge)
         found_bolge = None
         found_ilce = None
         
-        for bolge, ilce in onemli_bolgeler.items():
-            if bolge.lower() in text.lower():
-                found_bolge = bolge
-                if ilce:
-                    found_ilce = ilce
-                break
+        bolge_indeksleri = [etiket[1] for etiket in hits if etiket[0] == "bolge"]
+        if bolge_indeksleri:
+            found_bolge, ilce = ONEMLI_BOLGELER_LISTESI[min(bolge_indeksleri)]
+            if ilce:
+                found_ilce = ilce
+        
+        # Bilinen ilçe/mahalle/cadde/sokak adları tek taramada (adres sözlüğü)
+        adres = self._gazetteer.scan(text)
         
-        # İlçe bulunamadıysa normal ilçe araması yap
+        # İlçe bulunamadıysa metinde ilk geçen ilçe adı ("Fatih Mahallesi" gibi mahalle adları hariç)
+        if not found_ilce and adres["ilceler"]:
+            found_ilce = adres["ilceler"][0]
+        
+        # Sözlük bulamazsa normal ilçe araması yap (listedeki ilk eşleşen ilçe)
         if not found_ilce:
-            ilceler = [
-                "Avcılar", "Kadıköy", "Beşiktaş", "Beyoğlu", "Fatih", "Şişli",
-                "Üsküdar", "Bakırköy", "Sarıyer", "Maltepe", "Kartal", "Pendik",
-                "Bağcılar", "Bahçelievler", "Esenyurt", "Beylikdüzü", "Büyükçekmece",
-                "Silivri", "Çatalca", "Arnavutköy", "Başakşehir", "Esenler",
-                "Gaziosmanpaşa", "Eyüpsultan", "Kağıthane", "Sultangazi", "Ataşehir",
-                "Ümraniye", "Sancaktepe", "Sultanbeyli", "Çekmeköy", "Beykoz",
-                "Şile", "Adalar", "Tuzla"
-            ]
-            
-            for ilce in ilceler:
-                if ilce in text:
-                    found_ilce = ilce
+            ilce_indeksleri = [etiket[1] for etiket in hits if etiket[0] == "ilce"]
+            if ilce_indeksleri:
+                found_ilce = ILCE_LISTESI[min(ilce_indeksleri)]
+        
+        # Mahalle: önce "... Mahallesi" şeklinde geçen bilinen ad
+        found_mahalle = None
+        mahalle_ilceleri = []
+        if adres["mahalle"]:
+            found_mahalle, mahalle_ilceleri = adres["mahalle"]
+        
+        # Sözlükte olmayan mahalleler için desen
+        if not found_mahalle:
+            mahalle_pattern = r'(\w+)\s+Mahallesi'
+            mahalle_match = re.search(mahalle_pattern, text)
+            found_mahalle = mahalle_match.group(1) if mahalle_match else None
+        
+        # "Mahallesi" eki olmadan geçen ad ancak bulunan ilçeye aitse kabul edilir (ör. "Beşiktaş Levent'te")
+        if not found_mahalle and found_ilce:
+            for ad, ilceler in adres["mahalle_adaylari"]:
+                if found_ilce in ilceler and ad != found_ilce:
+                    found_mahalle = ad
                     break
         
-        # Mahalle deseni
-        mahalle_pattern = r'(\w+)\s+Mahallesi'
-        mahalle_match = re.search(mahalle_pattern, text)
-        found_mahalle = mahalle_match.group(1) if mahalle_match else None
+        # İlçe metinde yoksa mahalleden çıkar (mahalle tek bir ilçeye aitse)
+        if not found_ilce and len(set(mahalle_ilceleri)) == 1:
+            found_ilce = mahalle_ilceleri[0]
         
-        # Cadde deseni (Caddesi, caddesinde, Caddesi'nde, caddede vb.)
-        cadde_pattern = r'([A-ZÇĞİÖŞÜa-zçğıöşü]+(?:\s+[A-ZÇĞİÖŞÜa-zçğıöşü]+)*)\s+[Cc]adde(?:si|sinde|de)'
-        cadde_match = re.search(cadde_pattern, text)
-        found_cadde = cadde_match.group(1) if cadde_match else None
+        found_cadde = adres["cadde"]
+        if not found_cadde:
+            # Cadde deseni (Caddesi, caddesinde, Caddesi'nde, caddede vb.)
+            cadde_pattern = r'([A-ZÇĞİÖŞÜa-zçğıöşü]+(?:\s+[A-ZÇĞİÖŞÜa-zçğıöşü]+)*)\s+[Cc]adde(?:si|sinde|de)'
+            cadde_match = re.search(cadde_pattern, text)
+            found_cadde = cadde_match.group(1) if cadde_match else None
         
-        # Sokak deseni (Sokak, Sokağı, sokağında vb.)
-        sokak_pattern = r'(\w+(?:\s+\w+)?)\s+[Ss]oka(?:k|ğı|ğında)'
-        sokak_match = re.search(sokak_pattern, text)
-        found_sokak = sokak_match.group(1) if sokak_match else None
+        found_sokak = adres["sokak"]
+        if not found_sokak:
+            # Sokak deseni (Sokak, Sokağı, sokağında vb.)
+            sokak_pattern = r'(\w+(?:\s+\w+)?)\s+[Ss]oka(?:k|ğı|ğında)'
+            sokak_match = re.search(sokak_pattern, text)
+            found_sokak = sokak_match.group(1) if sokak_match else None
         
         # Alternatif sokak deseni
         if not found_sokak:
@@ -236,17 +533,84 @@ class AKOMClassifier:
             "bolge": found_bolge
         }
     
-    def analyze(self, ihbar_text):
-        """İhbar metnini analiz et ve tüm sınıflandırmaları döndür"""
-        olay_turu = self.classify_event_type(ihbar_text)
-        oncelik = self.classify_priority(ihbar_text)
-        birimler = self.assign_units(olay_turu)
-        konum = self.extract_location(ihbar_text)
+    def analyze(self, ihbar_text, provisional=False):
+        """
+        İhbar metnini analiz et ve tüm sınıflandırmaları döndür
+        
+        Args:
+            provisional: Metin henüz tamamlanmadı (akan ses çevirisi); BERT atlanır ve
+                         yalnızca kural tabanlı ön sonuç "provisional" olarak döner
+        """
+        # Model henüz yükleniyorsa kural tabanlı sonuç "degraded" olarak işaretlenir
+        degraded = self.use_bert and not self.is_model_ready()
         
         # BERT embedding (opsiyonel kullanım için)
         embedding = None
-        if self.use_bert:
+        if self.use_bert and not degraded and not provisional:
+            started = time.perf_counter_ns() if self.stage_timer.enabled else None
             embedding = self.get_text_embedding(ihbar_text)
+            if started is not None:
+                self.stage_timer.record("embedding", time.perf_counter_ns() - started)
+        
+        return self._build_result(ihbar_text, embedding, degraded, provisional)
+    
+    def analyze_many(self, ihbar_texts, batch_size=32, exclude_rows=None):
+        """
+        İhbar listesini toplu analiz et - her ihbar için analyze() ile aynı sonucu döndürür
+        
+        Args:
+            exclude_rows: Her ihbarın kNN indeksindeki kendi satırı; kNN oylamasına
+                          katılmaz (veri setindeki satırlar yeniden sınıflandırılırken)
+        """
+        ihbar_texts = list(ihbar_texts)
+        exclude_rows = [None] * len(ihbar_texts) if exclude_rows is None else list(exclude_rows)
+        degraded = self.use_bert and not self.is_model_ready()
+        
+        if self.use_bert and not degraded:
+            started = time.perf_counter_ns() if self.stage_timer.enabled else None
+            embeddings = self.get_text_embeddings(ihbar_texts, batch_size=batch_size)
+            if started is not None and ihbar_texts:
+                # Toplu hesaplamada süre öğelere eşit paylaştırılır
+                elapsed = time.perf_counter_ns() - started
+                self.stage_timer.record("embedding", elapsed // len(ihbar_texts), count=len(ihbar_texts))
+        else:
+            embeddings = [None] * len(ihbar_texts)
+        
+        return [self._build_result(text, embedding, degraded, exclude_row=row)
+                for text, embedding, row in zip(ihbar_texts, embeddings, exclude_rows)]
+    
+    def _build_result(self, ihbar_text, embedding, degraded=False, provisional=False, exclude_row=None):
+        """Kural tabanlı sınıflandırmaları yap ve sonuç sözlüğünü oluştur"""
+        # Ölçüm kapalıyken lap None'dur ve her aşamada yalnızca bir kontrol yapılır
+        lap = self.stage_timer.lap()
+        hits = self.scan_keywords(ihbar_text)
+        if lap:
+            lap.lap("anahtar_kelime")
+        olay_turu = self.classify_event_type(ihbar_text, hits)
+        if lap:
+            lap.lap("olay_turu")
+        oncelik = self.classify_priority(ihbar_text, hits)
+        if lap:
+            lap.lap("oncelik")
+        yontem = "kural"
+        
+        # kNN modu: embedding ve indeks hazırsa olay türü/öncelik komşulardan gelir
+        if self.mode == "knn" and embedding is not None and self.knn_index is not None:
+            knn = self.knn_index.query(embedding, k=self.knn_k, exclude=exclude_row)
+            if knn is not None:
+                olay_turu = knn["olay_turu"]
+                oncelik = knn["oncelik"]
+                yontem = "knn"
+            if lap:
+                lap.lap("knn")
+        
+        birimler = self.assign_units(olay_turu)
+        if lap:
+            lap.lap("birim")
+        konum = self.extract_location(ihbar_text, hits)
+        if lap:
+            lap.lap("konum")
+            lap.total()
         
         return {
             "olay_turu": olay_turu,
@@ -258,7 +622,11 @@ class AKOMClassifier:
             "cadde": konum["cadde"],
             "sokak": konum["sokak"],
             "bolge": konum["bolge"],
-            "embedding": embedding
+            "embedding": embedding,
+            "model_revision": self.model_revision if embedding is not None else None,
+            "degraded": degraded,  # Model hazır değilken yalnızca kural tabanlı sonuç
+            "provisional": provisional,  # Kısmi metinden (konuşma sürerken) üretilen ön sonuç
+            "yontem": yontem  # "kural" veya "knn"
         }
 
 
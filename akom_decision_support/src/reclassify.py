@@ -0,0 +1,207 @@
+"""
+AKOM Toplu Yeniden Sınıflandırma
+Veri setini parçalar halinde okuyup süreç havuzunda yeniden sınıflandırır
+
+Kullanım:
+    python src/reclassify.py --workers 4 --chunk-size 2000
+    python src/reclassify.py --mode knn --backend int8 --output data/reclassified.csv
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import pandas as pd
+
+try:
+    from src.model import AKOMClassifier
+    from src.knn_index import KNNIndex, KNN_INDEX_DIR
+    from src.utils import get_report_texts, DATASET_CSV_PATH
+except ImportError:
+    from model import AKOMClassifier
+    from knn_index import KNNIndex, KNN_INDEX_DIR
+    from utils import get_report_texts, DATASET_CSV_PATH
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+# Her işçi süreç kendi sınıflandırıcısını tutar
+_classifier = None
+
+
+def _init_worker(mode, backend, knn_index_dir):
+    global _classifier
+    # kNN modu BERT embedding'lerine ihtiyaç duyar; indeks ana süreçte eşitlenmiştir
+    _classifier = AKOMClassifier(use_bert=mode == "knn", backend=backend, mode=mode,
+                                 knn_index_dir=knn_index_dir, knn_sync=False)
+    if mode == "knn" and _classifier.knn_index is None:
+        raise RuntimeError("kNN indeksi açılamadı.")
+
+
+def _sync_knn_index(input_path, index_dir, backend):
+    """
+    Girdi veri setinin kNN indeksini işçiler başlamadan bir kez eşitle
+    
+    İndeks satırları girdi satırlarıyla hizalı olmalıdır: girdi uygulamanın
+    veri setiyse ortak indeks, değilse sonuç dizinindeki ayrı bir indeks kullanılır.
+    """
+    classifier = AKOMClassifier(use_bert=True, backend=backend)
+    if not classifier.is_model_ready():
+        raise ValueError("BERT modeli yüklenemedi; kNN modu kullanılamaz.")
+    
+    df = pd.read_csv(input_path, usecols=lambda c: c in ("ihbar", "ihbar_metni", "olay_turu", "oncelik"))
+    labels = list(zip(df["olay_turu"].astype(str), df["oncelik"].astype(str)))
+    index = KNNIndex(index_dir, classifier.model_revision)
+    print(f"kNN indeksi eşitleniyor: {index_dir} ({len(index)}/{len(df)} satır hazır)")
+    index.sync(get_report_texts(df), labels, classifier.get_text_embeddings)
+
+
+def _classify_chunk(chunk_no, chunk, part_path):
+    """Bir parçayı sınıflandır, sonucu parça dosyasına yaz ve satır sayısını döndür"""
+    # Satırın indeksteki kendi kaydı komşu sayılmaz (kNN modunda kendisine 1.0 benzerlik verir)
+    results = _classifier.analyze_many(get_report_texts(chunk), exclude_rows=chunk.index)
+    
+    out = pd.DataFrame({
+        "satir": chunk.index,
+        "olay_turu": chunk["olay_turu"].values,
+        "oncelik": chunk["oncelik"].values,
+        "birim": chunk["birim"].values,
+        "ilce": chunk["ilce"].values,
+        "tahmin_olay_turu": [r["olay_turu"] for r in results],
+        "tahmin_oncelik": [r["oncelik"] for r in results],
+        "tahmin_birim": [r["birim"] for r in results],
+        "tahmin_ilce": [r["ilce"] for r in results],
+        "tahmin_mahalle": [r["mahalle"] for r in results],
+    })
+    out["olay_degisti"] = out["olay_turu"] != out["tahmin_olay_turu"]
+    out["oncelik_degisti"] = out["oncelik"] != out["tahmin_oncelik"]
+    out["ilce_degisti"] = out["ilce"] != out["tahmin_ilce"]
+    
+    # Yarım kalan parça checkpoint sayılmasın diye önce geçici dosyaya yazılır
+    tmp_path = part_path + ".tmp"
+    out.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, part_path)
+    return chunk_no, len(out)
+
+
+def _check_manifest(parts_dir, settings):
+    """
+    Parça dizininin hangi ayarlarla üretildiğini kaydet ya da karşılaştır
+    
+    Parça numaraları parça boyutuna bağlıdır; farklı ayarlarla devam etmek
+    satırları atlar ya da iki kez yazar.
+    """
+    manifest_path = os.path.join(parts_dir, "manifest.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+        if previous != settings:
+            raise ValueError(f"{parts_dir} farklı ayarlarla üretilmiş ({previous}); "
+                             f"devam etmek için aynı ayarları kullanın ya da dizini silin.")
+        return
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(settings, f, ensure_ascii=False)
+
+
+def reclassify(input_path, output_path, workers=4, chunk_size=2000, mode="rules", backend="pytorch"):
+    """
+    Veri setini yeniden sınıflandır
+    
+    Tamamlanan her parça <output>.parts/ altına yazılır; komut yeniden
+    çalıştırıldığında mevcut parçalar atlanır (kaldığı yerden devam).
+    Devam yalnızca parça boyutu, mod ve backend aynıysa yapılır.
+    
+    kNN modunda her satır, kendisi hariç diğer satırların komşuluğuyla
+    sınıflandırılır.
+    """
+    parts_dir = output_path + ".parts"
+    os.makedirs(parts_dir, exist_ok=True)
+    _check_manifest(parts_dir, {"input": os.path.abspath(input_path), "chunk_size": chunk_size,
+                                "mode": mode, "backend": backend})
+    
+    knn_index_dir = None
+    if mode == "knn":
+        same_dataset = os.path.abspath(input_path) == os.path.abspath(DATASET_CSV_PATH)
+        knn_index_dir = KNN_INDEX_DIR if same_dataset else os.path.join(parts_dir, "knn_index")
+        _sync_knn_index(input_path, knn_index_dir, backend)
+    
+    start = time.perf_counter()
+    done_rows = 0
+    skipped = 0
+    pending = set()
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(mode, backend, knn_index_dir)) as pool:
+        reader = pd.read_csv(input_path, chunksize=chunk_size)
+        for chunk_no, chunk in enumerate(reader):
+            part_path = os.path.join(parts_dir, f"part_{chunk_no:06d}.csv")
+            if os.path.exists(part_path):
+                skipped += 1
+                continue
+            
+            # Belleği sınırlı tutmak için havuzda en fazla 2 x workers parça bekler
+            if len(pending) >= workers * 2:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                done_rows += _report(finished, start, done_rows)
+            
+            pending.add(pool.submit(_classify_chunk, chunk_no, chunk, part_path))
+        
+        if pending:
+            done_rows += _report(pending, start, done_rows)
+    
+    if skipped:
+        print(f"{skipped} parça önceki çalıştırmadan alındı.")
+    
+    return _merge_parts(parts_dir, output_path, done_rows, time.perf_counter() - start)
+
+
+def _report(futures, start, done_rows):
+    rows = 0
+    for future in futures:
+        chunk_no, n = future.result()
+        rows += n
+    elapsed = time.perf_counter() - start
+    total = done_rows + rows
+    print(f"  {total:,} satır işlendi ({total / elapsed:,.0f} satır/sn)")
+    return rows
+
+
+def _merge_parts(parts_dir, output_path, new_rows, elapsed):
+    """Parça dosyalarını sırayla birleştirip özet yazdır"""
+    part_files = sorted(f for f in os.listdir(parts_dir) if f.endswith(".csv"))
+    df = pd.concat((pd.read_csv(os.path.join(parts_dir, f)) for f in part_files), ignore_index=True)
+    df.to_csv(output_path, index=False)
+    
+    print(f"\nSonuç dosyası: {output_path}")
+    print(f"Toplam satır: {len(df):,}")
+    if new_rows:
+        print(f"Bu çalıştırmada: {new_rows:,} satır, {elapsed:.1f} sn ({new_rows / elapsed:,.0f} satır/sn)")
+    print(f"Olay türü değişen: {df['olay_degisti'].sum():,}")
+    print(f"Öncelik değişen: {df['oncelik_degisti'].sum():,}")
+    print(f"İlçe değişen: {df['ilce_degisti'].sum():,}")
+    return df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AKOM veri setini yeniden sınıflandır")
+    parser.add_argument("--input", default=os.path.join(DATA_DIR, "akom_dataset.csv"))
+    parser.add_argument("--output", default=os.path.join(DATA_DIR, "akom_reclassified.csv"))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--mode", default="rules", choices=["rules", "knn"],
+                        help="rules: anahtar kelime, knn: geçmiş ihbarlarda en yakın komşu (BERT gerekir)")
+    parser.add_argument("--backend", default="pytorch", choices=["pytorch", "int8", "onnx"])
+    args = parser.parse_args(argv)
+    
+    print(f"Yeniden sınıflandırma: {args.input} ({args.workers} işçi, parça boyutu {args.chunk_size}, "
+          f"mod {args.mode})")
+    try:
+        reclassify(args.input, args.output, workers=args.workers, chunk_size=args.chunk_size,
+                   mode=args.mode, backend=args.backend)
+    except ValueError as e:
+        parser.error(str(e))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,124 +3,720 @@ AKOM Ses İşleme Modülü
 Whisper ile sesli ihbar girişi
 """
 
-import whisper
-import tempfile
+import hashlib
+import io
+import json
 import os
 import subprocess
+import threading
+import time
+import wave
+from collections import OrderedDict
+
+import numpy as np
+
+try:
+    from src.file_lock import FileLock
+    from src.toolchain import TOOLCHAIN
+    from src.vad import VADSegmenter, iter_chunks
+except ImportError:
+    from file_lock import FileLock
+    from toolchain import TOOLCHAIN
+    from vad import VADSegmenter, iter_chunks
+
+try:
+    import whisper
+except ImportError:
+    whisper = None
+
+try:
+    from faster_whisper import WhisperModel
+except ImportError:
+    WhisperModel = None
+
+if whisper is None and WhisperModel is None:
+    raise ImportError("Ses girişi için openai-whisper veya faster-whisper gerekli")
+
+# Ses arka uçları:
+#   faster-whisper - CTranslate2 motoru; CPU'da int8, GPU'da float16 çalışır
+#   openai-whisper - PyTorch uygulaması; fp16 yalnızca GPU'da işe yarar
+SPEECH_BACKENDS = ["auto", "faster-whisper", "openai-whisper"]
+WHISPER_MODEL_SIZES = ["tiny", "base", "small", "medium", "large-v3", "large"]
+COMPUTE_TYPES = ["auto", "int8", "int8_float16", "float16", "float32"]
+
+# Varsayılan ses ayarları - configure_speech() ile değiştirilir
+SPEECH_CONFIG = {
+    "backend": "auto",
+    "model_size": "large",  # En iyi Türkçe tanıma; CPU'da "small"/"medium" daha hızlı
+    "compute_type": "auto",
+    "num_threads": None,  # None: tüm çekirdekler
+}
+
+# Türkçe afet ihbarları için bağlam
+INITIAL_PROMPT = """
+        Bu bir afet ihbarıdır. İstanbul'dan acil durum bildirimi.
+        Deprem, sel baskını, yangın, trafik kazası, gaz kaçağı, heyelan.
+        Avcılar, Kadıköy, Beşiktaş, Esenyurt, Sarıyer, Bakırköy gibi ilçeler.
+        Mahalle, cadde, sokak isimleri içerebilir.
+        """
+
+# Çözümleme ayarları (önbellek anahtarının parçası)
+DECODING_OPTIONS = {"language": "tr", "beam_size": 5, "best_of": 5, "temperature": 0}
+
+TRANSCRIPTION_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                       "data", "transcription_cache")
+
+# Whisper'ın beklediği örnekleme hızı
+SAMPLE_RATE = 16000
 
 # Whisper modelini global olarak cache'le
 _whisper_model = None
+_speech_info = None  # Yüklü modelin arka uç/cihaz/hassasiyet bilgisi
+_transcription_cache = None
+_model_lock = threading.Lock()  # Eşzamanlı çeviri işleri modeli iki kez yüklemesin
+
+# ffmpeg süreç başlangıcında bir kez aranır; sonraki çağrılar önbellekteki yolu kullanır
+TOOLCHAIN.resolve("ffmpeg")
 
 
 def check_ffmpeg():
-    """FFmpeg'in yüklü ve erişilebilir olup olmadığını kontrol et"""
+    """FFmpeg'in yüklü ve erişilebilir olup olmadığını kontrol et (süreç başına bir kez aranır)"""
+    return TOOLCHAIN.resolve("ffmpeg")["available"]
+
+
+def configure_speech(backend=None, model_size=None, compute_type=None, num_threads=None):
+    """
+    Ses arka ucunu ayarla; yüklü model varsa bir sonraki çağrıda yeniden yüklenir
+    
+    Args:
+        backend: "auto", "faster-whisper" veya "openai-whisper"
+        model_size: "tiny", "base", "small", "medium", "large-v3" veya "large"
+        compute_type: "auto", "int8", "int8_float16", "float16" veya "float32"
+        num_threads: CPU çıkarımı için iş parçacığı sayısı
+    """
+    global _whisper_model, _speech_info
+    if backend is not None and backend not in SPEECH_BACKENDS:
+        raise ValueError(f"Bilinmeyen ses arka ucu: {backend} (seçenekler: {', '.join(SPEECH_BACKENDS)})")
+    if model_size is not None and model_size not in WHISPER_MODEL_SIZES:
+        raise ValueError(f"Bilinmeyen model boyutu: {model_size} (seçenekler: {', '.join(WHISPER_MODEL_SIZES)})")
+    if compute_type is not None and compute_type not in COMPUTE_TYPES:
+        raise ValueError(f"Bilinmeyen hassasiyet: {compute_type} (seçenekler: {', '.join(COMPUTE_TYPES)})")
+    
+    for key, value in (("backend", backend), ("model_size", model_size),
+                       ("compute_type", compute_type), ("num_threads", num_threads)):
+        if value is not None:
+            SPEECH_CONFIG[key] = value
+    _whisper_model = None
+    _speech_info = None
+
+
+def _cuda_available():
     try:
-        result = subprocess.run(['ffmpeg', '-version'], capture_output=True, text=True)
-        if result.returncode == 0:
-            return True
-    except FileNotFoundError:
+        import torch
+        return torch.cuda.is_available()
+    except ImportError:
         pass
+    try:
+        import ctranslate2
+        return ctranslate2.get_cuda_device_count() > 0
+    except ImportError:
+        return False
+
+
+def resolve_speech_backend(config=None):
+    """
+    Ayarları donanımla karşılaştırıp çalışacak arka ucu belirle
+    
+    GPU yokken fp16 istenirse ya da arka uç kurulu değilse uyarı verilip
+    çalışabilen en yakın seçeneğe geçilir.
+    
+    Returns:
+        dict: backend, model_size, device, compute_type, num_threads
+    """
+    config = dict(SPEECH_CONFIG if config is None else config)
+    backend = config["backend"]
+    if backend == "auto":
+        backend = "faster-whisper" if WhisperModel is not None else "openai-whisper"
+    elif backend == "faster-whisper" and WhisperModel is None:
+        print("faster-whisper kurulu değil, openai-whisper kullanılacak.")
+        backend = "openai-whisper"
+    elif backend == "openai-whisper" and whisper is None:
+        print("openai-whisper kurulu değil, faster-whisper kullanılacak.")
+        backend = "faster-whisper"
+    
+    device = "cuda" if _cuda_available() else "cpu"
+    compute_type = config["compute_type"]
+    
+    if backend == "faster-whisper":
+        if compute_type == "auto":
+            compute_type = "float16" if device == "cuda" else "int8"
+        elif device == "cpu" and compute_type in ("float16", "int8_float16"):
+            print(f"GPU bulunamadı, {compute_type} yerine int8 kullanılacak.")
+            compute_type = "int8"
+    else:
+        if compute_type in ("int8", "int8_float16"):
+            print("openai-whisper int8 desteklemiyor, faster-whisper kurulmalı.")
+            compute_type = "auto"
+        if compute_type == "auto":
+            compute_type = "float16" if device == "cuda" else "float32"
+        elif device == "cpu" and compute_type == "float16":
+            print("GPU bulunamadı, fp16 yerine fp32 kullanılacak.")
+            compute_type = "float32"
     
-    # Windows'ta yaygın FFmpeg konumlarını kontrol et
-    common_paths = [
-        r"C:\ffmpeg\bin",
-        r"C:\Program Files\ffmpeg\bin",
-        os.path.expanduser(r"~\AppData\Local\Microsoft\WinGet\Packages"),
-    ]
-    
-    for path in common_paths:
-        if os.path.exists(path):
-            ffmpeg_exe = os.path.join(path, "ffmpeg.exe")
-            if os.path.exists(ffmpeg_exe):
-                os.environ["PATH"] = path + os.pathsep + os.environ.get("PATH", "")
-                return True
-            if "WinGet" in path:
-                for folder in os.listdir(path) if os.path.exists(path) else []:
-                    if "FFmpeg" in folder:
-                        ffmpeg_dir = os.path.join(path, folder)
-                        for root, dirs, files in os.walk(ffmpeg_dir):
-                            if "ffmpeg.exe" in files:
-                                os.environ["PATH"] = root + os.pathsep + os.environ.get("PATH", "")
-                                return True
-    return False
+    return {
+        "backend": backend,
+        "model_size": config["model_size"],
+        "device": device,
+        "compute_type": compute_type,
+        "num_threads": config["num_threads"] or os.cpu_count() or 1,
+    }
 
 
 def get_whisper_model():
     """Whisper modelini yükle ve cache'le"""
-    global _whisper_model
-    if _whisper_model is None:
+    global _whisper_model, _speech_info
+    if _whisper_model is not None:
+        return _whisper_model
+    
+    with _model_lock:
+        if _whisper_model is not None:
+            return _whisper_model
+        
         check_ffmpeg()
         
-        # "large" model - en iyi Türkçe tanıma
-        # İlk seferde ~3GB indirilecek, sonra cache'ten yüklenecek
-        print("Whisper 'large' modeli yükleniyor (en iyi Türkçe desteği)...")
-        _whisper_model = whisper.load_model("large")
-        print("Model yüklendi!")
+        info = resolve_speech_backend()
+        # İlk seferde model indirilecek ("large" ~3GB), sonra cache'ten yüklenecek
+        print(f"Whisper '{info['model_size']}' modeli yükleniyor "
+              f"({info['backend']}, {info['device']}, {info['compute_type']}, {info['num_threads']} iş parçacığı)...")
+        started = time.perf_counter()
+        
+        if info["backend"] == "faster-whisper":
+            _whisper_model = WhisperModel(info["model_size"], device=info["device"],
+                                          compute_type=info["compute_type"],
+                                          cpu_threads=info["num_threads"])
+        else:
+            if info["device"] == "cpu":
+                import torch
+                torch.set_num_threads(info["num_threads"])
+            _whisper_model = whisper.load_model(info["model_size"], device=info["device"])
+        
+        info["load_seconds"] = time.perf_counter() - started
+        info["last_rtf"] = None
+        _speech_info = info
+        print(f"Model yüklendi! ({info['load_seconds']:.1f} sn)")
     return _whisper_model
 
 
-def transcribe_audio(audio_bytes):
+def get_speech_status():
+    """Yüklü ses modelinin arka uç bilgisi ve son gerçek zaman faktörü"""
+    return dict(_speech_info) if _speech_info is not None else None
+
+
+def _decode_wav(audio_bytes):
+    """
+    PCM WAV baytlarını doğrudan 16 kHz mono float32 diziye çevir
+    
+    audio_recorder 16 kHz 16-bit PCM ürettiği için ffmpeg gerekmez;
+    WAV değilse ya da örnekleme hızı farklıysa None döner.
+    """
+    try:
+        with wave.open(io.BytesIO(audio_bytes), "rb") as wav:
+            if wav.getframerate() != SAMPLE_RATE or wav.getsampwidth() not in (1, 2, 4):
+                return None
+            channels = wav.getnchannels()
+            width = wav.getsampwidth()
+            frames = wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError):
+        return None
+    
+    if width == 1:
+        # 8-bit PCM işaretsizdir
+        audio = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif width == 2:
+        audio = np.frombuffer(frames, dtype="<i2").astype(np.float32) / 32768.0
+    else:
+        audio = np.frombuffer(frames, dtype="<i4").astype(np.float32) / 2147483648.0
+    
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1)
+    return audio
+
+
+def _decode_ffmpeg(audio_bytes):
+    """Baytları stdin'den ffmpeg'e verip 16 kHz mono PCM'i stdout'tan oku"""
+    ffmpeg = TOOLCHAIN.path("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("ffmpeg bulunamadı; yalnızca 16 kHz PCM WAV çözülebilir")
+    cmd = [ffmpeg, "-nostdin", "-loglevel", "error", "-i", "pipe:0",
+           "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1"]
+    result = subprocess.run(cmd, input=audio_bytes, capture_output=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg ses çözümleyemedi: {result.stderr.decode('utf-8', 'replace').strip()}")
+    return np.frombuffer(result.stdout, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def decode_audio(audio_bytes):
+    """
+    Ses baytlarını diske yazmadan Whisper'ın beklediği 16 kHz float32 diziye çevir
+    
+    16 kHz PCM WAV doğrudan çözülür; diğer biçimler ffmpeg'e boru ile verilir.
+    """
+    audio = _decode_wav(audio_bytes)
+    if audio is None:
+        audio = _decode_ffmpeg(audio_bytes)
+    return audio
+
+
+def _run_transcription(model, info, audio, initial_prompt=INITIAL_PROMPT):
+    """Seçili arka uçla 16 kHz float32 dizi üzerinde çeviri yap ve metni döndür"""
+    options = dict(DECODING_OPTIONS, initial_prompt=initial_prompt)
+    
+    if info["backend"] == "faster-whisper":
+        segments, _ = model.transcribe(audio, **options)
+        return "".join(segment.text for segment in segments)
+    
+    return model.transcribe(audio, fp16=info["compute_type"] == "float16", **options)["text"]
+
+
+def _process_memory_mb():
+    """Sürecin yerleşik bellek kullanımı (MB); ölçülemezse None"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 2 ** 20
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class WhisperHandle:
+    """
+    Süreç genelinde paylaşılan, önceden yüklenip ısıtılmış Whisper modeli
+    
+    st.cache_resource ile tutulduğunda Streamlit modülleri yeniden yüklese bile
+    aynı nesne döner; attach() yeni modül kopyasını bu modele bağlar, böylece
+    model ikinci kez yüklenmez.
+    """
+    
+    def __init__(self):
+        self.model = None
+        self.info = None
+        self.status = "loading"  # loading, ready, failed
+        self.error = None
+        self._ready = threading.Event()
+        self._thread = None
+    
+    def _load(self, warmup):
+        try:
+            memory_before = _process_memory_mb()
+            self.model = get_whisper_model()
+            self.info = _speech_info
+            
+            if warmup:
+                # Kısa bir boş çözümleme ilk gerçek isteğin ödeyeceği ısınma maliyetini üstlenir
+                started = time.perf_counter()
+                silence = np.random.default_rng(0).normal(0, 1e-4, SAMPLE_RATE).astype(np.float32)
+                _run_transcription(self.model, self.info, silence)
+                self.info["warmup_seconds"] = time.perf_counter() - started
+            
+            memory_after = _process_memory_mb()
+            if memory_before is not None and memory_after is not None:
+                self.info["memory_mb"] = memory_after - memory_before
+            self.status = "ready"
+            print(f"Whisper hazır (yükleme {self.info['load_seconds']:.1f} sn, "
+                  f"ısınma {self.info.get('warmup_seconds', 0.0):.1f} sn)")
+        except Exception as e:
+            self.status = "failed"
+            self.error = str(e)
+            print(f"Whisper ön yüklemesi başarısız: {e}")
+        finally:
+            self._ready.set()
+    
+    def attach(self):
+        """Modül yeniden yüklendiyse global modeli bu tanıtıcıdaki modele bağla"""
+        global _whisper_model, _speech_info
+        if self.model is not None and _whisper_model is None:
+            _whisper_model = self.model
+            _speech_info = self.info
+    
+    def wait(self, timeout=None):
+        """Yükleme bitene kadar bekle; model hazırsa True"""
+        self._ready.wait(timeout)
+        return self.status == "ready"
+    
+    def get_status(self):
+        """Yükleme durumu, süreler ve bellek artışı"""
+        status = {"status": self.status, "error": self.error}
+        if self.info is not None:
+            status.update(self.info)
+        return status
+
+
+def preload_whisper_model(warmup=True, background=True):
+    """
+    Whisper modelini uygulama açılışında yükle ve ısıt
+    
+    Args:
+        warmup: Yüklemeden sonra kısa bir boş çözümleme çalıştır
+        background: Yüklemeyi arka planda yap; bu sırada gelen çeviriler modeli bekler
+    
+    Returns:
+        WhisperHandle
+    """
+    handle = WhisperHandle()
+    if background:
+        handle._thread = threading.Thread(target=handle._load, args=(warmup,),
+                                          name="akom-whisper-yukleme", daemon=True)
+        handle._thread.start()
+    else:
+        handle._load(warmup)
+    return handle
+
+
+class TranscriptionCache:
+    """
+    Ses özeti + model/çözümleme ayarlarıyla anahtarlanan çeviri önbelleği
+    
+    1. katman: boyutu sınırlı bellek içi LRU
+    2. katman: disk üzerinde transcripts.jsonl - her satırda {"key", "text"};
+       açılışta yalnızca anahtar -> bayt konumu indekslenir, metin isabette okunur
+    
+    Disk yazmaları ve sıkıştırma süreçler arası dosya kilidi altında yapılır.
+    Başka süreçlerin eklediği satırlar dosyanın indekslenmemiş kuyruğundan
+    okunur; dosya başka bir süreçte sıkıştırılırsa (kimliği değişir) indeks
+    baştan kurulur.
+    """
+    
+    def __init__(self, cache_dir=None, max_memory_items=256, max_disk_items=20000):
+        self.cache_dir = cache_dir
+        self.max_memory_items = max_memory_items
+        self.max_disk_items = max_disk_items
+        
+        self._memory = OrderedDict()
+        self._disk_index = {}
+        self._disk_id = None  # transcripts.jsonl dosya kimliği (inode)
+        self._disk_size = 0  # indekslenmiş bayt sayısı
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._load_disk()
+    
+    @staticmethod
+    def make_key(audio_bytes, settings):
+        """Ses baytlarının SHA-256 özeti ve ayarların parmak izinden anahtar üret"""
+        digest = hashlib.sha256(audio_bytes).hexdigest()
+        fingerprint = hashlib.sha1(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()
+        return f"{digest}:{fingerprint}"
+    
+    def _path(self):
+        return os.path.join(self.cache_dir, "transcripts.jsonl")
+    
+    def _file_id(self):
+        try:
+            return os.stat(self._path()).st_ino
+        except OSError:
+            return None
+    
+    def _load_disk(self):
+        """İndeksi baştan kur"""
+        self._disk_index = {}
+        self._disk_size = 0
+        self._disk_id = self._file_id()
+        self._index_tail()
+    
+    def _index_tail(self):
+        """Dosyanın indekslenmemiş kuyruğundaki tam satırları indeksle"""
+        if self._disk_id is None:
+            return
+        offset = self._disk_size
+        with open(self._path(), "rb") as f:
+            f.seek(offset)
+            for line in f:
+                # Yarım kalmış son satır bir sonraki okumaya bırakılır
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    self._disk_index[json.loads(line)["key"]] = offset
+                except (ValueError, KeyError):
+                    pass
+                offset += len(line)
+        self._disk_size = offset
+    
+    def _sync_disk(self):
+        """Başka süreçlerin eklediği ya da sıkıştırdığı kayıtları yakala"""
+        if self._file_id() != self._disk_id:
+            self._load_disk()
+        elif self._disk_id is not None and os.path.getsize(self._path()) > self._disk_size:
+            self._index_tail()
+    
+    def _read_disk(self, key, offset):
+        with open(self._path(), "rb") as f:
+            f.seek(offset)
+            record = json.loads(f.readline())
+        # Dosya başka bir süreç tarafından sıkıştırıldıysa konum başka kayda düşebilir
+        return record["text"] if record.get("key") == key else None
+    
+    def _write_disk(self, key, text):
+        line = (json.dumps({"key": key, "text": text}, ensure_ascii=False) + "\n").encode("utf-8")
+        with FileLock(self._path()):
+            self._sync_disk()
+            if key in self._disk_index:
+                # Aynı kaydı başka bir süreç yazmış
+                return
+            with open(self._path(), "ab") as f:
+                offset = f.seek(0, os.SEEK_END)
+                if offset > self._disk_size:
+                    # Yarım kalmış bir yazmanın ardından yeni satıra geçilir
+                    f.write(b"\n")
+                    offset += 1
+                f.write(line)
+            self._disk_index[key] = offset
+            self._disk_size = offset + len(line)
+            self._disk_id = self._file_id()
+            
+            if len(self._disk_index) > self.max_disk_items:
+                self._compact_disk()
+    
+    def _compact_disk(self):
+        """Disk katmanını en yeni max_disk_items kayda indir (dosya kilidi altında çağrılır)"""
+        keep = sorted(self._disk_index.items(), key=lambda item: item[1])[-self.max_disk_items:]
+        self.evictions += len(self._disk_index) - len(keep)
+        
+        lines = []
+        with open(self._path(), "rb") as f:
+            for _, offset in keep:
+                f.seek(offset)
+                lines.append(f.readline())
+        
+        tmp_path = self._path() + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.writelines(lines)
+        os.replace(tmp_path, self._path())
+        
+        self._disk_index = {}
+        offset = 0
+        for (key, _), line in zip(keep, lines):
+            self._disk_index[key] = offset
+            offset += len(line)
+        self._disk_size = offset
+        self._disk_id = self._file_id()
+    
+    def _remember(self, key, text):
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+    
+    def get(self, key):
+        """Önbellekteki çeviriyi döndür, yoksa None"""
+        with self._lock:
+            text = self._memory.get(key)
+            if text is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                self.memory_hits += 1
+                return text
+            
+            if self.cache_dir:
+                self._sync_disk()
+            offset = self._disk_index.get(key)
+            if offset is not None:
+                try:
+                    text = self._read_disk(key, offset)
+                except (OSError, ValueError, KeyError):
+                    text = None
+                if text is not None:
+                    self._remember(key, text)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return text
+            
+            self.misses += 1
+            return None
+    
+    def put(self, key, text):
+        """Çeviriyi iki katmana da kaydet"""
+        with self._lock:
+            self._remember(key, text)
+            if self.cache_dir and key not in self._disk_index:
+                self._write_disk(key, text)
+    
+    def clear(self, disk=False):
+        """Bellek katmanını (isteğe bağlı olarak diski de) temizle"""
+        with self._lock:
+            self._memory.clear()
+            if disk and self.cache_dir:
+                with FileLock(self._path()):
+                    if os.path.exists(self._path()):
+                        os.remove(self._path())
+                    self._load_disk()
+    
+    def stats(self):
+        """İsabet/ıska sayaçlarını döndür"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "memory_items": len(self._memory),
+                "disk_items": len(self._disk_index),
+            }
+
+
+def get_transcription_cache():
+    """Süreç genelinde paylaşılan çeviri önbelleği"""
+    global _transcription_cache
+    if _transcription_cache is None:
+        _transcription_cache = TranscriptionCache(TRANSCRIPTION_CACHE_DIR)
+    return _transcription_cache
+
+
+def transcription_cache_stats():
+    """Çeviri önbelleği isabet/ıska istatistiklerini döndür"""
+    return get_transcription_cache().stats()
+
+
+def _cache_settings():
+    """Çeviri sonucunu etkileyen model ve çözümleme ayarları"""
+    info = _speech_info or resolve_speech_backend()
+    return {
+        "backend": info["backend"],
+        "model_size": info["model_size"],
+        "compute_type": info["compute_type"],
+        "decoding": DECODING_OPTIONS,
+        "initial_prompt": INITIAL_PROMPT,
+    }
+
+
+def transcribe_audio(audio_bytes, use_cache=True):
     """
     Ses dosyasını metne çevir
     
     Args:
         audio_bytes: Ses dosyasının byte içeriği
+        use_cache: Aynı ses ve ayarlarla daha önce yapılmış çeviriyi kullan
     
     Returns:
         str: Çevrilen metin
     """
-    tmp_path = None
+    return transcribe_audio_detailed(audio_bytes, use_cache)["text"]
+
+
+def transcribe_audio_detailed(audio_bytes, use_cache=True):
+    """
+    transcribe_audio() ile aynı çeviri; süre bilgileriyle birlikte
+    
+    Returns:
+        dict: text (boşsa ya da hata olduysa None), audio_seconds,
+              transcribe_seconds, cached, error
+    """
+    sonuc = {"text": None, "audio_seconds": None, "transcribe_seconds": None, "cached": False, "error": None}
     try:
-        check_ffmpeg()
+        cache_key = None
+        if use_cache:
+            cache_key = TranscriptionCache.make_key(audio_bytes, _cache_settings())
+            text = get_transcription_cache().get(cache_key)
+            if text is not None:
+                print(f"Çeviri önbellekten alındı: {text}")
+                sonuc.update(text=text or None, cached=True)
+                return sonuc
         
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_file:
-            tmp_file.write(audio_bytes)
-            tmp_path = tmp_file.name
+        # Ses bellekte çözülür; geçici dosya oluşturulmaz
+        audio = decode_audio(audio_bytes)
+        duration = len(audio) / SAMPLE_RATE
+        print(f"Ses: {len(audio_bytes)} bytes, {duration:.2f} sn")
         
-        print(f"Ses dosyası: {tmp_path}, Boyut: {os.path.getsize(tmp_path)} bytes")
+        model = get_whisper_model()
+        started = time.perf_counter()
+        text = _run_transcription(model, _speech_info, audio)
+        elapsed = time.perf_counter() - started
         
-        # Türkçe afet ihbarları için bağlam
-        initial_prompt = """
-        Bu bir afet ihbarıdır. İstanbul'dan acil durum bildirimi.
-        Deprem, sel baskını, yangın, trafik kazası, gaz kaçağı, heyelan.
-        Avcılar, Kadıköy, Beşiktaş, Esenyurt, Sarıyer, Bakırköy gibi ilçeler.
-        Mahalle, cadde, sokak isimleri içerebilir.
-        """
+        if duration:
+            # Gerçek zaman faktörü: çeviri süresi / ses süresi (1'in altı gerçek zamandan hızlı)
+            _speech_info["last_rtf"] = elapsed / duration
+            print(f"Çeviri: {elapsed:.2f} sn, ses: {duration:.2f} sn, RTF: {elapsed / duration:.2f}")
         
-        model = get_whisper_model()
-        result = model.transcribe(
-            tmp_path,
-            language="tr",
-            fp16=True,  # GPU için aktif - çok daha hızlı
-            initial_prompt=initial_prompt,
-            beam_size=5,
-            best_of=5,
-            temperature=0
-        )
-        
-        text = result["text"].strip()
+        text = text.strip()
         print(f"Sonuç: {text}")
         
-        return text if text else None
+        if cache_key is not None:
+            get_transcription_cache().put(cache_key, text)
+        
+        sonuc.update(text=text or None, audio_seconds=duration, transcribe_seconds=elapsed)
+        return sonuc
     
     except Exception as e:
         import traceback
         print(f"Hata: {e}")
         print(traceback.format_exc())
-        return None
+        sonuc["error"] = str(e)
+        return sonuc
+
+
+def transcribe_stream(audio_chunks, segmenter=None):
+    """
+    Akan sesi VAD ile kesitlere ayırıp her kesit bittikçe kısmi metin üret
     
-    finally:
-        if tmp_path and os.path.exists(tmp_path):
-            try:
-                os.unlink(tmp_path)
-            except:
-                pass
+    Arayan konuşmaya devam ederken tamamlanan kesitler çevrilir; böylece
+    kısmi metinle (classifier.analyze(text, provisional=True)) ön triyaj
+    kayıt bitmeden başlayabilir.
+    
+    Args:
+        audio_chunks: 16 kHz mono ses parçaları (16-bit PCM bayt ya da float32 dizi)
+        segmenter: Varsayılan ayarlar yerine kullanılacak VADSegmenter
+    
+    Yields:
+        dict: text (şimdiye kadarki tüm metin), segment (son kesitin metni),
+              audio_seconds (çevrilen konuşma süresi), final (akış bitti mi)
+    """
+    segmenter = segmenter or VADSegmenter()
+    model = get_whisper_model()
+    parts = []
+    audio_seconds = 0.0
+    
+    def _partial(segment, final):
+        nonlocal audio_seconds
+        text = ""
+        if segment is not None:
+            # Önceki kesitlerin metni bağlam olarak verilir; cümleler kesit sınırında kopmasın
+            prompt = INITIAL_PROMPT + " ".join(parts[-3:])
+            started = time.perf_counter()
+            text = _run_transcription(model, _speech_info, segment, initial_prompt=prompt).strip()
+            elapsed = time.perf_counter() - started
+            duration = len(segment) / SAMPLE_RATE
+            audio_seconds += duration
+            _speech_info["last_rtf"] = elapsed / duration
+            print(f"Kesit: {duration:.2f} sn, çeviri: {elapsed:.2f} sn, RTF: {elapsed / duration:.2f} -> {text}")
+            if text:
+                parts.append(text)
+        return {"text": " ".join(parts), "segment": text, "audio_seconds": audio_seconds, "final": final}
+    
+    for chunk in audio_chunks:
+        for segment in segmenter.feed(chunk):
+            yield _partial(segment, final=False)
+    yield _partial(segmenter.flush(), final=True)
+
+
+def transcribe_audio_stream(audio_bytes, chunk_ms=500):
+    """Tamamlanmış bir kaydı akış gibi işle (uzun kayıtlarda ilk kısmi metin erken gelir)"""
+    return transcribe_stream(iter_chunks(decode_audio(audio_bytes), chunk_ms))
 
 
 def is_whisper_available():
     """Whisper'ın kullanılabilir olup olmadığını kontrol et"""
-    try:
-        import whisper
-        return True
-    except ImportError:
-        return False
+    return whisper is not None or WhisperModel is not None
@@ -0,0 +1,129 @@
+"""
+AKOM Aşama Zamanlayıcı
+analyze() içindeki her aşamanın süresini sabit kovalı histogramlarda toplar
+"""
+
+import threading
+import time
+from bisect import bisect_left
+
+# Kova üst sınırları (mikrosaniye); son kova bu sınırların üstünü tutar
+KOVA_SINIRLARI_US = [5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000,
+                     10000, 20000, 50000, 100000, 200000, 500000, 1000000]
+
+# Ölçülen aşamalar (analyze() içindeki sırayla)
+ASAMALAR = ["embedding", "anahtar_kelime", "olay_turu", "oncelik", "knn", "birim", "konum", "toplam"]
+
+
+class _Lap:
+    """Bir analiz boyunca ardışık aşamaların süresini ölçen kronometre"""
+    
+    __slots__ = ("_timer", "_start", "_last")
+    
+    def __init__(self, timer):
+        self._timer = timer
+        self._start = self._last = time.perf_counter_ns()
+    
+    def lap(self, stage):
+        """Önceki tura göre geçen süreyi aşamaya yaz"""
+        now = time.perf_counter_ns()
+        self._timer.record(stage, now - self._last)
+        self._last = now
+    
+    def total(self, stage="toplam"):
+        """Kronometre başlangıcından bu yana geçen süreyi yaz"""
+        self._timer.record(stage, time.perf_counter_ns() - self._start)
+
+
+class StageTimer:
+    """
+    Aşama başına sabit kovalı süre histogramları
+    
+    Her iş parçacığı kendi sayaç dizilerine yazar, bu yüzden sıcak yolda kilit
+    yoktur; kilit yalnızca bir iş parçacığı ilk kez ölçüm yaptığında ve
+    snapshot() sırasında alınır. Kapalıyken lap() None döner ve ölçüm yapılmaz.
+    """
+    
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._local = threading.local()
+        self._thread_stats = []  # her iş parçacığının {aşama: [kova sayaçları, toplam_ns]} sözlüğü
+        self._registry_lock = threading.Lock()
+    
+    def lap(self):
+        """Yeni kronometre başlat; ölçüm kapalıysa None döndür"""
+        if not self.enabled:
+            return None
+        return _Lap(self)
+    
+    def _stats(self):
+        stats = getattr(self._local, "stats", None)
+        if stats is None:
+            stats = self._local.stats = {}
+            with self._registry_lock:
+                self._thread_stats.append(stats)
+        return stats
+    
+    def record(self, stage, duration_ns, count=1):
+        """
+        Aşama süresini histograma ekle
+        
+        Args:
+            duration_ns: Tek bir ölçümün süresi (nanosaniye)
+            count: Aynı süreyle eklenecek ölçüm sayısı (toplu işlemde öğe başına süre)
+        """
+        stats = self._stats()
+        entry = stats.get(stage)
+        if entry is None:
+            entry = stats[stage] = [[0] * (len(KOVA_SINIRLARI_US) + 1), 0]
+        entry[0][bisect_left(KOVA_SINIRLARI_US, duration_ns / 1000.0)] += count
+        entry[1] += duration_ns * count
+    
+    def reset(self):
+        """Tüm sayaçları sıfırla"""
+        with self._registry_lock:
+            for stats in self._thread_stats:
+                stats.clear()
+    
+    def snapshot(self):
+        """
+        İş parçacıklarının sayaçlarını birleştirip aşama bazında özet döndür
+        
+        Yüzdelikler kova üst sınırından tahmin edilir (ms).
+        """
+        merged = {}
+        with self._registry_lock:
+            for stats in self._thread_stats:
+                for stage, (buckets, total_ns) in list(stats.items()):
+                    entry = merged.setdefault(stage, [[0] * len(buckets), 0])
+                    for i, n in enumerate(buckets):
+                        entry[0][i] += n
+                    entry[1] += total_ns
+        
+        sonuc = {}
+        for stage in sorted(merged, key=lambda s: ASAMALAR.index(s) if s in ASAMALAR else len(ASAMALAR)):
+            buckets, total_ns = merged[stage]
+            count = sum(buckets)
+            if count == 0:
+                continue
+            sonuc[stage] = {
+                "count": count,
+                "mean_ms": total_ns / count / 1e6,
+                "p50_ms": self._percentile(buckets, count, 0.50),
+                "p95_ms": self._percentile(buckets, count, 0.95),
+                "p99_ms": self._percentile(buckets, count, 0.99),
+                "buckets": buckets,
+            }
+        return sonuc
+    
+    @staticmethod
+    def _percentile(buckets, count, q):
+        target = q * count
+        seen = 0
+        for i, n in enumerate(buckets):
+            seen += n
+            if seen >= target:
+                if i < len(KOVA_SINIRLARI_US):
+                    return KOVA_SINIRLARI_US[i] / 1000.0
+                return float("inf")
+        return float("inf")
@@ -0,0 +1,131 @@
+"""
+AKOM Araç Zinciri Kaydı
+Harici araçların (ffmpeg) yolunu ve sürümünü süreç başına bir kez çözer
+"""
+
+import os
+import shutil
+import subprocess
+import threading
+import time
+
+# Windows'ta yaygın FFmpeg konumları (PATH'te bulunamazsa taranır)
+FFMPEG_WINDOWS_PATHS = [
+    r"C:\ffmpeg\bin",
+    r"C:\Program Files\ffmpeg\bin",
+    os.path.expanduser(r"~\AppData\Local\Microsoft\WinGet\Packages"),
+]
+
+
+def _find_ffmpeg():
+    """ffmpeg çalıştırılabilirinin mutlak yolunu bul (yoksa None)"""
+    path = shutil.which("ffmpeg")
+    if path:
+        return os.path.abspath(path)
+    
+    for base in FFMPEG_WINDOWS_PATHS:
+        if not os.path.exists(base):
+            continue
+        ffmpeg_exe = os.path.join(base, "ffmpeg.exe")
+        if os.path.exists(ffmpeg_exe):
+            return ffmpeg_exe
+        if "WinGet" in base:
+            for folder in os.listdir(base):
+                if "FFmpeg" in folder:
+                    for root, dirs, files in os.walk(os.path.join(base, folder)):
+                        if "ffmpeg.exe" in files:
+                            return os.path.join(root, "ffmpeg.exe")
+    return None
+
+
+def _read_version(path):
+    """'ffmpeg -version' çıktısının ilk satırından sürümü oku"""
+    try:
+        result = subprocess.run([path, "-version"], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0 or not result.stdout:
+        return None
+    # "ffmpeg version 6.1.1-3ubuntu5 Copyright ..." -> "6.1.1-3ubuntu5"
+    words = result.stdout.splitlines()[0].split()
+    return words[2] if len(words) > 2 and words[1] == "version" else words[-1]
+
+
+class ToolchainRegistry:
+    """
+    Çözülmüş araçların önbelleği
+    
+    Her araç ilk istendiğinde bir kez aranır ve sürümü okunur; sonraki
+    çağrılar alt süreç başlatmadan önbellekteki mutlak yolu döndürür.
+    """
+    
+    FINDERS = {"ffmpeg": _find_ffmpeg}
+    
+    def __init__(self):
+        self._tools = {}
+        self._lock = threading.Lock()
+    
+    def resolve(self, name, refresh=False):
+        """
+        Aracı çöz
+        
+        Returns:
+            dict: name, path, version, available, resolved_at
+        """
+        with self._lock:
+            info = self._tools.get(name)
+            if info is not None and not refresh:
+                return info
+            
+            path = self.FINDERS[name]()
+            version = _read_version(path) if path else None
+            info = {
+                "name": name,
+                "path": path,
+                "version": version,
+                "available": version is not None,
+                "resolved_at": time.time(),
+            }
+            self._tools[name] = info
+            
+            if info["available"]:
+                # Aracı adıyla çağıran kütüphaneler için PATH'e de eklenir
+                tool_dir = os.path.dirname(path)
+                if tool_dir not in os.environ.get("PATH", "").split(os.pathsep):
+                    os.environ["PATH"] = tool_dir + os.pathsep + os.environ.get("PATH", "")
+                print(f"{name} bulundu: {path} (sürüm {version})")
+            else:
+                print(f"{name} bulunamadı.")
+            return info
+    
+    def path(self, name):
+        """Aracın mutlak yolu (bulunamadıysa None)"""
+        info = self.resolve(name)
+        return info["path"] if info["available"] else None
+    
+    def health_check(self):
+        """
+        Önbellekteki her aracın hâlâ çalıştığını doğrula
+        
+        Çalışmayan araçlar yeniden aranır. Returns: {ad: çözüm bilgisi}
+        """
+        with self._lock:
+            names = list(self._tools) or list(self.FINDERS)
+            cached = dict(self._tools)
+        
+        sonuc = {}
+        for name in names:
+            info = cached.get(name)
+            if info is None or not info["available"] or _read_version(info["path"]) is None:
+                info = self.resolve(name, refresh=True)
+            sonuc[name] = info
+        return sonuc
+    
+    def snapshot(self):
+        """Çözülmüş araçların kopyası"""
+        with self._lock:
+            return {name: dict(info) for name, info in self._tools.items()}
+
+
+# Süreç genelinde paylaşılan kayıt
+TOOLCHAIN = ToolchainRegistry()
@@ -0,0 +1,179 @@
+"""
+AKOM Arşiv Kayıtları Toplu Çeviri
+Kayıtlı çağrı seslerini süreç havuzunda metne çevirip sınıflandırır
+
+Kullanım:
+    python src/transcribe_archive.py kayitlar/ --workers 4 --model-size small
+    python src/transcribe_archive.py kayitlar/ --output data/arsiv.parquet --batch-size 64
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+try:
+    from src import speech
+    from src.model import AKOMClassifier
+except ImportError:
+    import speech
+    from model import AKOMClassifier
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+SES_UZANTILARI = (".wav", ".mp3", ".m4a", ".ogg", ".flac", ".webm")
+
+
+def find_recordings(root):
+    """Dizin ağacındaki ses dosyalarını sıralı olarak listele"""
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        for name in filenames:
+            if name.lower().endswith(SES_UZANTILARI):
+                files.append(os.path.abspath(os.path.join(dirpath, name)))
+    return sorted(files)
+
+
+def _init_worker(backend, model_size, compute_type, num_threads):
+    # Her işçi süreç modeli bir kez yükler ve tüm dosyalarında paylaşır
+    speech.configure_speech(backend=backend, model_size=model_size,
+                            compute_type=compute_type, num_threads=num_threads)
+    speech.get_whisper_model()
+
+
+def _transcribe_file(path):
+    with open(path, "rb") as f:
+        audio_bytes = f.read()
+    sonuc = speech.transcribe_audio_detailed(audio_bytes)
+    sonuc["dosya"] = path
+    return sonuc
+
+
+def _completed_files(parts_dir):
+    """Önceki çalıştırmalarda başarıyla çevrilmiş dosyalar (çevrilemeyenler yeniden denenir)"""
+    done = set()
+    for name in os.listdir(parts_dir):
+        if name.endswith(".parquet"):
+            part = pd.read_parquet(os.path.join(parts_dir, name), columns=["dosya", "metin"])
+            done.update(part.loc[part["metin"].notna(), "dosya"])
+    return done
+
+
+def _write_part(classifier, records, parts_dir, part_no):
+    """Çevirileri toplu sınıflandırıp parquet parçası olarak yaz"""
+    texts = [r["text"] or "" for r in records]
+    results = classifier.analyze_many(texts)
+    
+    rows = []
+    for record, result in zip(records, results):
+        row = {
+            "dosya": record["dosya"],
+            "metin": record["text"],
+            "ses_sn": record["audio_seconds"],
+            "ceviri_sn": record["transcribe_seconds"],
+            "onbellek": record["cached"],
+            "hata": record["error"],
+        }
+        for alan in ("olay_turu", "oncelik", "birim", "ilce", "mahalle", "cadde", "sokak", "bolge"):
+            # Çevrilemeyen kayıtlar sınıflandırılmaz
+            row[alan] = result[alan] if record["text"] else None
+        rows.append(row)
+    
+    part_path = os.path.join(parts_dir, f"part_{part_no:06d}.parquet")
+    tmp_path = part_path + ".tmp"
+    pd.DataFrame(rows).to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, part_path)
+
+
+def transcribe_archive(root, output_path, workers=2, batch_size=32, backend="auto",
+                       model_size="small", compute_type="auto"):
+    """
+    Dizindeki kayıtları çevir, sınıflandır ve parquet dosyasına yaz
+    
+    Her batch_size kayıt <output>.parts/ altına bir parça olarak yazılır;
+    yeniden çalıştırıldığında parçalarda başarıyla çevrilmiş dosyalar atlanır,
+    çevrilemeyenler yeniden denenir (sonuçta her dosyanın en son denemesi kalır).
+    """
+    parts_dir = output_path + ".parts"
+    os.makedirs(parts_dir, exist_ok=True)
+    
+    files = find_recordings(root)
+    done = _completed_files(parts_dir)
+    todo = [path for path in files if path not in done]
+    print(f"{len(files)} kayıt bulundu, {len(done)} tanesi önceki çalıştırmadan alındı, {len(todo)} işlenecek.")
+    
+    part_no = len([name for name in os.listdir(parts_dir) if name.endswith(".parquet")])
+    # Kural tabanlı sınıflandırma BERT embedding'lerini kullanmaz
+    classifier = AKOMClassifier(use_bert=False)
+    # Çekirdekler işçilere paylaştırılır; işçiler birbirinin iş parçacıklarıyla yarışmaz
+    num_threads = max(1, (os.cpu_count() or 1) // workers)
+    
+    started = time.perf_counter()
+    processed = 0
+    audio_seconds = 0.0
+    cached = 0
+    failed = 0
+    batch = []
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(backend, model_size, compute_type, num_threads)) as pool:
+        for record in pool.map(_transcribe_file, todo):
+            batch.append(record)
+            processed += 1
+            audio_seconds += record["audio_seconds"] or 0.0
+            cached += record["cached"]
+            failed += record["text"] is None
+            
+            if len(batch) >= batch_size:
+                _write_part(classifier, batch, parts_dir, part_no)
+                part_no += 1
+                batch = []
+                elapsed = time.perf_counter() - started
+                print(f"  {processed}/{len(todo)} kayıt ({processed / elapsed:.2f} kayıt/sn, "
+                      f"{audio_seconds / elapsed:.1f} sn ses/sn)")
+        
+        if batch:
+            _write_part(classifier, batch, parts_dir, part_no)
+    
+    elapsed = time.perf_counter() - started
+    part_files = sorted(name for name in os.listdir(parts_dir) if name.endswith(".parquet"))
+    if not part_files:
+        print("Çevrilecek kayıt bulunamadı.")
+        return None
+    
+    df = pd.concat((pd.read_parquet(os.path.join(parts_dir, name)) for name in part_files), ignore_index=True)
+    # Yeniden denenen dosyaların önceki başarısız satırları atılır (parçalar yazılma sırasıyla)
+    df = df.drop_duplicates("dosya", keep="last").reset_index(drop=True)
+    df.to_parquet(output_path, index=False)
+    
+    print(f"\nSonuç dosyası: {output_path} ({len(df)} kayıt)")
+    if processed:
+        print(f"Bu çalıştırmada: {processed} kayıt, {audio_seconds:.0f} sn ses, {elapsed:.1f} sn "
+              f"({processed / elapsed:.2f} kayıt/sn)")
+        if audio_seconds:
+            # Önbellekten gelen kayıtların ses süresi bilinmez, oran yalnızca çevrilenler için
+            print(f"Gerçek zaman faktörü: {elapsed / audio_seconds:.3f}")
+        print(f"Önbellekten: {cached}, çevrilemeyen: {failed}")
+    return df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Arşivlenmiş çağrı kayıtlarını çevir ve sınıflandır")
+    parser.add_argument("root", help="Ses kayıtlarının bulunduğu dizin")
+    parser.add_argument("--output", default=os.path.join(DATA_DIR, "arsiv_cevirileri.parquet"))
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--batch-size", type=int, default=32, help="Sınıflandırma ve parça boyutu")
+    parser.add_argument("--backend", default="auto", choices=speech.SPEECH_BACKENDS)
+    parser.add_argument("--model-size", default="small", choices=speech.WHISPER_MODEL_SIZES)
+    parser.add_argument("--compute-type", default="auto", choices=speech.COMPUTE_TYPES)
+    args = parser.parse_args(argv)
+    
+    transcribe_archive(args.root, args.output, workers=args.workers, batch_size=args.batch_size,
+                       backend=args.backend, model_size=args.model_size,
+                       compute_type=args.compute_type)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+AKOM Çeviri İş Kuyruğu
+Ses çevirilerini arayüz iş parçacığını bloklamadan, sınırlı eşzamanlılıkla çalıştırır
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+# İş durumları: queued, running, done, failed
+BITMIS_DURUMLAR = ("done", "failed")
+
+
+class TranscriptionJobQueue:
+    """
+    Çeviri işlerini kuyruğa alıp iş parçacığı havuzunda çalıştırır
+    
+    submit() hemen bir iş kimliği döndürür; sonuç get()/wait() ile sorgulanır
+    ya da tamamlanınca callback çağrılır. Aynı anda en fazla max_workers
+    çeviri çalışır, böylece CPU kullanımı öngörülebilir kalır.
+    """
+    
+    def __init__(self, transcribe_fn, max_workers=2, max_finished_jobs=500):
+        """
+        Args:
+            transcribe_fn: Ses baytlarını alıp metin (ya da None) döndüren fonksiyon
+            max_workers: Eşzamanlı çeviri sınırı
+            max_finished_jobs: Bellekte tutulan bitmiş iş sayısı
+        """
+        self.transcribe_fn = transcribe_fn
+        self.max_workers = max_workers
+        self.max_finished_jobs = max_finished_jobs
+        
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="akom-ceviri")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self._waits_ms = deque(maxlen=1000)  # son işlerin kuyrukta bekleme süreleri
+        self._run_ms = deque(maxlen=1000)  # son işlerin çeviri süreleri
+    
+    def submit(self, audio_bytes, callback=None):
+        """
+        Çeviri işini kuyruğa ekle
+        
+        Args:
+            callback: İş bitince iş sözlüğüyle çağrılacak fonksiyon (işçi iş parçacığında)
+        
+        Returns:
+            str: İş kimliği
+        """
+        job_id = uuid.uuid4().hex
+        job = {
+            "id": job_id,
+            "status": "queued",
+            "result": None,
+            "error": None,
+            "submitted_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+            self.submitted += 1
+        self._executor.submit(self._run, job, audio_bytes, callback)
+        return job_id
+    
+    def _run(self, job, audio_bytes, callback):
+        started = time.time()
+        with self._lock:
+            job["status"] = "running"
+            job["started_at"] = started
+            self._waits_ms.append((started - job["submitted_at"]) * 1000.0)
+        
+        try:
+            result = self.transcribe_fn(audio_bytes)
+            status, error = "done", None
+        except Exception as e:
+            result, status, error = None, "failed", str(e)
+        
+        with self._lock:
+            job["result"] = result
+            job["error"] = error
+            job["finished_at"] = time.time()
+            job["status"] = status
+            self._run_ms.append((job["finished_at"] - started) * 1000.0)
+            if status == "done":
+                self.completed += 1
+            else:
+                self.failed += 1
+            self._prune()
+        
+        if callback is not None:
+            try:
+                callback(dict(job))
+            except Exception as e:
+                print(f"Çeviri geri çağırma hatası: {e}")
+    
+    def _prune(self):
+        """En eski bitmiş işleri sınırın üstündeyse unut"""
+        finished = [job_id for job_id, job in self._jobs.items() if job["status"] in BITMIS_DURUMLAR]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job_id]
+    
+    def get(self, job_id):
+        """İşin anlık durumunu döndür (bilinmeyen kimlikte None)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+    
+    def wait(self, job_id, timeout=None, poll_interval=0.05):
+        """İş bitene ya da süre dolana kadar bekle; son durumu döndür"""
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job["status"] in BITMIS_DURUMLAR:
+                return job
+            if deadline is not None and time.time() >= deadline:
+                return job
+            time.sleep(poll_interval)
+    
+    def get_metrics(self):
+        """Kuyruk derinliği, çalışan iş sayısı ve bekleme/çeviri süreleri"""
+        with self._lock:
+            statuses = [job["status"] for job in self._jobs.values()]
+            waits = sorted(self._waits_ms)
+            runs = sorted(self._run_ms)
+            return {
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "queue_depth": statuses.count("queued"),
+                "running": statuses.count("running"),
+                "max_workers": self.max_workers,
+                "wait_ms_avg": sum(waits) / len(waits) if waits else 0.0,
+                "wait_ms_p95": waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+                "wait_ms_max": waits[-1] if waits else 0.0,
+                "run_ms_avg": sum(runs) / len(runs) if runs else 0.0,
+            }
+    
+    def shutdown(self, wait=True):
+        """Havuzu kapat; kuyrukta bekleyen işler iptal edilir"""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        with self._lock:
+            for job in self._jobs.values():
+                if job["status"] == "queued":
+                    job["status"] = "failed"
+                    job["error"] = "Kuyruk kapatıldı"
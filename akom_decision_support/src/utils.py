@@ -4,6 +4,44 @@ AKOM Yardımcı Fonksiyonlar
 
 import pandas as pd
 import os
+import atexit
+
+try:
+    from src.knn_index import append_embedding, KNN_INDEX_DIR
+    from src.dataset_writer import DatasetAppender
+    from src.incident_store import SQLiteIncidentStore, DataFrameIncidentStore
+    from src.dataset_cache import DatasetCache
+    from src.dataset_schema import read_dataset_csv, compact_dataset
+    from src.dataset_stats import DatasetStats, CsvStatsSource, SQLiteStatsSource
+    from src.dataset_stream import iter_csv_chunks, PARCA_BOYUTU
+except ImportError:
+    from knn_index import append_embedding, KNN_INDEX_DIR
+    from dataset_writer import DatasetAppender
+    from incident_store import SQLiteIncidentStore, DataFrameIncidentStore
+    from dataset_cache import DatasetCache
+    from dataset_schema import read_dataset_csv, compact_dataset
+    from dataset_stats import DatasetStats, CsvStatsSource, SQLiteStatsSource
+    from dataset_stream import iter_csv_chunks, PARCA_BOYUTU
+
+# Kaç kayıtta bir fsync yapılacağı (1: her kayıtta; büyütülürse fsync'ler gruplanır)
+DATASET_SYNC_EVERY = 1
+
+# Veri seti deposu: "csv" (akom_dataset.csv) veya "sqlite" (indeksli akom_dataset.db;
+# ilk açılışta CSV bir kez içe aktarılır)
+STORAGE_BACKEND = "csv"
+
+# İhbar metinlerini sys.intern ile tekilleştir (tekrarlı metinlerde bellek kazancı)
+DATASET_INTERN_TEXT = False
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+DATASET_CSV_PATH = os.path.join(DATA_DIR, "akom_dataset.csv")
+DATASET_DB_PATH = os.path.join(DATA_DIR, "akom_dataset.db")
+DATASET_STATS_PATH = os.path.join(DATA_DIR, "akom_dataset_stats.json")
+
+_dataset_appender = None
+_sqlite_store = None
+_dataset_cache = None
+_dataset_stats = None
 
 # İstanbul ilçe koordinatları
 ILCE_KOORDINATLARI = {
@@ -52,21 +90,129 @@ def get_ilce_koordinat(ilce_adi):
     return {"lat": 41.0082, "lon": 28.9784}  # İstanbul merkez
 
 
-def load_dataset():
-    """Veri setini yükle"""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    data_path = os.path.join(os.path.dirname(script_dir), "data", "akom_dataset.csv")
+def _get_sqlite_store():
+    """Süreç genelinde paylaşılan SQLite deposu"""
+    global _sqlite_store
+    if _sqlite_store is None:
+        _sqlite_store = SQLiteIncidentStore(DATASET_DB_PATH, csv_path=DATASET_CSV_PATH)
+    return _sqlite_store
+
+
+def get_incident_store(df=None):
+    """
+    Sayfaların filtre/sayım sorguları için veri seti deposu
     
-    if os.path.exists(data_path):
-        return pd.read_csv(data_path)
+    SQLite deposunda filtreler indeksli SQL sorgularına itilir. CSV deposunda
+    aynı sorgular verilen (ya da yüklenen) DataFrame üzerinde çalışır.
+    
+    Returns:
+        SQLiteIncidentStore | DataFrameIncidentStore | None: Veri seti yoksa None
+    """
+    if STORAGE_BACKEND == "sqlite":
+        return _get_sqlite_store()
+    if df is None:
+        df = load_dataset()
+    return DataFrameIncidentStore(df) if df is not None else None
+
+
+def load_dataset(filters=None, columns=None, compact=True):
+    """
+    Veri setini yükle
+    
+    Args:
+        filters: {"sütun": değer ya da değer listesi} (ör. {"ilce": "Kadıköy"})
+        columns: Yalnızca bu sütunlar
+        compact: Kategorik sütunlar category, koordinatlar float32 olarak yüklenir
+    """
+    if STORAGE_BACKEND == "sqlite":
+        df = _get_sqlite_store().query(filters=filters, columns=columns)
+        return compact_dataset(df, intern_text=DATASET_INTERN_TEXT) if compact else df
+    
+    if os.path.exists(DATASET_CSV_PATH):
+        if compact:
+            df = read_dataset_csv(DATASET_CSV_PATH, intern_text=DATASET_INTERN_TEXT)
+        else:
+            df = pd.read_csv(DATASET_CSV_PATH)
+        if filters or columns:
+            df = DataFrameIncidentStore(df).query(filters=filters, columns=columns)
+        return df
     return None
 
 
-def save_analysis(analysis_result, ihbar_text):
-    """Yeni analizi CSV'ye kaydet"""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    data_path = os.path.join(os.path.dirname(script_dir), "data", "akom_dataset.csv")
+def stream_dataset(columns=None, filters=None, chunksize=PARCA_BOYUTU):
+    """
+    Veri setini belleğe tamamen yüklemeden tipli parçalar halinde oku
+    
+    Args:
+        columns: Yalnızca bu sütunlar
+        filters: {"ilce" | "olay_turu" | "oncelik" | "birim": değer ya da değer listesi}
+        chunksize: Parça başına satır sayısı
     
+    Yields:
+        pd.DataFrame: Filtreye uyan satırlar; dataset_stream'deki count_by,
+        heatmap_bins ve district_aggregates ile toplanabilir
+    """
+    if STORAGE_BACKEND == "sqlite":
+        # Filtreler indeksli SQL sorgusuna itilir
+        for chunk in _get_sqlite_store().iter_query(filters=filters, columns=columns, chunksize=chunksize):
+            yield compact_dataset(chunk, intern_text=DATASET_INTERN_TEXT)
+    elif os.path.exists(DATASET_CSV_PATH):
+        yield from iter_csv_chunks(DATASET_CSV_PATH, columns=columns, filters=filters,
+                                   chunksize=chunksize, intern_text=DATASET_INTERN_TEXT)
+
+
+def get_cached_dataset():
+    """
+    Süreç genelinde önbelleğe alınmış veri seti (CSV deposu)
+    
+    İlk çağrıda CSV bir kez yüklenir; sonraki çağrılarda yalnızca dosyaya
+    eklenen yeni satırlar okunur. Dönen DataFrame salt okunurdur.
+    """
+    global _dataset_cache
+    if _dataset_cache is None:
+        _dataset_cache = DatasetCache(DATASET_CSV_PATH, intern_text=DATASET_INTERN_TEXT)
+    return _dataset_cache.get()
+
+
+def get_dataset_stats():
+    """
+    İstatistikler sayfasının sayaçları (toplam, oncelik, olay_turu, birim, ilce, saat)
+    
+    Veri seti değişmediyse tarama yapılmadan kalıcı sayaçlar döndürülür.
+    """
+    global _dataset_stats
+    if _dataset_stats is None:
+        if STORAGE_BACKEND == "sqlite":
+            source = SQLiteStatsSource(_get_sqlite_store())
+        else:
+            source = CsvStatsSource(DATASET_CSV_PATH)
+        _dataset_stats = DatasetStats(DATASET_STATS_PATH, source)
+    return _dataset_stats.get()
+
+
+def get_report_texts(df):
+    """Veri setindeki ihbar metinlerini satır sırasıyla döndür"""
+    # Üretilen satırlar 'ihbar', uygulamadan kaydedilenler 'ihbar_metni' sütununu kullanır
+    texts = df['ihbar'] if 'ihbar' in df.columns else pd.Series([None] * len(df), index=df.index)
+    if 'ihbar_metni' in df.columns:
+        texts = texts.fillna(df['ihbar_metni'])
+    return texts.fillna('').astype(str).tolist()
+
+
+def _get_dataset_appender(data_path):
+    """Süreç genelinde paylaşılan veri seti yazıcısı"""
+    global _dataset_appender
+    if _dataset_appender is None or _dataset_appender.path != data_path:
+        # Kayıt zamanı SQLite deposundaki gibi satırla birlikte tutulur (saatlik istatistikler için)
+        _dataset_appender = DatasetAppender(data_path, sync_every=DATASET_SYNC_EVERY,
+                                            timestamp_column="kayit_zamani")
+        # Gruplanmış fsync'te bekleyen satırlar çıkışta diske yazılır
+        atexit.register(_dataset_appender.flush)
+    return _dataset_appender
+
+
+def save_analysis(analysis_result, ihbar_text):
+    """Yeni analizi veri setine kaydet"""
     # Koordinatları al
     ilce = analysis_result.get('ilce')
     coords = get_ilce_koordinat(ilce)
@@ -82,14 +228,22 @@ def save_analysis(analysis_result, ihbar_text):
         'lon': coords['lon']
     }
     
-    # CSV'ye ekle
-    if os.path.exists(data_path):
-        df = pd.read_csv(data_path)
-        df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
+    if STORAGE_BACKEND == "sqlite":
+        row_number = _get_sqlite_store().append(new_row)
     else:
-        df = pd.DataFrame([new_row])
+        # CSV'nin sonuna yalnızca yeni satır eklenir (dosya kilidi altında)
+        row_number = _get_dataset_appender(DATASET_CSV_PATH).append(new_row)
+    
+    # İstatistik sayaçlarına yalnızca yeni satır eklenir
+    try:
+        get_dataset_stats()
+    except Exception as e:
+        print(f"İstatistikler güncellenemedi: {e}")
     
-    df.to_csv(data_path, index=False)
+    # kNN indeksine yalnızca yeni satırın embedding'i eklenir
+    append_embedding(KNN_INDEX_DIR, row_number, analysis_result.get('embedding'),
+                     analysis_result['olay_turu'], analysis_result['oncelik'],
+                     analysis_result.get('model_revision'))
     return True
 
 
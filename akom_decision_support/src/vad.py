@@ -0,0 +1,129 @@
+"""
+AKOM Ses Etkinliği Algılama (VAD)
+Akan sesi konuşma kesitlerine ayıran enerji tabanlı bölütleyici
+"""
+
+from collections import deque
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+
+def pcm16_to_float32(chunk):
+    """16-bit PCM baytlarını (ya da hazır diziyi) float32 diziye çevir"""
+    if isinstance(chunk, (bytes, bytearray, memoryview)):
+        return np.frombuffer(chunk, dtype="<i2").astype(np.float32) / 32768.0
+    return np.asarray(chunk, dtype=np.float32)
+
+
+class VADSegmenter:
+    """
+    Parça parça gelen 16 kHz mono sesi konuşma kesitlerine böler
+    
+    Ses 30 ms'lik çerçevelerde RMS enerjisine bakılarak sınıflandırılır;
+    eşik, gürültü tabanının threshold_db üstüdür. Taban son noise_window_s
+    saniyedeki çerçeve enerjilerinin noise_percentile yüzdeliğidir: konuşma
+    arasındaki kısa duraklar tabanı belirler, ortam gürültüsü (trafik, siren)
+    kalıcı olarak yükselirse taban da pencere boyunca onu izler.
+    Konuşmadan sonra min_silence_ms sessizlik gelince ya da kesit
+    max_segment_s uzunluğuna ulaşınca kesit kapatılır.
+    """
+    
+    def __init__(self, frame_ms=30, threshold_db=10.0, min_silence_ms=500,
+                 min_speech_ms=250, max_segment_s=15.0, padding_ms=200,
+                 noise_window_s=5.0, noise_percentile=10.0):
+        self.frame = SAMPLE_RATE * frame_ms // 1000
+        self.threshold_db = threshold_db
+        self.noise_percentile = noise_percentile
+        self.min_silence_frames = max(1, min_silence_ms // frame_ms)
+        self.min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self.max_segment_frames = int(max_segment_s * 1000 // frame_ms)
+        self.padding_frames = padding_ms // frame_ms
+        
+        self.noise_db = None
+        self._energies = deque(maxlen=max(1, int(noise_window_s * 1000 // frame_ms)))
+        self._pending = np.zeros(0, dtype=np.float32)  # çerçeveyi tamamlamamış örnekler
+        self._preroll = []  # konuşma başlamadan önceki son çerçeveler
+        self._segment = []
+        self._speech_frames = 0
+        self._silence_run = 0
+    
+    def _frame_db(self, frame):
+        rms = np.sqrt(np.mean(frame * frame)) + 1e-10
+        return 20.0 * np.log10(rms)
+    
+    def _is_speech(self, frame):
+        db = self._frame_db(frame)
+        self._energies.append(db)
+        # Arayan hemen konuşmaya başlarsa ilk çerçeveler konuşma sayılmaz;
+        # ilk duraklamada taban düşer ve baştaki ses padding ile kesite girer
+        self.noise_db = float(np.percentile(self._energies, self.noise_percentile))
+        # Mutlak alt sınır (-50 dB) tamamen sessiz kayıtlarda eşiğin çökmesini önler
+        return db > max(self.noise_db + self.threshold_db, -50.0)
+    
+    def _close_segment(self):
+        segment = None
+        if self._speech_frames >= self.min_speech_frames:
+            segment = np.concatenate(self._segment)
+        self._segment = []
+        self._speech_frames = 0
+        self._silence_run = 0
+        return segment
+    
+    def feed(self, chunk):
+        """
+        Yeni ses parçasını işle
+        
+        Returns:
+            list: Bu parçayla tamamlanan konuşma kesitleri (float32 diziler)
+        """
+        samples = np.concatenate([self._pending, pcm16_to_float32(chunk)])
+        n_frames = len(samples) // self.frame
+        self._pending = samples[n_frames * self.frame:]
+        
+        segments = []
+        for i in range(n_frames):
+            frame = samples[i * self.frame:(i + 1) * self.frame]
+            speech = self._is_speech(frame)
+            
+            if not self._segment:
+                if speech:
+                    self._segment = self._preroll + [frame]
+                    self._preroll = []
+                    self._speech_frames = 1
+                else:
+                    self._preroll.append(frame)
+                    if len(self._preroll) > self.padding_frames:
+                        self._preroll.pop(0)
+                continue
+            
+            self._segment.append(frame)
+            if speech:
+                self._speech_frames += 1
+                self._silence_run = 0
+            else:
+                self._silence_run += 1
+            
+            if self._silence_run >= self.min_silence_frames or len(self._segment) >= self.max_segment_frames:
+                segment = self._close_segment()
+                if segment is not None:
+                    segments.append(segment)
+        return segments
+    
+    def flush(self):
+        """Akış bitti; açık kesiti kapatıp döndür (yoksa None)"""
+        if self._segment and len(self._pending):
+            self._segment.append(self._pending)
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._preroll = []
+        if not self._segment:
+            return None
+        return self._close_segment()
+
+
+def iter_chunks(audio, chunk_ms=500):
+    """Tam bir kaydı akış gibi sabit uzunluklu parçalara böl"""
+    step = SAMPLE_RATE * chunk_ms // 1000
+    for start in range(0, len(audio), step):
+        yield audio[start:start + step]
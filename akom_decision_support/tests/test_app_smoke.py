@@ -0,0 +1,60 @@
+"""
+AKOM arayüz duman testi: her sayfa hatasız çizilmeli
+"""
+
+import os
+import shutil
+import sys
+
+import pytest
+
+pytest.importorskip("folium")
+pytest.importorskip("streamlit_folium")
+
+from streamlit.testing.v1 import AppTest
+
+PROJE_DIZINI = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAYFALAR = ["İhbar Analizi", "Geçmiş", "İstatistikler", "Olay Haritası", "Veri Seti"]
+
+
+@pytest.fixture
+def app_path(tmp_path, monkeypatch):
+    """Uygulamanın geçici kopyası; testler depodaki veri dosyalarını değiştirmez"""
+    shutil.copy(os.path.join(PROJE_DIZINI, "app.py"), tmp_path)
+    shutil.copytree(os.path.join(PROJE_DIZINI, "src"), tmp_path / "src",
+                    ignore=shutil.ignore_patterns("__pycache__"))
+    os.makedirs(tmp_path / "data")
+    shutil.copy(os.path.join(PROJE_DIZINI, "data", "akom_dataset.csv"), tmp_path / "data")
+    
+    # Kopyadaki src paketi kullanılsın: daha önce içe aktarılmış src modülleri unutulur
+    monkeypatch.syspath_prepend(str(tmp_path))
+    for name in list(sys.modules):
+        if name == "src" or name.startswith("src."):
+            monkeypatch.delitem(sys.modules, name)
+    return str(tmp_path / "app.py")
+
+
+@pytest.mark.parametrize("sayfa", SAYFALAR)
+def test_sayfa_cizilir(app_path, sayfa):
+    at = AppTest.from_file(app_path, default_timeout=120)
+    at.run()
+    assert not at.exception
+    
+    at.sidebar.radio[0].set_value(sayfa).run()
+    assert not at.exception, [e.message for e in at.exception]
+
+
+def test_profil_acikken_kenar_cubugu_cizilir(app_path):
+    at = AppTest.from_file(app_path, default_timeout=120)
+    at.run()
+    at.button(key="profil_toggle").click().run()
+    assert not at.exception, [e.message for e in at.exception]
+    
+    # Ölçüm açıkken bir analiz yapılır; kenar çubuğu süre tablosuyla yeniden çizilmeli
+    at.text_area[0].input("Kadıköy'de binada yangın var, dumanlar yükseliyor").run()
+    analiz = [b for b in at.button if "Analiz" in str(b.label)]
+    analiz[0].click().run()
+    at.run()
+    assert not at.exception, [e.message for e in at.exception]
+    assert len(at.sidebar.dataframe) == 1
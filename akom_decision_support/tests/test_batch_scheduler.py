@@ -0,0 +1,39 @@
+"""
+BatchScheduler testleri
+"""
+
+import threading
+import time
+
+from src.batch_scheduler import BatchScheduler
+
+
+class _BekleyenSiniflandirici:
+    """İlk analyze_many çağrısında serbest bırakılana kadar bekleyen sınıflandırıcı"""
+    
+    def __init__(self):
+        self.serbest = threading.Event()
+        self.batch_boyutlari = []
+    
+    def analyze_many(self, texts, batch_size=None):
+        self.serbest.wait()
+        self.batch_boyutlari.append(len(texts))
+        return [{"metin": text} for text in texts]
+
+
+def test_birikmis_kuyruk_toplu_islenir():
+    siniflandirici = _BekleyenSiniflandirici()
+    scheduler = BatchScheduler(siniflandirici, max_batch=16, max_wait_ms=5)
+    try:
+        ilk = scheduler.submit("ilk")
+        # İşçi ilk batch'te bloklanmışken kuyruk dolar ve istekler max_wait_ms'den eskir
+        time.sleep(0.05)
+        futures = [scheduler.submit(f"ihbar {i}") for i in range(64)]
+        time.sleep(0.05)
+        siniflandirici.serbest.set()
+        
+        assert ilk.result(timeout=5) == {"metin": "ilk"}
+        assert [f.result(timeout=5)["metin"] for f in futures] == [f"ihbar {i}" for i in range(64)]
+        assert siniflandirici.batch_boyutlari[1:] == [16, 16, 16, 16]
+    finally:
+        scheduler.shutdown()
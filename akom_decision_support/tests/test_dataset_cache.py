@@ -0,0 +1,73 @@
+"""
+DatasetCache testleri: başka süreçlerin eklediği satırlar artımlı olarak yüklenir
+"""
+
+import multiprocessing
+import os
+import shutil
+
+import pandas as pd
+
+from src.dataset_cache import DatasetCache
+from src.dataset_writer import DatasetAppender
+
+VERI_SETI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "akom_dataset.csv")
+
+
+def _yeni_satir(surec, i):
+    return {"ihbar": f"ihbar {surec}-{i}", "olay_turu": "Yangın", "oncelik": "Kritik",
+            "birim": "İtfaiye", "ilce": f"Yeni İlçe {surec}", "mahalle": None,
+            "lat": 41.0 + i / 1000, "lon": 29.0}
+
+
+def _surec_ekle(path, surec, adet):
+    appender = DatasetAppender(path, sync_every=0)
+    for i in range(adet):
+        appender.append(_yeni_satir(surec, i))
+
+
+def test_eklenen_satirlar_artimli_yuklenir(tmp_path):
+    path = str(tmp_path / "akom_dataset.csv")
+    shutil.copy(VERI_SETI, path)
+    cache = DatasetCache(path)
+    ilk = cache.get()
+    ilk_satir = len(ilk)
+    
+    adet = 100
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=_surec_ekle, args=(path, surec, adet)) for surec in range(2)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+    
+    df = cache.get()
+    stats = cache.get_stats()
+    assert len(df) - ilk_satir == 2 * adet
+    assert stats["full_loads"] == 1
+    assert stats["delta_loads"] >= 1
+    assert stats["offset"] == os.path.getsize(path)
+    
+    # Artımlı yüklenen kopya dosyanın baştan okunmasıyla aynı
+    beklenen = pd.read_csv(path)
+    assert df["ihbar"].tolist()[ilk_satir:] == beklenen["ihbar"].tolist()[ilk_satir:]
+    assert df["ilce"].astype(object).tolist() == beklenen["ilce"].tolist()
+    assert df["lat"].to_numpy().tolist() == beklenen["lat"].astype("float32").tolist()
+    # Önceki görünüm değişmez
+    assert len(ilk) == ilk_satir
+
+
+def test_yeniden_yazilan_dosya_bastan_yuklenir(tmp_path):
+    path = str(tmp_path / "akom_dataset.csv")
+    shutil.copy(VERI_SETI, path)
+    cache = DatasetCache(path)
+    cache.get()
+    
+    df = pd.read_csv(path).head(10)
+    tmp = path + ".tmp"
+    df.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+    
+    assert len(cache.get()) == 10
+    assert cache.get_stats()["full_loads"] == 2
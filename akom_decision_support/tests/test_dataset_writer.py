@@ -0,0 +1,112 @@
+"""
+DatasetAppender ve veri seti şema göçü testleri
+"""
+
+import multiprocessing
+import os
+
+import pandas as pd
+
+from src.dataset_writer import DatasetAppender, add_column
+
+ORNEK_CSV = (
+    b'ihbar,olay_turu,oncelik,lat\r\n'
+    b'"Kad\xc4\xb1k\xc3\xb6y\'de sel, ""acil""",Sel Bask\xc4\xb1n\xc4\xb1,Kritik,40.99\r\n'
+    b'"iki\r\nsat\xc4\xb1rl\xc4\xb1 ihbar",Yang\xc4\xb1n,Orta,41.0100\r\n'
+)
+
+
+def _yeni_satir(i):
+    return {"ihbar": f"ihbar {i}", "olay_turu": "Yangın", "oncelik": "Orta", "lat": 41.0}
+
+
+def test_zaman_sutunu_yoksa_dosya_yeniden_yazilmaz(tmp_path):
+    path = tmp_path / "veri.csv"
+    path.write_bytes(ORNEK_CSV)
+    
+    DatasetAppender(str(path), timestamp_column="kayit_zamani").append(_yeni_satir(0))
+    data = path.read_bytes()
+    assert data.startswith(ORNEK_CSV)
+    assert b"kayit_zamani" not in data
+
+
+def test_sutun_gocu_mevcut_baytlari_korur(tmp_path):
+    path = tmp_path / "veri.csv"
+    path.write_bytes(ORNEK_CSV)
+    
+    assert add_column(str(path), "kayit_zamani")
+    assert not add_column(str(path), "kayit_zamani")
+    
+    data = path.read_bytes()
+    # Yalnızca kayıt sonlarına ayraç eklenir; sayı biçimleri ve tırnaklar aynı kalır
+    assert data == (
+        b'ihbar,olay_turu,oncelik,lat,kayit_zamani\r\n'
+        b'"Kad\xc4\xb1k\xc3\xb6y\'de sel, ""acil""",Sel Bask\xc4\xb1n\xc4\xb1,Kritik,40.99,\r\n'
+        b'"iki\r\nsat\xc4\xb1rl\xc4\xb1 ihbar",Yang\xc4\xb1n,Orta,41.0100,\r\n'
+    )
+    
+    df = pd.read_csv(path)
+    assert list(df.columns) == ["ihbar", "olay_turu", "oncelik", "lat", "kayit_zamani"]
+    assert df["ihbar"].tolist() == ["Kadıköy'de sel, \"acil\"", "iki\r\nsatırlı ihbar"]
+    assert df["kayit_zamani"].isna().all()
+    
+    DatasetAppender(str(path), timestamp_column="kayit_zamani").append(_yeni_satir(0))
+    df = pd.read_csv(path)
+    assert len(df) == 3
+    assert df["kayit_zamani"].notna().tolist() == [False, False, True]
+
+
+def _surec_ekle(path, surec, adet, sonuc_path):
+    appender = DatasetAppender(path, sync_every=10)
+    satirlar = [appender.append(_yeni_satir(f"{surec}-{i}")) for i in range(adet)]
+    appender.flush()
+    with open(sonuc_path, "w", encoding="utf-8") as f:
+        f.write(",".join(map(str, satirlar)))
+
+
+def test_eszamanli_surecler_satir_ezmez(tmp_path):
+    path = tmp_path / "veri.csv"
+    path.write_bytes(ORNEK_CSV)
+    adet = 150
+    
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=_surec_ekle, args=(str(path), surec, adet, str(tmp_path / f"{surec}.txt")))
+                 for surec in range(2)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+    
+    df = pd.read_csv(path)
+    assert len(df) == 2 + 2 * adet
+    assert sorted(df["ihbar"][2:]) == sorted(f"ihbar {s}-{i}" for s in range(2) for i in range(adet))
+    
+    # Döndürülen satır numaraları benzersiz ve dosyadaki satırlarla aynı
+    numaralar = []
+    for surec in range(2):
+        satirlar = list(map(int, (tmp_path / f"{surec}.txt").read_text().split(",")))
+        for i, satir in enumerate(satirlar):
+            assert df["ihbar"][satir] == f"ihbar {surec}-{i}"
+        numaralar.extend(satirlar)
+    assert sorted(numaralar) == list(range(2, 2 + 2 * adet))
+
+
+def test_grup_commit_satirlari_hemen_okunur(tmp_path, monkeypatch):
+    path = tmp_path / "veri.csv"
+    path.write_bytes(ORNEK_CSV)
+    fsyncs = []
+    real_fsync = os.fsync
+    monkeypatch.setattr("src.dataset_writer.os.fsync", lambda fd: (fsyncs.append(fd), real_fsync(fd)))
+    
+    appender = DatasetAppender(str(path), sync_every=5)
+    for i in range(7):
+        assert appender.append(_yeni_satir(i)) == 2 + i
+    # 5. satırda bir kez fsync; kalan 2 satır diskte beklemeden okunabilir
+    assert len(fsyncs) == 1
+    assert len(pd.read_csv(path)) == 9
+    
+    appender.flush()
+    assert len(fsyncs) == 2
+    appender.flush()
+    assert len(fsyncs) == 2
@@ -0,0 +1,61 @@
+"""
+FeedbackStore testleri: sıkıştırma, eşzamanlı eklemelerle kayıt kaybetmemeli
+"""
+
+import multiprocessing
+
+from src.feedback_store import FeedbackStore
+
+
+def _kayit(surec, i):
+    return {"ihbar": f"ihbar {surec}-{i}", "tahmin_olay": "Yangın",
+            "dogru_olay": "Yangın" if i % 3 else "Sel Baskını",
+            "tahmin_oncelik": "Orta", "dogru_oncelik": "Kritik"}
+
+
+def _surec_ekle(log_path, summary_path, surec, adet):
+    store = FeedbackStore(log_path, summary_path, legacy_path=None)
+    for i in range(adet):
+        store.append(_kayit(surec, i))
+
+
+def test_sikistirma_eszamanli_eklemede_kayit_kaybetmez(tmp_path):
+    log_path = str(tmp_path / "feedback.jsonl")
+    summary_path = str(tmp_path / "feedback_summary.parquet")
+    store = FeedbackStore(log_path, summary_path, legacy_path=None)
+    adet, surec_sayisi = 200, 3
+    
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=_surec_ekle, args=(log_path, summary_path, surec, adet))
+                 for surec in range(surec_sayisi)]
+    for process in processes:
+        process.start()
+    # Eklemeler sürerken tekrar tekrar sıkıştır
+    katlanan = 0
+    while any(process.is_alive() for process in processes):
+        katlanan += store.compact()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+    katlanan += store.compact()
+    
+    toplam = adet * surec_sayisi
+    assert katlanan == toplam
+    assert store.compact() == 0
+    assert len(store.load_records()) == toplam
+    
+    ozet = store.get_summary(include_pending=False)
+    sayilar = ozet.groupby("alan")["sayi"].sum().to_dict()
+    assert sayilar == {"olay_turu": toplam, "oncelik": toplam}
+    sel = ozet[(ozet["alan"] == "olay_turu") & (ozet["dogru"] == "Sel Baskını")]["sayi"].sum()
+    assert sel == surec_sayisi * len(range(0, adet, 3))
+
+
+def test_bekleyen_kayitlar_ozete_katilir(tmp_path):
+    store = FeedbackStore(str(tmp_path / "feedback.jsonl"), str(tmp_path / "ozet.parquet"), legacy_path=None)
+    store.append(_kayit(0, 1))
+    store.compact()
+    store.append(_kayit(0, 3))
+    
+    assert store.get_summary(include_pending=False)["sayi"].sum() == 2
+    assert store.get_summary()["sayi"].sum() == 4
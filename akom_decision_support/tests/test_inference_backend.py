@@ -0,0 +1,38 @@
+"""
+Çıkarım arka uçları testleri (küçük, rastgele ağırlıklı BERT ile)
+"""
+
+import pytest
+
+pytest.importorskip("onnxruntime")
+transformers = pytest.importorskip("transformers")
+
+from src.inference_backend import export_onnx, load_encoder
+
+ORNEKLER = ["kadıköy'de sel var", "yangın çıktı"]
+
+
+@pytest.fixture
+def kucuk_bert(tmp_path):
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + list("abcçdefgğhıijklmnoöprsştuüvyz'")
+    vocab_path = tmp_path / "vocab.txt"
+    vocab_path.write_text("\n".join(vocab), encoding="utf-8")
+    tokenizer = transformers.BertTokenizerFast(str(vocab_path))
+    config = transformers.BertConfig(vocab_size=len(vocab), hidden_size=32, num_hidden_layers=2,
+                                     num_attention_heads=2, intermediate_size=64)
+    return transformers.BertModel(config).eval(), tokenizer
+
+
+def test_onnx_aktarimi_modeli_eval_modunda_birakir(kucuk_bert, tmp_path):
+    model, tokenizer = kucuk_bert
+    export_onnx(model, tokenizer, str(tmp_path / "onnx" / "model.onnx"))
+    assert not model.training
+
+
+@pytest.mark.parametrize("backend", ["int8", "onnx"])
+def test_uyum_esigi_altinda_arka_uc_reddedilir(kucuk_bert, tmp_path, backend):
+    model, tokenizer = kucuk_bert
+    onnx_path = str(tmp_path / "onnx" / "model.onnx")
+    assert load_encoder(model, tokenizer, backend, onnx_path, parity_texts=ORNEKLER) is not model
+    with pytest.raises(ValueError):
+        load_encoder(model, tokenizer, backend, onnx_path, parity_texts=ORNEKLER, min_cosine=1.01)
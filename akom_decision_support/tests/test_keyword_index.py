@@ -0,0 +1,91 @@
+"""
+Anahtar kelime indeksi testleri: Aho-Corasick taraması eski döngülerle aynı sonucu vermeli
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from src.keyword_index import KeywordIndex
+from src.model import (AKOMClassifier, ILCE_LISTESI, OLAY_ANAHTAR_KELIMELER,
+                       ONCELIK_ANAHTAR_KELIMELER, ONEMLI_BOLGELER_LISTESI)
+from src.utils import get_report_texts
+
+VERI_SETI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "akom_dataset.csv")
+
+ZOR_ORNEKLER = [
+    "",
+    "istanbul",
+    "İSTANBUL HAVALİMANI yakınında patlama",
+    "Sabiha Gökçen'de yangın çıktı",
+    "Tuzla OSB'de kimyasal sızıntı",
+    "organize sanayi bölgesi yangın",
+    "ESENYURT'ta KAZA",
+    "İkitelli OSB Beylikdüzü",
+    "Mustafa Kemal Paşa Mahallesi Avcılar",
+    "IŞIK İĞNE kar",
+    "yangınyangın sel sel baskını deprem depremde",
+]
+
+
+def _eski_olay_turu(text):
+    text_lower = text.lower()
+    scores = {}
+    for olay, keywords in OLAY_ANAHTAR_KELIMELER.items():
+        score = sum(1 for kw in keywords if kw in text_lower)
+        if score > 0:
+            scores[olay] = score
+    return max(scores, key=scores.get) if scores else "Diğer"
+
+
+def _eski_oncelik(text):
+    text_lower = text.lower()
+    for oncelik in ("Kritik", "Yüksek"):
+        if any(kw in text_lower for kw in ONCELIK_ANAHTAR_KELIMELER[oncelik]):
+            return oncelik
+    return "Orta"
+
+
+def _eski_eslesmeler(text):
+    """Her sözlüğü ayrı ayrı dolaşan eski `kw in text` kontrolleri"""
+    text_lower = text.lower()
+    found = set()
+    for olay, keywords in OLAY_ANAHTAR_KELIMELER.items():
+        found.update(("olay", olay, i) for i, kw in enumerate(keywords) if kw in text_lower)
+    for oncelik, keywords in ONCELIK_ANAHTAR_KELIMELER.items():
+        found.update(("oncelik", oncelik, i) for i, kw in enumerate(keywords) if kw in text_lower)
+    found.update(("bolge", i) for i, (bolge, _) in enumerate(ONEMLI_BOLGELER_LISTESI) if bolge.lower() in text_lower)
+    found.update(("ilce", i) for i, ilce in enumerate(ILCE_LISTESI) if ilce in text)
+    return found
+
+
+@pytest.fixture(scope="module")
+def ornekler():
+    df = pd.read_csv(VERI_SETI)
+    return get_report_texts(df.sample(n=min(1000, len(df)), random_state=0)) + ZOR_ORNEKLER
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    return AKOMClassifier(use_bert=False)
+
+
+def test_tarama_eski_dongulerle_ayni(classifier, ornekler):
+    for text in ornekler:
+        assert classifier.scan_keywords(text) == _eski_eslesmeler(text), text
+
+
+def test_siniflandirma_eski_dongulerle_ayni(classifier, ornekler):
+    for text in ornekler:
+        assert classifier.classify_event_type(text) == _eski_olay_turu(text), text
+        assert classifier.classify_priority(text) == _eski_oncelik(text), text
+
+
+def test_ic_ice_desenler():
+    index = KeywordIndex()
+    for i, keyword in enumerate(["he", "she", "his", "hers"]):
+        index.add(keyword, i)
+    index.add("Sel", "buyuk", case_sensitive=True)
+    assert index.build().search("ushers Sel") == {0, 1, 3, "buyuk"}
+    assert index.search("sel") == set()
@@ -0,0 +1,76 @@
+"""
+KNNIndex testleri
+"""
+
+import threading
+
+import numpy as np
+import pytest
+
+from src.knn_index import KNNIndex
+
+METINLER = [f"ihbar {i}" for i in range(200)]
+ETIKETLER = [("Yangın" if i % 2 else "Sel Baskını", "Orta") for i in range(200)]
+
+
+class _SayanEmbedding:
+    """Hesaplanan metinleri sayan sahte embedding fonksiyonu"""
+    
+    def __init__(self):
+        self.sayac = 0
+        self._lock = threading.Lock()
+    
+    def __call__(self, texts):
+        with self._lock:
+            self.sayac += len(texts)
+        embeddings = []
+        for text in texts:
+            i = int(text.split()[-1])
+            vector = np.zeros((1, 8), dtype=np.float32)
+            vector[0, i % 8] = 1.0
+            vector[0, (i // 8) % 8] += 0.5
+            embeddings.append(vector)
+        return embeddings
+
+
+def test_eszamanli_esitleme_satirlari_bir_kez_hesaplar(tmp_path):
+    embed = _SayanEmbedding()
+    batch = 16
+    threads = [threading.Thread(target=lambda: KNNIndex(str(tmp_path / "idx"), "r1").sync(
+                   METINLER, ETIKETLER, embed, batch_size=batch)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    index = KNNIndex(str(tmp_path / "idx"), "r1")
+    assert len(index) == len(METINLER)
+    assert index._olaylar == [olay for olay, _ in ETIKETLER]
+    # Yarışta her eşitleyici en fazla bir batch'i boşa hesaplar
+    assert embed.sayac <= len(METINLER) + 3 * batch
+
+
+def test_yarim_indeks_yalnizca_eksiklerle_tamamlanir(tmp_path):
+    KNNIndex(str(tmp_path / "idx"), "r1").sync(METINLER[:120], ETIKETLER[:120], _SayanEmbedding())
+    
+    embed = _SayanEmbedding()
+    KNNIndex(str(tmp_path / "idx"), "r1").sync(METINLER, ETIKETLER, embed)
+    assert embed.sayac == 80
+
+
+def test_sorgu_kendi_satirini_haric_tutar(tmp_path):
+    index = KNNIndex(str(tmp_path / "idx"), "r1")
+    index.sync(METINLER, ETIKETLER, _SayanEmbedding())
+    
+    [embedding] = _SayanEmbedding()([METINLER[5]])
+    assert index.query(embedding, k=3)["komsular"][0][0] == 5
+    sonuc = index.query(embedding, k=3, exclude=5)
+    assert 5 not in [i for i, _ in sonuc["komsular"]]
+    assert len(sonuc["komsular"]) == 3
+
+
+def test_salt_okunur_indeks_farkli_surumu_silmez(tmp_path):
+    KNNIndex(str(tmp_path / "idx"), "r1").sync(METINLER[:10], ETIKETLER[:10], _SayanEmbedding())
+    with pytest.raises(ValueError):
+        KNNIndex(str(tmp_path / "idx"), "r2", read_only=True)
+    assert len(KNNIndex(str(tmp_path / "idx"), "r1")) == 10
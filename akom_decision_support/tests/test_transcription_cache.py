@@ -0,0 +1,58 @@
+"""
+TranscriptionCache disk katmanı testleri (birden çok süreç aynı dosyaya yazar)
+"""
+
+import multiprocessing
+
+import pytest
+
+# speech modülü bir Whisper arka ucu olmadan içe aktarılamaz
+speech = pytest.importorskip("src.speech", exc_type=ImportError)
+TranscriptionCache = speech.TranscriptionCache
+
+SUREC_SAYISI = 4
+KAYIT_SAYISI = 150
+
+
+def _yaz(cache_dir, surec, max_disk_items):
+    cache = TranscriptionCache(cache_dir, max_disk_items=max_disk_items)
+    for i in range(KAYIT_SAYISI):
+        cache.put(f"{surec}-{i}", f"metin {surec} {i}")
+
+
+def _surecleri_calistir(cache_dir, max_disk_items):
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=_yaz, args=(cache_dir, surec, max_disk_items))
+                 for surec in range(SUREC_SAYISI)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+
+@pytest.mark.parametrize("max_disk_items", [100000, 200])
+def test_eszamanli_yazma_ve_sikistirma_kayit_bozmaz(tmp_path, max_disk_items):
+    _surecleri_calistir(str(tmp_path), max_disk_items)
+    
+    cache = TranscriptionCache(str(tmp_path), max_disk_items=max_disk_items)
+    bulunan = 0
+    for surec in range(SUREC_SAYISI):
+        for i in range(KAYIT_SAYISI):
+            text = cache.get(f"{surec}-{i}")
+            if text is not None:
+                assert text == f"metin {surec} {i}"
+                bulunan += 1
+    
+    if max_disk_items >= SUREC_SAYISI * KAYIT_SAYISI:
+        assert bulunan == SUREC_SAYISI * KAYIT_SAYISI
+    else:
+        # Sıkıştırma yalnızca en eskileri atar; son sıkıştırmadan sonra eklenenler kaybolmaz
+        assert max_disk_items <= bulunan <= max_disk_items + SUREC_SAYISI * KAYIT_SAYISI
+
+
+def test_baska_surecin_ekledigi_kayit_okunur(tmp_path):
+    okuyucu = TranscriptionCache(str(tmp_path))
+    assert okuyucu.get("a") is None
+    TranscriptionCache(str(tmp_path)).put("a", "metin")
+    assert okuyucu.get("a") == "metin"
@@ -0,0 +1,54 @@
+"""
+VADSegmenter testleri
+"""
+
+import numpy as np
+import pytest
+
+from src.vad import SAMPLE_RATE, VADSegmenter, iter_chunks
+
+
+def _gurultu(saniye, genlik, rng):
+    return (genlik * rng.standard_normal(int(saniye * SAMPLE_RATE))).astype(np.float32)
+
+
+def _konusma(saniye, genlik):
+    """4 Hz hecelerle genliği değişen ton"""
+    t = np.arange(int(saniye * SAMPLE_RATE)) / SAMPLE_RATE
+    zarf = np.clip(np.sin(2 * np.pi * 4 * t), 0.03, None)
+    return (genlik * zarf * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def _kesitler(audio):
+    vad = VADSegmenter()
+    kesitler = []
+    for chunk in iter_chunks(audio):
+        kesitler.extend(vad.feed(chunk))
+    son = vad.flush()
+    if son is not None:
+        kesitler.append(son)
+    return [len(kesit) / SAMPLE_RATE for kesit in kesitler]
+
+
+@pytest.mark.parametrize("gurultu_genligi", [0.001, 0.03, 0.07])
+def test_gurultu_tabani_ortama_uyar(gurultu_genligi):
+    # -60, -30 ve -23 dB arka plan gürültüsünde iki konuşma ayrı kesitler olarak bulunur
+    rng = np.random.default_rng(0)
+    audio = np.concatenate([
+        _gurultu(2.0, gurultu_genligi, rng),
+        _konusma(1.5, 0.5) + _gurultu(1.5, gurultu_genligi, rng),
+        _gurultu(1.5, gurultu_genligi, rng),
+        _konusma(1.0, 0.5) + _gurultu(1.0, gurultu_genligi, rng),
+        _gurultu(2.0, gurultu_genligi, rng),
+    ])
+    sureler = _kesitler(audio)
+    assert len(sureler) == 2
+    assert sureler[0] < 2.5 and sureler[1] < 2.0
+
+
+def test_kayit_konusmayla_baslar():
+    rng = np.random.default_rng(0)
+    audio = np.concatenate([_konusma(1.5, 0.5) + _gurultu(1.5, 0.003, rng), _gurultu(1.0, 0.003, rng)])
+    sureler = _kesitler(audio)
+    assert len(sureler) == 1
+    assert sureler[0] >= 1.5